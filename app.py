@@ -92,6 +92,11 @@ def main():
         start_date = st.date_input("Start Date", datetime.now())
         end_date = st.date_input("End Date", datetime.now() + timedelta(days=30))
 
+        st.header("🔎 Search")
+        search_text = st.text_input(
+            "Venues and events", help="Search names and descriptions"
+        )
+
     # Main content area
     col1, col2 = st.columns([2, 1])
 
@@ -100,6 +105,10 @@ def main():
         display_map(map_type, start_date, end_date)
 
     with col2:
+        if search_text:
+            st.subheader("🔎 Search Results")
+            display_search_results(search_text)
+
         st.subheader("📊 Data Summary")
         display_data_summary()
 
@@ -112,6 +121,7 @@ def collect_venues():
     with st.spinner("🏢 Collecting venues from all sources..."):
         try:
             result = venues.collect_all()
+            db.refresh_materialized()
 
             if result.success:
                 st.success(
@@ -131,6 +141,7 @@ def collect_events():
     with st.spinner("🎭 Collecting events from KC sources..."):
         try:
             result = events.collect_all()
+            db.refresh_materialized()
 
             if result.success:
                 st.success(
@@ -157,6 +168,7 @@ def generate_predictions():
 
             # Generate heatmap predictions
             heatmap_predictions = predictions.generate_heatmap_predictions()
+            db.refresh_materialized()
 
             if heatmap_predictions:
                 st.success(
@@ -195,6 +207,10 @@ def collect_all_data():
         progress_bar.progress(75)
         train_result = predictions.train_model()
         heatmap_predictions = predictions.generate_heatmap_predictions()
+        db.refresh_materialized()
+
+        # Seal finished months and refresh the traffic and weather rollups
+        db.maintain_partitions()
 
         # Complete
         progress_bar.progress(100)
@@ -242,8 +258,7 @@ def display_map(map_type: str, start_date, end_date):
             result = maps.create_venue_map(output_path="temp_venue_map.html")
         elif map_type == "Events Only":
             event_filters = {
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
+                "during": (start_date, end_date + timedelta(days=1)),
                 "has_location": True,
             }
             result = maps.create_event_map(
@@ -259,8 +274,7 @@ def display_map(map_type: str, start_date, end_date):
                 include_events=True,
                 include_predictions=True,
                 event_filters={
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
+                    "during": (start_date, end_date + timedelta(days=1)),
                     "has_location": True,
                 },
                 output_path="temp_combined_map.html",
@@ -327,6 +341,19 @@ def display_data_summary():
         st.error(f"Error loading data summary: {e}")
 
 
+def display_search_results(text: str):
+    """Display the best venue and event matches for a search"""
+    try:
+        for kind in ("venues", "events"):
+            results = db.search(text, kind, limit=10)
+            st.caption(f"{kind.title()}: {len(results)} matches")
+            for row in results:
+                st.write(f"**{row['name']}** · {row.get('address') or 'No address'}")
+
+    except Exception as e:
+        st.error(f"Error searching: {e}")
+
+
 def display_system_status():
     """Display system status and health"""
     try:
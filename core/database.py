@@ -5,15 +5,42 @@ Single database interface that consolidates all database operations,
 replacing scattered DB access patterns throughout the application.
 """
 
+import atexit
+import base64
+import hashlib
+import io
 import logging
+import math
 import sqlite3
 import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+import psycopg2.extensions
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import namedtuple
 from contextlib import contextmanager
-from typing import Dict, List, Optional, Any, Union, Tuple
-from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Any,
+    Union,
+    Tuple,
+)
+from dataclasses import dataclass, field
 import json
 import os
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import pandas as pd
+import pyarrow as pa
 
 
 @dataclass
@@ -26,6 +53,954 @@ class OperationResult:
     error: Optional[str] = None
 
 
+@dataclass
+class BulkWriteResult:
+    """Per-row outcomes of a bulk upsert, keyed by input position"""
+
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    # row index -> 'inserted' | 'updated' | 'failed'
+    outcomes: Dict[int, str] = field(default_factory=dict)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    def record(self, index: int, outcome: str, error: Optional[str] = None):
+        self.outcomes[index] = outcome
+        if outcome == "inserted":
+            self.inserted += 1
+        elif outcome == "updated":
+            self.updated += 1
+        else:
+            self.failed += 1
+            self.errors[index] = error or "unknown error"
+
+
+@dataclass
+class LoadResult:
+    """Row counts and throughput of a bulk load"""
+
+    table: str
+    method: str  # 'copy' (PostgreSQL) or 'executemany' (SQLite)
+    rows: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated listing"""
+
+    items: List[Dict]
+    # Opaque continuation token; None on the last page
+    next_token: Optional[str] = None
+
+
+@dataclass
+class ChangeBatch:
+    """One batch of a table's change feed, in change order"""
+
+    # {"op": "upsert", "key", "change_seq", "row"} or {"op": "delete", ...},
+    # plus "change_xid" on PostgreSQL
+    changes: List[Dict]
+    # Pass back to get_changes_since for the next batch
+    watermark: Optional[str]
+    has_more: bool = False
+
+
+@dataclass
+class PoolStats:
+    """Connection pool metrics"""
+
+    db_type: str
+    max_size: int
+    open_connections: int = 0
+    idle_connections: int = 0
+    in_use: int = 0
+    total_checkouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / max(self.total_checkouts, 1)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived database connections.
+
+    SQLite connections are kept in an idle stack and reused across threads
+    (each checkout is exclusive). PostgreSQL connections are managed by
+    psycopg2's ThreadedConnectionPool; a semaphore makes callers wait for a
+    free connection instead of failing when the pool is exhausted.
+    """
+
+    # SQLite tuning applied once per physical connection
+    SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA mmap_size=268435456",  # 256 MB
+        "PRAGMA cache_size=-65536",  # 64 MB
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(
+        self,
+        db_type: str,
+        connect: Callable[[], Any],
+        max_size: int = 5,
+        timeout: float = 30.0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.db_type = db_type
+        self.max_size = max(int(max_size), 1)
+        self.timeout = timeout
+        self._connect = connect
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        self._pg_pool = None
+        self._closed = False
+        self._stats = PoolStats(db_type=db_type, max_size=self.max_size)
+
+    def acquire(self):
+        """Check out a connection, waiting up to `timeout` seconds for a free slot"""
+        wait_start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats.timeouts += 1
+            raise TimeoutError(
+                f"Timed out after {self.timeout}s waiting for a database connection"
+            )
+        waited = time.perf_counter() - wait_start
+
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats.total_checkouts += 1
+            self._stats.total_wait_seconds += waited
+            self._stats.max_wait_seconds = max(self._stats.max_wait_seconds, waited)
+            self._stats.in_use += 1
+        return conn
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool, discarding it if it is broken"""
+        try:
+            if not discard:
+                try:
+                    # Never hand an open transaction to the next caller
+                    conn.rollback()
+                except Exception:
+                    discard = True
+            self._checkin(conn, discard or self._closed)
+        finally:
+            with self._lock:
+                self._stats.in_use -= 1
+            self._slots.release()
+
+    def stats(self) -> PoolStats:
+        """Snapshot of pool metrics"""
+        with self._lock:
+            snapshot = PoolStats(**self._stats.__dict__)
+        if self.db_type == "sqlite":
+            snapshot.idle_connections = self._idle.qsize()
+        elif self._pg_pool is not None:
+            snapshot.idle_connections = len(self._pg_pool._pool)
+        return snapshot
+
+    def close(self):
+        """Close all idle connections; in-use connections close on release"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_physical(conn)
+        if self._pg_pool is not None:
+            self._pg_pool.closeall()
+            self._pg_pool = None
+
+    def _checkout(self):
+        if self.db_type == "postgresql":
+            with self._lock:
+                if self._pg_pool is None:
+                    # minconn == maxconn so returned connections stay open
+                    self._pg_pool = psycopg2.pool.ThreadedConnectionPool(
+                        self.max_size, self.max_size, **self._connect()
+                    )
+            conn = self._pg_pool.getconn()
+            with self._lock:
+                self._stats.open_connections = len(self._pg_pool._used) + len(
+                    self._pg_pool._pool
+                )
+            return conn
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+            for pragma in self.SQLITE_PRAGMAS:
+                try:
+                    conn.execute(pragma)
+                except sqlite3.DatabaseError as e:
+                    self.logger.debug(f"Could not apply '{pragma}': {e}")
+            with self._lock:
+                self._stats.open_connections += 1
+            return conn
+
+    def _checkin(self, conn, discard: bool):
+        if self.db_type == "postgresql":
+            if self._pg_pool is not None:
+                self._pg_pool.putconn(conn, close=discard or bool(conn.closed))
+                with self._lock:
+                    self._stats.open_connections = len(self._pg_pool._used) + len(
+                        self._pg_pool._pool
+                    )
+            else:
+                self._close_physical(conn)
+            return
+
+        if discard:
+            self._close_physical(conn)
+        else:
+            self._idle.put(conn)
+
+    def _close_physical(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        if self.db_type == "sqlite":
+            with self._lock:
+                self._stats.open_connections -= 1
+
+
+@dataclass
+class PendingWrites:
+    """Coalesced counter and log writes waiting to be flushed"""
+
+    # cache_key -> [hits, last_accessed]
+    api_cache_hits: Dict[str, List[Any]] = field(default_factory=dict)
+    # address -> hits
+    geocode_hits: Dict[str, int] = field(default_factory=dict)
+    # (query, params) in enqueue order; later updates depend on earlier ones
+    collection_updates: List[Tuple[str, tuple]] = field(default_factory=list)
+    quality_issues: List[tuple] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return (
+            len(self.api_cache_hits)
+            + len(self.geocode_hits)
+            + len(self.collection_updates)
+            + len(self.quality_issues)
+        )
+
+
+class WriteBehindBuffer:
+    """
+    In-memory queue for small bookkeeping writes.
+
+    Cache hits are coalesced per key; collection updates and quality log rows
+    are appended. The pending batch is handed to `flush_fn` (one transaction)
+    every `interval` seconds from a daemon thread, or immediately once
+    `max_pending` entries accumulate. An interval <= 0 flushes synchronously.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[PendingWrites], None],
+        interval: float = 2.0,
+        max_pending: int = 500,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.max_pending = max(int(max_pending), 1)
+        self._flush_fn = flush_fn
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = PendingWrites()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"enqueued": 0, "flushes": 0, "flushed": 0, "failures": 0}
+
+    def record_api_cache_hit(self, cache_key: str, accessed_at: str):
+        with self._lock:
+            entry = self._pending.api_cache_hits.setdefault(cache_key, [0, None])
+            entry[0] += 1
+            entry[1] = accessed_at
+        self._enqueued()
+
+    def record_geocode_hit(self, address: str):
+        with self._lock:
+            hits = self._pending.geocode_hits
+            hits[address] = hits.get(address, 0) + 1
+        self._enqueued()
+
+    def add_collection_update(self, query: str, params: tuple):
+        with self._lock:
+            self._pending.collection_updates.append((query, params))
+        self._enqueued()
+
+    def add_quality_issue(self, row: tuple):
+        with self._lock:
+            self._pending.quality_issues.append(row)
+        self._enqueued()
+
+    def flush(self) -> int:
+        """Write all pending entries now; returns the number flushed"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, PendingWrites()
+            size = len(batch)
+            if not size:
+                return 0
+            try:
+                self._flush_fn(batch)
+            except Exception as e:
+                self._stats["failures"] += 1
+                self.logger.error(f"Write-behind flush of {size} entries failed: {e}")
+                self._requeue(batch)
+                return 0
+            self._stats["flushes"] += 1
+            self._stats["flushed"] += size
+            return size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {**self._stats, "pending": pending}
+
+    def _enqueued(self):
+        self._stats["enqueued"] += 1
+        if self.interval <= 0:
+            self.flush()
+            return
+        with self._lock:
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+        elif self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="ppm-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def _requeue(self, batch: PendingWrites):
+        """Merge a failed batch back in front of anything queued since"""
+        with self._lock:
+            current = self._pending
+            if len(current) + len(batch) > self.max_pending * 10:
+                self.logger.warning(f"Dropping {len(batch)} unflushable writes")
+                return
+            for key, (hits, accessed_at) in batch.api_cache_hits.items():
+                entry = current.api_cache_hits.setdefault(key, [0, accessed_at])
+                entry[0] += hits
+            for address, hits in batch.geocode_hits.items():
+                current.geocode_hits[address] = (
+                    current.geocode_hits.get(address, 0) + hits
+                )
+            current.collection_updates[:0] = batch.collection_updates
+            current.quality_issues[:0] = batch.quality_issues
+
+
+QUALITY_RESULTS = ("pass", "fail", "warning")
+QUALITY_SEVERITIES = ("low", "medium", "high", "critical")
+
+PSYCHOGRAPHIC_KEYS = ("career_driven", "competent", "fun", "social", "adventurous")
+
+# REAL columns on venues and events mirroring each psychographic_relevance key
+PSYCHOGRAPHIC_COLUMNS = tuple(f"psychographic_{key}" for key in PSYCHOGRAPHIC_KEYS)
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE_LAT = 111320.0
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
+
+
+# Naive event times from scrapers are local to the metro area being covered
+EVENT_TIMEZONE = os.getenv("EVENT_TIMEZONE", "America/Chicago")
+
+
+def _zone(name: Optional[str]):
+    try:
+        return ZoneInfo(name or EVENT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def to_epoch_seconds(value: Any, tz: Optional[str] = None) -> Optional[int]:
+    """
+    Normalize a datetime, date, epoch number or date string to epoch seconds.
+
+    Naive values are interpreted in `tz` (default EVENT_TIMEZONE). Returns
+    None for empty or unparseable input.
+    """
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        # Millisecond epochs are common in provider payloads
+        return int(value / 1000 if abs(value) > 1e11 else value)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return to_epoch_seconds(float(text), tz)
+        except ValueError:
+            pass
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            try:
+                value = pd.to_datetime(text).to_pydatetime()
+            except (ValueError, TypeError, OverflowError):
+                return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=_zone(tz))
+    return int(value.timestamp())
+
+
+def utc_offset_spans(
+    start_ts: int, end_ts: int, tz: Optional[str] = None
+) -> List[Tuple[Optional[int], int]]:
+    """
+    UTC offsets in seconds of `tz` (default EVENT_TIMEZONE) between two epochs.
+
+    Returns [(from_ts, offset), ...] in time order; the first span has
+    from_ts None. Transitions are found day by day, then bisected to the
+    second, so at most one per day is expected.
+    """
+    zone = _zone(tz)
+
+    def offset(ts: int) -> int:
+        return int(datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+
+    spans = [(None, offset(start_ts))]
+    ts = start_ts
+    while ts < end_ts:
+        step = min(ts + 86400, end_ts)
+        if offset(step) != spans[-1][1]:
+            low, high = ts, step
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset(middle) == spans[-1][1]:
+                    low = middle
+                else:
+                    high = middle
+            spans.append((high, offset(high)))
+        ts = step
+    return spans
+
+
+def normalize_venue_name(name: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive venue name key (venues.name_norm)"""
+    if not name:
+        return None
+    return " ".join(name.casefold().split()) or None
+
+
+def psychographic_scores(relevance: Any) -> Tuple[Optional[float], ...]:
+    """
+    PSYCHOGRAPHIC_KEYS scores of a psychographic_relevance dict or JSON string.
+
+    Missing or non-numeric scores are None, in PSYCHOGRAPHIC_COLUMNS order.
+    """
+    if isinstance(relevance, str):
+        try:
+            relevance = json.loads(relevance)
+        except ValueError:
+            relevance = None
+    if not isinstance(relevance, dict):
+        return (None,) * len(PSYCHOGRAPHIC_KEYS)
+
+    scores = []
+    for key in PSYCHOGRAPHIC_KEYS:
+        try:
+            scores.append(float(relevance[key]))
+        except (KeyError, TypeError, ValueError):
+            scores.append(None)
+    return tuple(scores)
+
+
+def next_change_seq(table: str) -> str:
+    """
+    SQL expression for the next change-feed sequence number of table.
+
+    One past the highest number used by a live row or a tombstone of that
+    table. SQLite serializes writers, so numbers only grow in commit order.
+    SqlCompiler turns this into nextval('<table>_change_seq') on PostgreSQL,
+    where setup_database.py creates the sequences and a trigger stamps each
+    write with its transaction id (change_xid).
+    """
+    return (
+        f"(SELECT MAX(seq) + 1 FROM (SELECT MAX(change_seq) AS seq FROM {table} "
+        f"UNION ALL SELECT MAX(change_seq) FROM change_tombstones "
+        f"WHERE table_name = '{table}' UNION ALL SELECT 0))"
+    )
+
+
+class FilterCompiler:
+    """
+    Compiles filter dicts into parameterized SQL predicates.
+
+    Each supported key maps to a (column, operator) pair. Keys that are not
+    declared raise ValueError instead of being ignored, so a typo or an
+    unsupported filter can never silently turn into a full table scan.
+
+    Operators:
+        eq        column = ? (or IN (...) when given a list/tuple/set)
+        gte, lte  range bounds
+        epoch_gte, epoch_lte
+                  range bounds on an epoch-seconds column; values may be
+                  datetimes, dates, ISO strings or epoch numbers
+        overlaps  (t0, t1) half-open window over (start, end, max_span_sql)
+                  columns; matches intervals intersecting [t0, t1) using a
+                  bounded range scan on start
+        not_null  truthy flag requiring all listed columns to be non-NULL
+        bbox      dict with min_lat/max_lat/min_lng/max_lng over (lat, lng) columns
+        score_min minimum psychographic score over the psychographic_* columns
+                  of a table alias: a float (any score) or a
+                  {score_name: minimum} dict (all must match)
+    Reserved keys:
+        after     keyset cursor, a tuple of values for the ORDER BY columns
+        limit     maximum number of rows
+        offset    rows to skip
+    """
+
+    PAGING_KEYS = ("after", "limit", "offset")
+
+    def __init__(
+        self,
+        entity: str,
+        fields: Dict[str, Tuple[Any, str]],
+        order_by: List[Tuple[str, str]],
+        db_type: str = "sqlite",
+    ):
+        self.entity = entity
+        self.fields = fields
+        self.order_by = order_by
+        self.db_type = db_type
+
+    def compile(
+        self, filters: Optional[Dict] = None, always_order: bool = True
+    ) -> Tuple[str, str, List[Any]]:
+        """
+        Compile filters into (where_sql, tail_sql, params).
+
+        where_sql is a string of " AND ..." predicates to append after a WHERE
+        clause; tail_sql holds ORDER BY / LIMIT / OFFSET.
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(self.fields) - set(self.PAGING_KEYS)
+        if unknown:
+            raise ValueError(
+                f"Unsupported {self.entity} filter(s): {', '.join(sorted(unknown))}. "
+                f"Supported: {', '.join(sorted(self.fields) + list(self.PAGING_KEYS))}"
+            )
+
+        clauses, params = [], []
+        for key, value in filters.items():
+            if key in self.PAGING_KEYS or value is None:
+                continue
+            column, op = self.fields[key]
+            clause, clause_params = self._compile_predicate(key, column, op, value)
+            if clause:
+                clauses.append(clause)
+                params.extend(clause_params)
+
+        paging = any(filters.get(key) is not None for key in self.PAGING_KEYS)
+
+        after = filters.get("after")
+        if after is not None:
+            clause, clause_params = self._compile_cursor(after)
+            clauses.append(clause)
+            params.extend(clause_params)
+
+        where_sql = "".join(f" AND {clause}" for clause in clauses)
+
+        tail_sql = ""
+        if always_order or paging:
+            tail_sql += " ORDER BY " + ", ".join(
+                f"{column} {direction}" for column, direction in self.order_by
+            )
+
+        if filters.get("limit") is not None:
+            tail_sql += " LIMIT ?"
+            params.append(self._non_negative_int("limit", filters["limit"]))
+        if filters.get("offset") is not None:
+            if filters.get("limit") is None:
+                # OFFSET requires a LIMIT in SQLite; -1 means unbounded
+                tail_sql += " LIMIT -1" if self.db_type == "sqlite" else " LIMIT ALL"
+            tail_sql += " OFFSET ?"
+            params.append(self._non_negative_int("offset", filters["offset"]))
+
+        return where_sql, tail_sql, params
+
+    def _compile_predicate(
+        self, key: str, column: Any, op: str, value: Any
+    ) -> Tuple[Optional[str], List[Any]]:
+        if op == "eq":
+            if isinstance(value, (list, tuple, set, frozenset)):
+                values = list(value)
+                if not values:
+                    return "1 = 0", []
+                placeholders = ",".join(["?" for _ in values])
+                return f"{column} IN ({placeholders})", values
+            return f"{column} = ?", [value]
+
+        if op == "gte":
+            return f"{column} >= ?", [value]
+
+        if op == "lte":
+            return f"{column} <= ?", [value]
+
+        if op == "epoch_gte":
+            return f"{column} >= ?", [self._epoch(key, value)]
+
+        if op == "epoch_lte":
+            return f"{column} <= ?", [self._epoch(key, value)]
+
+        if op == "overlaps":
+            start_column, end_column, max_span_sql = column
+            try:
+                t0, t1 = value
+            except (TypeError, ValueError):
+                raise ValueError(f"Filter '{key}' needs a (start, end) pair")
+            t0, t1 = self._epoch(key, t0), self._epoch(key, t1)
+            # Nothing starting before t0 - max_span can reach t0, so the scan
+            # over start stays bounded on both sides
+            return (
+                f"{start_column} >= ? - {max_span_sql} AND {start_column} < ? "
+                f"AND ({end_column} > ? OR {start_column} >= ?)",
+                [t0, t1, t0, t0],
+            )
+
+        if op == "not_null":
+            if not value:
+                return None, []
+            return " AND ".join(f"{c} IS NOT NULL" for c in column), []
+
+        if op == "bbox":
+            lat_column, lng_column = column
+            try:
+                bounds = [
+                    float(value[k])
+                    for k in ("min_lat", "max_lat", "min_lng", "max_lng")
+                ]
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(
+                    f"Filter '{key}' needs numeric min_lat, max_lat, min_lng, max_lng"
+                )
+            return (
+                f"{lat_column} BETWEEN ? AND ? AND {lng_column} BETWEEN ? AND ?",
+                bounds,
+            )
+
+        if op == "score_min":
+            if isinstance(value, dict):
+                unknown = set(value) - set(PSYCHOGRAPHIC_KEYS)
+                if unknown:
+                    raise ValueError(
+                        f"Unsupported psychographic score(s) in '{key}': {sorted(unknown)}"
+                    )
+                parts = [f"{column}.psychographic_{k} >= ?" for k in value]
+                return " AND ".join(parts), [float(v) for v in value.values()]
+            parts = [f"{column}.{c} >= ?" for c in PSYCHOGRAPHIC_COLUMNS]
+            return "(" + " OR ".join(parts) + ")", [float(value)] * len(parts)
+
+        raise ValueError(f"Unknown filter operator '{op}' for '{key}'")
+
+    def _compile_cursor(self, after: Any) -> Tuple[str, List[Any]]:
+        """Keyset predicate: rows strictly after `after` in ORDER BY order"""
+        values = list(after) if isinstance(after, (list, tuple)) else [after]
+        if len(values) != len(self.order_by):
+            raise ValueError(
+                f"Cursor for {self.entity} needs {len(self.order_by)} values "
+                f"({', '.join(c for c, _ in self.order_by)})"
+            )
+
+        directions = {direction.upper() for _, direction in self.order_by}
+        if len(directions) == 1:
+            # Row values compile to a single index range seek
+            comparison = "<" if directions == {"DESC"} else ">"
+            columns = ", ".join(column for column, _ in self.order_by)
+            placeholders = ", ".join("?" for _ in values)
+            return f"(({columns}) {comparison} ({placeholders}))", values
+
+        # Expand (a, b) > (x, y) so mixed ASC/DESC orderings work too
+        disjuncts, params = [], []
+        for i, (column, direction) in enumerate(self.order_by):
+            comparison = "<" if direction.upper() == "DESC" else ">"
+            equal_parts = [f"{c} = ?" for c, _ in self.order_by[:i]]
+            disjuncts.append(
+                "(" + " AND ".join(equal_parts + [f"{column} {comparison} ?"]) + ")"
+            )
+            params.extend(values[:i] + [values[i]])
+        return "(" + " OR ".join(disjuncts) + ")", params
+
+    @staticmethod
+    def _epoch(key: str, value: Any) -> int:
+        epoch = to_epoch_seconds(value)
+        if epoch is None:
+            raise ValueError(f"Filter '{key}' needs a date/time value, got {value!r}")
+        return epoch
+
+    @staticmethod
+    def _non_negative_int(key: str, value: Any) -> int:
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Filter '{key}' must be an integer, got {value!r}")
+        if number < 0:
+            raise ValueError(f"Filter '{key}' must be non-negative, got {number}")
+        return number
+
+
+CompiledSql = namedtuple("CompiledSql", ["sql", "prepare_sql", "param_count", "name"])
+
+
+class SqlCompiler:
+    """
+    Translates SQLite-dialect SQL to PostgreSQL once per distinct string.
+
+    Database queries are written for SQLite: ? placeholders, datetime('now',
+    ...), strftime('%s', ...), INSERT OR REPLACE/IGNORE and scalar MIN/MAX.
+    On PostgreSQL each distinct statement is rewritten on first use and
+    cached, so repeated calls cost a dict lookup. Each result carries both a
+    psycopg2 form (%s) and a PREPARE form ($1, $2, ...) with a stable name.
+    """
+
+    # INSERT OR REPLACE needs an explicit conflict target on PostgreSQL.
+    # None marks tables without a natural key, where REPLACE is a plain insert.
+    REPLACE_KEYS = {
+        "api_cache": ("cache_key",),
+        "geocoding_cache": ("address",),
+        "system_config": ("config_key",),
+        "social_sentiment_data": None,
+    }
+
+    FUNCTION_REWRITES = [
+        (
+            re.compile(
+                r"CAST\(\s*strftime\(\s*'%s'\s*,\s*'now'\s*\)\s+AS\s+INTEGER\s*\)", re.I
+            ),
+            "CAST(EXTRACT(EPOCH FROM CURRENT_TIMESTAMP) AS BIGINT)",
+        ),
+        (
+            re.compile(
+                r"CAST\(\s*strftime\(\s*'%s'\s*,\s*([\w.]+)\s*\)\s+AS\s+INTEGER\s*\)",
+                re.I,
+            ),
+            r"CAST(EXTRACT(EPOCH FROM \1) AS BIGINT)",
+        ),
+        (re.compile(r"datetime\(\s*'now'\s*\)", re.I), "CURRENT_TIMESTAMP"),
+        (
+            re.compile(r"datetime\(\s*'now'\s*,\s*'([^']*)'\s*\)", re.I),
+            r"(CURRENT_TIMESTAMP + INTERVAL '\1')",
+        ),
+        (
+            re.compile(r"datetime\(\s*'now'\s*,\s*\?\s*\)", re.I),
+            "(CURRENT_TIMESTAMP + CAST(? AS INTERVAL))",
+        ),
+        (re.compile(r"\bIFNULL\s*\(", re.I), "COALESCE("),
+        (
+            re.compile(
+                r"\(SELECT MAX\(seq\) \+ 1 FROM \(SELECT MAX\(change_seq\) AS seq "
+                r"FROM (\w+) UNION ALL .*? UNION ALL SELECT 0\)\)"
+            ),
+            r"nextval('\1_change_seq')",
+        ),
+        (re.compile(r"\bLIMIT\s+-1\b", re.I), "LIMIT ALL"),
+    ]
+
+    INSERT_OR = re.compile(
+        r"^(\s*)INSERT\s+OR\s+(REPLACE|IGNORE)\s+INTO\s+(\w+)\s*\(([^)]*)\)", re.I
+    )
+    SCALAR_MIN_MAX = re.compile(r"\b(MIN|MAX)\s*\(", re.I)
+    # Quoted literals and identifiers are copied through untouched
+    QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: Dict[str, CompiledSql] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, sql: str) -> CompiledSql:
+        compiled = self._cache.get(sql)
+        if compiled is not None:
+            self.hits += 1
+            return compiled
+
+        compiled = self._translate(sql)
+        with self._lock:
+            self.misses += 1
+            if len(self._cache) >= self.max_size:
+                self._cache.clear()
+            self._cache[sql] = compiled
+        return compiled
+
+    def _translate(self, sql: str) -> CompiledSql:
+        text = sql
+        for pattern, replacement in self.FUNCTION_REWRITES:
+            text = pattern.sub(replacement, text)
+        text = self._rewrite_insert_or(text)
+        text = self._rewrite_scalar_min_max(text)
+
+        # psycopg2 treats % as a format character whenever params are passed
+        pyformat, numbered, count = [], [], 0
+        for i, segment in enumerate(self.QUOTED.split(text)):
+            if i % 2:
+                pyformat.append(segment.replace("%", "%%"))
+                numbered.append(segment)
+                continue
+            pyformat.append(segment.replace("%", "%%").replace("?", "%s"))
+            pieces = segment.split("?")
+            for piece in pieces[:-1]:
+                count += 1
+                numbered.append(f"{piece}${count}")
+            numbered.append(pieces[-1])
+
+        name = "ppm_" + hashlib.sha1(sql.encode()).hexdigest()[:16]
+        return CompiledSql("".join(pyformat), "".join(numbered), count, name)
+
+    def _rewrite_insert_or(self, text: str) -> str:
+        match = self.INSERT_OR.match(text)
+        if not match:
+            return text
+
+        indent, action, table, columns = match.groups()
+        text = f"{indent}INSERT INTO {table} ({columns})" + text[match.end() :]
+        body = text.rstrip().rstrip(";")
+        if action.upper() == "IGNORE":
+            return body + " ON CONFLICT DO NOTHING"
+
+        if table not in self.REPLACE_KEYS:
+            raise ValueError(
+                f"No conflict key known for INSERT OR REPLACE INTO {table}"
+            )
+        keys = self.REPLACE_KEYS[table]
+        if keys is None:
+            return body
+        updates = [
+            f"{column} = EXCLUDED.{column}"
+            for column in (c.strip() for c in columns.split(","))
+            if column and column not in keys
+        ]
+        action_sql = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+        return f"{body} ON CONFLICT ({', '.join(keys)}) {action_sql}"
+
+    def _rewrite_scalar_min_max(self, text: str) -> str:
+        """MIN(a, b) / MAX(a, b) become LEAST / GREATEST; aggregates are kept"""
+        position = 0
+        while True:
+            match = self.SCALAR_MIN_MAX.search(text, position)
+            if not match:
+                return text
+            depth, commas, i = 1, 0, match.end()
+            while i < len(text) and depth:
+                if text[i] == "(":
+                    depth += 1
+                elif text[i] == ")":
+                    depth -= 1
+                elif text[i] == "," and depth == 1:
+                    commas += 1
+                i += 1
+            if commas:
+                name = "LEAST" if match.group(1).upper() == "MIN" else "GREATEST"
+                text = text[: match.start(1)] + name + text[match.end(1) :]
+            position = match.start() + 1
+
+
+class PgConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has prepared"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: set = set()
+
+
+class PgCursor:
+    """psycopg2 cursor wrapper that compiles SQLite-dialect statements"""
+
+    def __init__(self, cursor, compiler: SqlCompiler):
+        self.raw = cursor
+        self._compiler = compiler
+
+    def execute(self, query: str, params: Optional[tuple] = None, prepare=False):
+        compiled = self._compiler.compile(query)
+        params = tuple(params or ())
+        if prepare and self._ensure_prepared(compiled):
+            return self.raw.execute(self._execute_sql(compiled), params)
+        if not params and not compiled.param_count:
+            # Without arguments psycopg2 does no % processing at all
+            return self.raw.execute(compiled.prepare_sql)
+        return self.raw.execute(compiled.sql, params)
+
+    def executemany(self, query: str, params: List[tuple], prepare=False):
+        compiled = self._compiler.compile(query)
+        sql = compiled.sql
+        if prepare and self._ensure_prepared(compiled):
+            sql = self._execute_sql(compiled)
+        psycopg2.extras.execute_batch(self.raw, sql, params, page_size=500)
+
+    def _ensure_prepared(self, compiled: CompiledSql) -> bool:
+        """PREPARE once per connection; False when the connection can't track it"""
+        prepared = getattr(self.raw.connection, "prepared", None)
+        if prepared is None:
+            return False
+        if compiled.name not in prepared:
+            self.raw.execute(f"PREPARE {compiled.name} AS {compiled.prepare_sql}")
+            prepared.add(compiled.name)
+        return True
+
+    @staticmethod
+    def _execute_sql(compiled: CompiledSql) -> str:
+        if not compiled.param_count:
+            return f"EXECUTE {compiled.name}"
+        return f"EXECUTE {compiled.name} ({', '.join(['%s'] * compiled.param_count)})"
+
+    def __getattr__(self, name: str):
+        return getattr(self.raw, name)
+
+    def __iter__(self):
+        return iter(self.raw)
+
+
 class Database:
     """
     Single database interface for the entire PPM application.
@@ -36,8 +1011,28 @@ class Database:
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self._connection = None
         self._db_type = self._detect_database_type()
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._known_tables: Dict[str, bool] = {}
+        self._data_version = 0
+        self._summary_cache: Optional[Tuple[int, float, Dict]] = None
+        self._venue_names: Optional[Dict[str, str]] = None
+        self._venue_names_lock = threading.Lock()
+        self._sql = SqlCompiler()
+        self._cache_sweep_interval = float(os.getenv("CACHE_SWEEP_SECONDS", "300"))
+        self._next_cache_sweep = time.monotonic() + self._cache_sweep_interval
+        self._write_buffer = WriteBehindBuffer(
+            self._apply_buffered_writes,
+            interval=float(os.getenv("WRITE_BEHIND_FLUSH_SECONDS", "2")),
+            max_pending=int(os.getenv("WRITE_BEHIND_MAX_PENDING", "500")),
+        )
+        atexit.register(self.flush_writes)
+
+    @property
+    def db_type(self) -> str:
+        """'sqlite' or 'postgresql'"""
+        return self._db_type
 
     def _detect_database_type(self) -> str:
         """Detect whether to use SQLite or PostgreSQL"""
@@ -47,56 +1042,106 @@ class Database:
 
     @contextmanager
     def get_connection(self):
-        """Get database connection with automatic cleanup"""
-        conn = None
+        """Borrow a pooled database connection with automatic cleanup"""
+        pool = self._get_pool()
+        conn = pool.acquire()
+        broken = False
         try:
-            if self._db_type == "postgresql":
-                conn = self._get_postgres_connection()
-            else:
-                conn = self._get_sqlite_connection()
-
             yield conn
 
         except Exception as e:
-            if conn:
+            try:
                 conn.rollback()
+            except Exception:
+                broken = True
             self.logger.error(f"Database error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
-
-    def _get_postgres_connection(self):
-        """Get PostgreSQL connection"""
+            pool.release(conn, discard=broken)
+
+    def _get_pool(self) -> ConnectionPool:
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    if self._db_type == "postgresql":
+                        connect = self._get_postgres_connect_kwargs
+                    else:
+                        connect = self._get_sqlite_connection
+                    self._pool = ConnectionPool(
+                        self._db_type,
+                        connect,
+                        max_size=int(os.getenv("DB_POOL_SIZE", "5")),
+                        timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                    )
+        return self._pool
+
+    def get_pool_stats(self) -> Dict:
+        """Get connection pool size and wait-time metrics"""
+        stats = self._get_pool().stats()
+        return {**stats.__dict__, "avg_wait_seconds": stats.avg_wait_seconds}
+
+    def close(self):
+        """Flush buffered writes and close all pooled connections"""
+        self.flush_writes()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    def _get_postgres_connect_kwargs(self) -> Dict:
+        """Get PostgreSQL connection parameters"""
         database_url = os.getenv("DATABASE_URL")
         if database_url:
-            return psycopg2.connect(database_url)
-
-        return psycopg2.connect(
-            host=os.getenv("POSTGRES_HOST", "localhost"),
-            port=os.getenv("POSTGRES_PORT", 5432),
-            database=os.getenv("POSTGRES_DB", "ppm"),
-            user=os.getenv("POSTGRES_USER", "postgres"),
-            password=os.getenv("POSTGRES_PASSWORD", ""),
-        )
+            return {"dsn": database_url, "connection_factory": PgConnection}
+
+        return {
+            "host": os.getenv("POSTGRES_HOST", "localhost"),
+            "port": os.getenv("POSTGRES_PORT", 5432),
+            "database": os.getenv("POSTGRES_DB", "ppm"),
+            "user": os.getenv("POSTGRES_USER", "postgres"),
+            "password": os.getenv("POSTGRES_PASSWORD", ""),
+            "connection_factory": PgConnection,
+        }
+
+    def _cursor(self, conn, name: Optional[str] = None):
+        """Cursor that accepts SQLite-dialect SQL on either backend"""
+        if self._db_type == "postgresql":
+            raw = conn.cursor(name=name) if name else conn.cursor()
+            return PgCursor(raw, self._sql)
+        return conn.cursor()
+
+    def get_sql_cache_stats(self) -> Dict:
+        """Statement compiler cache hits and misses"""
+        return {
+            "hits": self._sql.hits,
+            "misses": self._sql.misses,
+            "size": len(self._sql._cache),
+        }
 
     def _get_sqlite_connection(self):
-        """Get SQLite connection"""
+        """Open a SQLite connection that can be handed between threads"""
         db_path = os.getenv("SQLITE_DB_PATH", "ppm.db")
-        return sqlite3.connect(db_path)
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    def execute_query(
+        self, query: str, params: tuple = None, prepared: bool = False
+    ) -> List[Dict]:
+        """Execute a SELECT query and return results as list of dictionaries
 
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
-        """Execute a SELECT query and return results as list of dictionaries"""
+        prepared=True keeps a server-side prepared statement per connection on
+        PostgreSQL, for hot lookups that run with many different parameters.
+        """
         try:
             with self.get_connection() as conn:
                 if self._db_type == "postgresql":
-                    cursor = conn.cursor()
-                    cursor.execute(query, params or ())
+                    cursor = self._cursor(conn)
+                    cursor.execute(query, params or (), prepare=prepared)
                     columns = [desc[0] for desc in cursor.description]
                     results = [dict(zip(columns, row)) for row in cursor.fetchall()]
                 else:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.cursor()
+                    cursor = self._cursor(conn)
+                    cursor.row_factory = sqlite3.Row
                     cursor.execute(query, params or ())
                     results = [dict(row) for row in cursor.fetchall()]
 
@@ -106,13 +1151,19 @@ class Database:
             self.logger.error(f"Query execution failed: {e}")
             return []
 
-    def execute_update(self, query: str, params: tuple = None) -> OperationResult:
+    def execute_update(
+        self, query: str, params: tuple = None, prepared: bool = False
+    ) -> OperationResult:
         """Execute an INSERT/UPDATE/DELETE query"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params or ())
+                cursor = self._cursor(conn)
+                if self._db_type == "postgresql":
+                    cursor.execute(query, params or (), prepare=prepared)
+                else:
+                    cursor.execute(query, params or ())
                 conn.commit()
+                self._data_version += 1
 
                 return OperationResult(
                     success=True,
@@ -126,37 +1177,556 @@ class Database:
                 success=False, error=str(e), message=f"Database update failed: {e}"
             )
 
+    # ========== STREAMING QUERIES ==========
+
+    ROW_FORMATS = ("dict", "tuple", "namedtuple")
+
+    def iter_query_batches(
+        self,
+        query: str,
+        params: tuple = None,
+        batch_size: int = 1000,
+        row_format: str = "dict",
+    ) -> Iterator[List]:
+        """
+        Stream a SELECT query as lists of at most batch_size rows.
+
+        Rows are pulled with fetchmany(); on PostgreSQL a named (server-side)
+        cursor is used so the result set never materializes on the client.
+        The pooled connection is held until the generator is exhausted or
+        closed, so consume it promptly. Errors are raised, not swallowed.
+        """
+        if row_format not in self.ROW_FORMATS:
+            raise ValueError(
+                f"Unsupported row_format '{row_format}', "
+                f"expected one of {self.ROW_FORMATS}"
+            )
+
+        make_row = None
+        for columns, rows in self._stream_rows(query, params, batch_size):
+            if make_row is None:
+                make_row = self._row_builder(columns, row_format)
+            if rows:
+                yield [make_row(row) for row in rows]
+
+    def iter_query(
+        self,
+        query: str,
+        params: tuple = None,
+        batch_size: int = 1000,
+        row_format: str = "dict",
+    ) -> Iterator[Union[Dict, Tuple]]:
+        """Stream a SELECT query row by row (see iter_query_batches)"""
+        for batch in self.iter_query_batches(query, params, batch_size, row_format):
+            yield from batch
+
+    def _stream_rows(
+        self, query: str, params: Optional[tuple], batch_size: int
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """Yield (columns, raw rows) per fetchmany batch; once with [] if empty"""
+        with self.get_connection() as conn:
+            cursor = self._cursor(conn, name=f"ppm_stream_{uuid.uuid4().hex}")
+            if self._db_type == "postgresql":
+                cursor.raw.itersize = batch_size
+
+            try:
+                cursor.execute(query, params or ())
+                fetched_any = False
+
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    # Named cursors only populate description after a fetch
+                    columns = [desc[0] for desc in cursor.description]
+                    if not rows:
+                        if not fetched_any:
+                            yield columns, []
+                        break
+
+                    fetched_any = True
+                    yield columns, rows
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _row_builder(columns: List[str], row_format: str) -> Callable:
+        if row_format == "tuple":
+            return tuple
+        if row_format == "namedtuple":
+            row_type = namedtuple("Row", columns, rename=True)
+            return lambda row: row_type(*row)
+        return lambda row: dict(zip(columns, row))
+
+    # ========== COLUMNAR QUERIES ==========
+
+    # Arrow types for well-known columns; anything else is inferred
+    COLUMN_TYPES = {
+        "lat": pa.float32(),
+        "lng": pa.float32(),
+        "latitude": pa.float32(),
+        "longitude": pa.float32(),
+        "avg_rating": pa.float64(),
+        "prediction_value": pa.float64(),
+        "confidence_score": pa.float64(),
+        "created_at": pa.timestamp("us"),
+        "updated_at": pa.timestamp("us"),
+        "start_time": pa.timestamp("us"),
+        "end_time": pa.timestamp("us"),
+        "generated_at": pa.timestamp("us"),
+        **{column: pa.float64() for column in PSYCHOGRAPHIC_COLUMNS},
+    }
+
+    def query_arrow(
+        self,
+        query: str,
+        params: tuple = None,
+        column_types: Optional[Dict[str, pa.DataType]] = None,
+        batch_size: int = 50000,
+    ) -> pa.Table:
+        """
+        Run a SELECT query and build an Arrow table straight from the cursor.
+
+        Rows are streamed with fetchmany() and transposed into typed column
+        chunks one batch at a time, so no per-row dicts are ever created.
+        Coordinates come back as float32; see COLUMN_TYPES for the defaults,
+        which column_types can extend or override.
+        """
+        types = {**self.COLUMN_TYPES, **(column_types or {})}
+        columns, chunks = [], []
+
+        for columns, rows in self._stream_rows(query, params, batch_size):
+            if not chunks:
+                chunks = [[] for _ in columns]
+            for chunk, values in zip(chunks, zip(*rows)):
+                chunk.append(self._arrow_chunk(values))
+
+        arrays = [
+            self._unify_chunks(name, chunk, types.get(name))
+            for name, chunk in zip(columns, chunks)
+        ]
+        return pa.table(arrays, names=columns)
+
+    def query_frame(
+        self,
+        query: str,
+        params: tuple = None,
+        column_types: Optional[Dict[str, pa.DataType]] = None,
+        batch_size: int = 50000,
+    ) -> pd.DataFrame:
+        """Run a SELECT query into a typed pandas DataFrame (see query_arrow)"""
+        return self.query_arrow(query, params, column_types, batch_size).to_pandas()
+
+    def venues_frame(self, filters: Optional[Dict] = None) -> pd.DataFrame:
+        """Get venues matching filters as a DataFrame"""
+        return self.query_frame(*self._venues_query(filters))
+
+    def events_frame(self, filters: Optional[Dict] = None) -> pd.DataFrame:
+        """Get events matching filters as a DataFrame, newest first"""
+        return self.query_frame(*self._events_query(filters))
+
+    def predictions_frame(self, filters: Optional[Dict] = None) -> pd.DataFrame:
+        """Get ML predictions matching filters as a DataFrame"""
+        return self.query_frame(*self._predictions_query(None, filters))
+
+    # Look-back windows, in days, for the per-venue event counts
+    EVENT_FEATURE_WINDOWS = (7, 30, 90)
+
+    # Local start hours counted as prime time (inclusive)
+    PRIME_TIME_HOURS = (18, 22)
+
+    def venue_event_features(
+        self, venue_ids: Optional[List[str]] = None, now: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Per-venue event aggregates as a DataFrame, one row per venue with events.
+
+        A single GROUP BY pass over the events from the widest window onwards
+        yields event_count_last_<n>d for each EVENT_FEATURE_WINDOWS entry,
+        upcoming_event_count, avg_event_attendance over past events (actual,
+        else predicted) and prime_time_share. Start hours come from start_ts
+        in EVENT_TIMEZONE. Venues without events have no row.
+        """
+        counts = [f"event_count_last_{days}d" for days in self.EVENT_FEATURE_WINDOWS]
+        counts.append("upcoming_event_count")
+        column_types = {
+            **{column: pa.int64() for column in counts},
+            "avg_event_attendance": pa.float64(),
+            "prime_time_share": pa.float64(),
+        }
+        columns = ["venue_id", *column_types]
+        if venue_ids is not None and not venue_ids:
+            return pd.DataFrame(columns=columns)
+
+        now_ts = to_epoch_seconds(now) if now is not None else int(time.time())
+        since_ts = now_ts - max(self.EVENT_FEATURE_WINDOWS) * 86400
+
+        # Local hour as plain integer arithmetic on start_ts, with the zone's
+        # UTC offset picked per DST span
+        latest = self.execute_query(
+            "SELECT MAX(start_ts) AS latest FROM events WHERE start_ts >= ?",
+            (since_ts,),
+        )
+        spans = utc_offset_spans(since_ts, max(latest[0]["latest"] or 0, since_ts))
+        offset_sql = "?"
+        offset_params = [spans[-1][1]]
+        if len(spans) > 1:
+            offset_sql = "CASE {} ELSE ? END".format(
+                " ".join("WHEN start_ts < ? THEN ?" for _ in spans[1:])
+            )
+            offset_params = [
+                value
+                for (_, offset), (boundary, _) in zip(spans, spans[1:])
+                for value in (boundary, offset)
+            ] + offset_params
+        hour = f"((start_ts + {offset_sql}) % 86400) / 3600"
+
+        selects, params = ["venue_id"], []
+        for days in self.EVENT_FEATURE_WINDOWS:
+            selects.append(
+                "SUM(CASE WHEN start_ts >= ? AND start_ts < ? THEN 1 ELSE 0 END) "
+                f"AS event_count_last_{days}d"
+            )
+            params += [now_ts - days * 86400, now_ts]
+        selects += [
+            "SUM(CASE WHEN start_ts >= ? THEN 1 ELSE 0 END) AS upcoming_event_count",
+            "AVG(CASE WHEN start_ts < ? "
+            "THEN COALESCE(actual_attendance, predicted_attendance) END) "
+            "AS avg_event_attendance",
+            f"AVG(CASE WHEN {hour} BETWEEN ? AND ? THEN 1.0 ELSE 0.0 END) "
+            "AS prime_time_share",
+        ]
+        params += [now_ts, now_ts, *offset_params, *self.PRIME_TIME_HOURS]
+
+        # start_ts >= ? also keeps every averaged hour non-NULL
+        query = f"""
+            SELECT {', '.join(selects)}
+            FROM events
+            WHERE start_ts >= ? AND venue_id IS NOT NULL
+        """
+        params.append(since_ts)
+        if venue_ids is not None:
+            query += f" AND venue_id IN ({','.join('?' for _ in venue_ids)})"
+            params += list(venue_ids)
+        query += " GROUP BY venue_id"
+
+        frame = self.query_frame(query, tuple(params), column_types)
+        # An empty result carries no columns
+        return frame.reindex(columns=columns)
+
+    @staticmethod
+    def _arrow_chunk(values: tuple) -> pa.Array:
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # SQLite columns can mix storage classes; fall back to text
+            return pa.array([None if v is None else str(v) for v in values])
+
+    def _unify_chunks(
+        self, name: str, chunks: List[pa.Array], target: Optional[pa.DataType]
+    ) -> pa.ChunkedArray:
+        """Cast per-batch chunks of one column to a single type"""
+        if target is not None:
+            try:
+                return pa.chunked_array([c.cast(target) for c in chunks], target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                self.logger.debug(f"Column {name} kept its inferred type: {e}")
+
+        seen = {c.type for c in chunks if c.type != pa.null()}
+        if not seen:
+            return pa.chunked_array(chunks, pa.null())
+        if len(seen) == 1:
+            target = seen.pop()
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in seen):
+            target = pa.float64()
+        else:
+            target = pa.string()
+
+        return pa.chunked_array([c.cast(target) for c in chunks], target)
+
+    # ========== PAGINATION ==========
+
+    PAGE_SIZE_MAX = 5000
+
+    def _page(
+        self,
+        entity: str,
+        build_query: Callable[[Dict], Tuple[str, tuple]],
+        key_columns: Tuple[str, ...],
+        filters: Optional[Dict],
+        after: Any,
+        size: int,
+    ) -> Page:
+        """
+        Fetch one keyset page of `size` rows strictly after `after`.
+
+        `after` is a continuation token from a previous page or the raw key
+        tuple. One extra row is read to tell whether another page exists.
+        """
+        size = FilterCompiler._non_negative_int("size", size)
+        if not 0 < size <= self.PAGE_SIZE_MAX:
+            raise ValueError(f"Page size must be between 1 and {self.PAGE_SIZE_MAX}")
+
+        filters = dict(filters or {})
+        reserved = set(filters) & set(FilterCompiler.PAGING_KEYS)
+        if reserved:
+            raise ValueError(f"Use after/size instead of {sorted(reserved)} filters")
+        if after is not None:
+            if isinstance(after, str):
+                after = self._decode_page_token(entity, after, len(key_columns))
+            filters["after"] = after
+        filters["limit"] = size + 1
+
+        rows = self.execute_query(*build_query(filters))
+        if len(rows) <= size:
+            return Page(items=rows)
+
+        items = rows[:size]
+        last = items[-1]
+        return Page(
+            items=items,
+            next_token=self._encode_page_token(
+                entity, [last[column] for column in key_columns]
+            ),
+        )
+
+    @staticmethod
+    def _encode_page_token(entity: str, values: List[Any]) -> str:
+        raw = json.dumps([entity, values], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_page_token(entity: str, token: str, width: int) -> List[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            token_entity, values = json.loads(raw)
+        except (ValueError, TypeError):
+            raise ValueError("Malformed page token")
+        if (
+            token_entity != entity
+            or not isinstance(values, list)
+            or len(values) != width
+        ):
+            raise ValueError(f"Page token does not belong to a {entity} listing")
+        return values
+
+    # ========== CHANGE FEED ==========
+
+    # table -> primary key, for tables whose writes are stamped with change_seq
+    CHANGE_FEEDS = {
+        "venues": "venue_id",
+        "events": "event_id",
+        "ml_predictions": "prediction_id",
+    }
+
+    def get_changes_since(
+        self, table: str, watermark: Optional[str] = None, batch: int = 1000
+    ) -> ChangeBatch:
+        """
+        Upserts and deletes in table after watermark, oldest change first.
+
+        Every write through Database stamps the row with the next change_seq
+        of its table, and deletes leave a tombstone numbered the same way. A
+        consumer that keeps the returned watermark sees each later change once,
+        with upserts carrying the row's current version. watermark=None starts
+        from the beginning, which doubles as a full sync.
+
+        On PostgreSQL change_seq comes from a sequence before commit, so a
+        transaction still in flight can commit a lower number than one already
+        read. There changes are ordered by the writing transaction
+        (change_xid, then change_seq), and only transactions older than the
+        snapshot's oldest in-flight one are returned.
+        """
+        if table not in self.CHANGE_FEEDS:
+            raise ValueError(
+                f"No change feed for '{table}'. "
+                f"Supported: {', '.join(sorted(self.CHANGE_FEEDS))}"
+            )
+
+        key = self.CHANGE_FEEDS[table]
+        entity = f"{table} changes"
+        size = min(max(int(batch), 1), self.PAGE_SIZE_MAX)
+        postgres = self._db_type == "postgresql"
+        order = ("change_xid", "change_seq") if postgres else ("change_seq",)
+        if watermark:
+            after = self._decode_page_token(entity, watermark, len(order) + 1)
+        else:
+            after = [0] * len(order) + [""]
+        columns = ", ".join(order)
+        marks = ", ".join("?" for _ in after)
+        settled = (
+            "AND change_xid < txid_snapshot_xmin(txid_current_snapshot())"
+            if postgres
+            else ""
+        )
+
+        # Both reads share one snapshot, so no change falls between them
+        with self.get_connection() as conn:
+            cursor = self._cursor(conn)
+            if postgres:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            self._begin(conn, cursor)
+            cursor.execute(
+                f"""
+                SELECT * FROM {table}
+                WHERE ({columns}, {key}) > ({marks}) {settled}
+                ORDER BY {columns}, {key}
+                LIMIT ?
+                """,
+                (*after, size + 1),
+            )
+            names = [desc[0] for desc in cursor.description]
+            rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+            cursor.execute(
+                f"""
+                SELECT row_key, {columns} FROM change_tombstones
+                WHERE table_name = ? AND ({columns}, row_key) > ({marks}) {settled}
+                ORDER BY {columns}, row_key
+                LIMIT ?
+                """,
+                (table, *after, size + 1),
+            )
+            tombstones = cursor.fetchall()
+            conn.rollback()
+
+        changes = [
+            {
+                "op": "upsert",
+                "key": row[key],
+                **{column: row[column] for column in order},
+                "row": row,
+            }
+            for row in rows
+        ]
+        changes += [
+            {"op": "delete", "key": row_key, **dict(zip(order, position))}
+            for row_key, *position in tombstones
+        ]
+        changes.sort(
+            key=lambda change: (*(change[column] for column in order), change["key"])
+        )
+
+        has_more = len(changes) > size
+        changes = changes[:size]
+        if changes:
+            last = changes[-1]
+            watermark = self._encode_page_token(
+                entity, [*(last[column] for column in order), last["key"]]
+            )
+        return ChangeBatch(changes=changes, watermark=watermark, has_more=has_more)
+
+    def backfill_change_seq(self) -> OperationResult:
+        """Stamp rows written without a change_seq (raw SQL, older databases)"""
+        try:
+            stamped = 0
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                for table in self.CHANGE_FEEDS:
+                    cursor.execute(
+                        f"UPDATE {table} SET change_seq = {next_change_seq(table)} "
+                        f"WHERE change_seq IS NULL"
+                    )
+                    stamped += cursor.rowcount
+                conn.commit()
+
+            if stamped:
+                self._data_version += 1
+            return OperationResult(
+                success=True,
+                data=stamped,
+                message=f"Stamped {stamped} rows with a change sequence",
+            )
+
+        except Exception as e:
+            self.logger.error(f"Change sequence backfill failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Change sequence backfill failed: {e}",
+            )
+
     # ========== VENUE OPERATIONS ==========
 
+    VENUE_COLUMNS = """
+        v.venue_id, v.external_id, v.provider, v.name, v.description, v.category,
+        v.subcategory, v.lat, v.lng, v.address, v.phone, v.website, v.avg_rating,
+        v.psychographic_relevance, v.psychographic_career_driven,
+        v.psychographic_competent, v.psychographic_fun, v.psychographic_social,
+        v.psychographic_adventurous, v.created_at, v.updated_at
+    """
+
+    VENUE_FILTERS = {
+        "venue_id": ("v.venue_id", "eq"),
+        "external_id": ("v.external_id", "eq"),
+        "provider": ("v.provider", "eq"),
+        "category": ("v.category", "eq"),
+        "subcategory": ("v.subcategory", "eq"),
+        "min_rating": ("v.avg_rating", "gte"),
+        "max_rating": ("v.avg_rating", "lte"),
+        "has_location": (("v.lat", "v.lng"), "not_null"),
+        "bounds": (("v.lat", "v.lng"), "bbox"),
+        "psychographic_min": ("v", "score_min"),
+        "updated_since": ("v.updated_at", "gte"),
+    }
+
     def get_venues(
         self, filters: Optional[Dict] = None, limit: Optional[int] = None
     ) -> List[Dict]:
-        """Get venues with optional filtering"""
-        query = """
-            SELECT venue_id, external_id, provider, name, description, category, subcategory,
-                   lat, lng, address, phone, website, avg_rating, psychographic_relevance,
-                   created_at, updated_at
-            FROM venues
-            WHERE 1=1
         """
-        params = []
+        Get venues with optional filtering.
 
-        if filters:
-            if filters.get("category"):
-                query += " AND category = ?"
-                params.append(filters["category"])
+        All filters are pushed down into SQL; unsupported keys raise ValueError.
+        See VENUE_FILTERS and FilterCompiler for the supported keys.
+        """
+        return self.execute_query(*self._venues_query(filters, limit))
+
+    def iter_venues(
+        self,
+        filters: Optional[Dict] = None,
+        batch_size: int = 1000,
+        row_format: str = "dict",
+    ) -> Iterator[Union[Dict, Tuple]]:
+        """Stream venues matching filters without loading the table in memory"""
+        query, params = self._venues_query(filters)
+        return self.iter_query(query, params, batch_size, row_format)
+
+    def get_venues_page(
+        self,
+        after: Union[str, Tuple, None] = None,
+        size: int = 500,
+        filters: Optional[Dict] = None,
+    ) -> Page:
+        """Get one page of venues in venue_id order; pass next_token to continue"""
+        return self._page(
+            "venues", self._venues_query, ("venue_id",), filters, after, size
+        )
 
-            if filters.get("has_location"):
-                query += " AND lat IS NOT NULL AND lng IS NOT NULL"
+    def _venues_query(
+        self, filters: Optional[Dict], limit: Optional[int] = None
+    ) -> Tuple[str, tuple]:
+        filters = dict(filters or {})
+        if limit is not None:
+            filters["limit"] = limit
 
-            if filters.get("min_rating"):
-                query += " AND avg_rating >= ?"
-                params.append(filters["min_rating"])
+        where_sql, tail_sql, params = self._filter_compiler(
+            "venues", self.VENUE_FILTERS, [("v.venue_id", "ASC")]
+        ).compile(filters, always_order=False)
 
-        if limit:
-            query += f" LIMIT {limit}"
+        query = f"SELECT {self.VENUE_COLUMNS} FROM venues v WHERE 1=1"
+        return query + where_sql + tail_sql, tuple(params)
 
-        return self.execute_query(query, tuple(params))
+    def get_venue(self, venue_id: str) -> Optional[Dict]:
+        """Get a single venue by primary key"""
+        results = self.execute_query(
+            f"SELECT {self.VENUE_COLUMNS} FROM venues v WHERE v.venue_id = ?",
+            (venue_id,),
+            prepared=True,
+        )
+        return results[0] if results else None
+
+    def _filter_compiler(
+        self, entity: str, fields: Dict, order_by: List[Tuple[str, str]]
+    ) -> FilterCompiler:
+        return FilterCompiler(entity, fields, order_by, self._db_type)
 
     def get_venues_with_predictions(self) -> List[Dict]:
         """Get venues with their ML predictions - optimized for map display"""
@@ -182,15 +1752,19 @@ class Database:
 
             if existing:
                 # Update existing venue
-                query = """
+                query = f"""
                     UPDATE venues SET
-                        name = ?, description = ?, category = ?, subcategory = ?,
+                        name = ?, name_norm = ?, description = ?, category = ?,
+                        subcategory = ?,
                         lat = ?, lng = ?, address = ?, phone = ?, website = ?,
-                        avg_rating = ?, psychographic_relevance = ?, updated_at = ?
+                        avg_rating = ?, psychographic_relevance = ?,
+                        {self.PSYCHOGRAPHIC_SET}, updated_at = CURRENT_TIMESTAMP,
+                        change_seq = {next_change_seq('venues')}
                     WHERE venue_id = ?
                 """
                 params = (
                     venue_data.get("name"),
+                    normalize_venue_name(venue_data.get("name")),
                     venue_data.get("description"),
                     venue_data.get("category"),
                     venue_data.get("subcategory"),
@@ -205,7 +1779,7 @@ class Database:
                         if venue_data.get("psychographic_relevance")
                         else None
                     ),
-                    datetime.now(),
+                    *psychographic_scores(venue_data.get("psychographic_relevance")),
                     existing[0]["venue_id"],
                 )
 
@@ -214,16 +1788,20 @@ class Database:
                 return result
             else:
                 # Insert new venue
-                query = """
+                query = f"""
                     INSERT INTO venues (
-                        external_id, provider, name, description, category, subcategory,
-                        lat, lng, address, phone, website, avg_rating, psychographic_relevance
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        external_id, provider, name, name_norm, description, category,
+                        subcategory, lat, lng, address, phone, website, avg_rating,
+                        psychographic_relevance, {', '.join(PSYCHOGRAPHIC_COLUMNS)},
+                        change_seq
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                        ?, ?, ?, ?, ?, {next_change_seq('venues')})
                 """
                 params = (
                     venue_data.get("external_id"),
                     venue_data.get("provider"),
                     venue_data.get("name"),
+                    normalize_venue_name(venue_data.get("name")),
                     venue_data.get("description"),
                     venue_data.get("category"),
                     venue_data.get("subcategory"),
@@ -238,6 +1816,7 @@ class Database:
                         if venue_data.get("psychographic_relevance")
                         else None
                     ),
+                    *psychographic_scores(venue_data.get("psychographic_relevance")),
                 )
 
                 result = self.execute_update(query, params)
@@ -251,43 +1830,174 @@ class Database:
 
     # ========== EVENT OPERATIONS ==========
 
+    EVENT_COLUMNS = """
+        e.event_id, e.external_id, e.provider, e.name, e.description,
+        e.category, e.subcategory, e.start_time, e.end_time, e.start_ts, e.end_ts,
+        e.psychographic_relevance, e.psychographic_career_driven,
+        e.psychographic_competent, e.psychographic_fun, e.psychographic_social,
+        e.psychographic_adventurous, e.created_at, e.venue_id,
+        v.name as venue_name, v.lat, v.lng, v.address
+    """
+
+    # Longest event duration, answered from idx_events_span
+    EVENT_SPAN_SQL = "(SELECT COALESCE(MAX(end_ts - start_ts), 0) FROM events)"
+
+    EVENT_FILTERS = {
+        "event_id": ("e.event_id", "eq"),
+        "external_id": ("e.external_id", "eq"),
+        "provider": ("e.provider", "eq"),
+        "venue_id": ("e.venue_id", "eq"),
+        "category": ("e.category", "eq"),
+        "start_date": ("e.start_ts", "epoch_gte"),
+        "end_date": ("e.start_ts", "epoch_lte"),
+        "during": (("e.start_ts", "e.end_ts", EVENT_SPAN_SQL), "overlaps"),
+        "has_location": (("v.lat", "v.lng"), "not_null"),
+        "has_time": (("e.start_ts",), "not_null"),
+        "bounds": (("v.lat", "v.lng"), "bbox"),
+        "psychographic_min": ("e", "score_min"),
+        "updated_since": ("e.updated_at", "gte"),
+    }
+
     def get_events(
         self, filters: Optional[Dict] = None, limit: Optional[int] = None
     ) -> List[Dict]:
-        """Get events with optional filtering"""
-        query = """
-            SELECT e.event_id, e.external_id, e.provider, e.name, e.description,
-                   e.category, e.subcategory, e.start_time, e.end_time,
-                   e.psychographic_relevance, e.created_at,
-                   v.name as venue_name, v.lat, v.lng, v.address
-            FROM events e
-            LEFT JOIN venues v ON e.venue_id = v.venue_id
-            WHERE 1=1
         """
-        params = []
+        Get events with optional filtering, newest first.
 
-        if filters:
-            if filters.get("category"):
-                query += " AND e.category = ?"
-                params.append(filters["category"])
-
-            if filters.get("start_date"):
-                query += " AND e.start_time >= ?"
-                params.append(filters["start_date"])
+        All filters are pushed down into SQL; unsupported keys raise ValueError.
+        See EVENT_FILTERS and FilterCompiler for the supported keys.
+        """
+        return self.execute_query(*self._events_query(filters, limit))
 
-            if filters.get("end_date"):
-                query += " AND e.start_time <= ?"
-                params.append(filters["end_date"])
+    def iter_events(
+        self,
+        filters: Optional[Dict] = None,
+        batch_size: int = 1000,
+        row_format: str = "dict",
+    ) -> Iterator[Union[Dict, Tuple]]:
+        """Stream events matching filters, newest first"""
+        query, params = self._events_query(filters)
+        return self.iter_query(query, params, batch_size, row_format)
+
+    def get_events_overlapping(
+        self,
+        start: Any,
+        end: Any,
+        filters: Optional[Dict] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Get events whose [start_ts, end_ts) intersects [start, end).
 
-            if filters.get("has_location"):
-                query += " AND v.lat IS NOT NULL AND v.lng IS NOT NULL"
+        Bounds may be datetimes, dates, ISO strings or epoch seconds; naive
+        values are read in EVENT_TIMEZONE. Served by a range scan on
+        idx_events_start_ts.
+        """
+        return self.get_events({**(filters or {}), "during": (start, end)}, limit)
 
-        query += " ORDER BY e.start_time DESC"
+    def get_events_page(
+        self,
+        after: Union[str, Tuple, None] = None,
+        size: int = 500,
+        filters: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of timed events, newest first.
 
-        if limit:
-            query += f" LIMIT {limit}"
+        `after` is the previous page's next_token or a raw (start_ts, event_id)
+        tuple. Each page is one range seek on idx_events_page, so cost stays
+        proportional to the page size however deep the walk goes. Events
+        without a start time have no position in this order and are skipped.
+        """
+        return self._page(
+            "events",
+            self._events_query,
+            ("start_ts", "event_id"),
+            {**(filters or {}), "has_time": True},
+            after,
+            size,
+        )
 
-        return self.execute_query(query, tuple(params))
+    def _events_query(
+        self, filters: Optional[Dict], limit: Optional[int] = None
+    ) -> Tuple[str, tuple]:
+        filters = dict(filters or {})
+        if limit is not None:
+            filters["limit"] = limit
+
+        where_sql, tail_sql, params = self._filter_compiler(
+            "events",
+            self.EVENT_FILTERS,
+            [("e.start_ts", "DESC"), ("e.event_id", "DESC")],
+        ).compile(filters)
+
+        query = f"""
+            SELECT {self.EVENT_COLUMNS}
+            FROM events e
+            LEFT JOIN venues v ON e.venue_id = v.venue_id
+            WHERE 1=1
+        """
+        return query + where_sql + tail_sql, tuple(params)
+
+    def get_event(self, event_id: str) -> Optional[Dict]:
+        """Get a single event by primary key"""
+        results = self.execute_query(
+            f"""
+            SELECT {self.EVENT_COLUMNS}
+            FROM events e
+            LEFT JOIN venues v ON e.venue_id = v.venue_id
+            WHERE e.event_id = ?
+            """,
+            (event_id,),
+            prepared=True,
+        )
+        return results[0] if results else None
+
+    def normalize_event_times(self) -> OperationResult:
+        """Backfill start_ts/end_ts for events written without them"""
+        try:
+            rows = self.execute_query(
+                """
+                SELECT event_id, start_time, end_time, duration_minutes, timezone
+                FROM events
+                WHERE start_ts IS NULL AND start_time IS NOT NULL
+                """
+            )
+            updates = []
+            for row in rows:
+                start_ts, end_ts = self._event_times(row)
+                if start_ts is not None:
+                    updates.append((start_ts, end_ts, row["event_id"]))
+
+            if updates:
+                with self.get_connection() as conn:
+                    cursor = self._cursor(conn)
+                    self._executemany(
+                        cursor,
+                        "UPDATE events SET start_ts = ?, end_ts = ?, "
+                        "updated_at = CURRENT_TIMESTAMP, "
+                        f"change_seq = {next_change_seq('events')} WHERE event_id = ?",
+                        updates,
+                    )
+                    conn.commit()
+                self._data_version += 1
+
+            return OperationResult(
+                success=True,
+                data=len(updates),
+                message=(
+                    f"Normalized times for {len(updates)} events"
+                    f" ({len(rows) - len(updates)} unparseable)"
+                ),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Event time normalization failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Event time normalization failed: {e}",
+            )
 
     def upsert_event(self, event_data: Dict) -> OperationResult:
         """Insert or update an event"""
@@ -309,11 +2019,13 @@ class Database:
 
             if existing:
                 # Update existing event
-                query = """
+                query = f"""
                     UPDATE events SET
                         name = ?, description = ?, category = ?, subcategory = ?,
-                        start_time = ?, end_time = ?, venue_id = ?,
-                        psychographic_relevance = ?, updated_at = ?
+                        start_time = ?, end_time = ?, start_ts = ?, end_ts = ?,
+                        venue_id = ?, psychographic_relevance = ?,
+                        {self.PSYCHOGRAPHIC_SET}, updated_at = CURRENT_TIMESTAMP,
+                        change_seq = {next_change_seq('events')}
                     WHERE event_id = ?
                 """
                 params = (
@@ -323,13 +2035,14 @@ class Database:
                     event_data.get("subcategory"),
                     event_data.get("start_time"),
                     event_data.get("end_time"),
+                    *self._event_times(event_data),
                     venue_id,
                     (
                         json.dumps(event_data.get("psychographic_relevance"))
                         if event_data.get("psychographic_relevance")
                         else None
                     ),
-                    datetime.now(),
+                    *psychographic_scores(event_data.get("psychographic_relevance")),
                     existing[0]["event_id"],
                 )
 
@@ -338,11 +2051,14 @@ class Database:
                 return result
             else:
                 # Insert new event
-                query = """
+                query = f"""
                     INSERT INTO events (
                         external_id, provider, name, description, category, subcategory,
-                        start_time, end_time, venue_id, psychographic_relevance
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        start_time, end_time, start_ts, end_ts, venue_id,
+                        psychographic_relevance, {', '.join(PSYCHOGRAPHIC_COLUMNS)},
+                        change_seq
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                        ?, ?, ?, ?, ?, {next_change_seq('events')})
                 """
                 params = (
                     event_data.get("external_id"),
@@ -353,12 +2069,14 @@ class Database:
                     event_data.get("subcategory"),
                     event_data.get("start_time"),
                     event_data.get("end_time"),
+                    *self._event_times(event_data),
                     venue_id,
                     (
                         json.dumps(event_data.get("psychographic_relevance"))
                         if event_data.get("psychographic_relevance")
                         else None
                     ),
+                    *psychographic_scores(event_data.get("psychographic_relevance")),
                 )
 
                 result = self.execute_update(query, params)
@@ -372,45 +2090,195 @@ class Database:
 
     def _find_or_create_venue_for_event(self, event_data: Dict) -> Optional[str]:
         """Find existing venue or create a new one for an event"""
-        venue_name = event_data.get("venue_name")
-        if not venue_name:
+        name_norm = normalize_venue_name(event_data.get("venue_name"))
+        if not name_norm:
             return None
 
-        # Try to find existing venue
-        existing = self.execute_query(
-            "SELECT venue_id FROM venues WHERE LOWER(name) = LOWER(?) LIMIT 1",
-            (venue_name,),
-        )
+        venue_id = self._venue_id_for_name(name_norm)
+        if venue_id:
+            return venue_id
 
-        if existing:
-            return existing[0]["venue_id"]
+        # Create new venue; RETURNING saves re-selecting its generated id
+        record = self._event_venue_record(event_data)
+        try:
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                cursor.execute(
+                    self.VENUE_UPSERT_SQL + " RETURNING venue_id",
+                    self._venue_params(record),
+                )
+                venue_id = cursor.fetchone()[0]
+                conn.commit()
+            self._data_version += 1
+        except Exception as e:
+            self.logger.error(f"Failed to create venue '{record['name']}': {e}")
+            return None
 
-        # Create new venue
-        venue_data = {
-            "external_id": f"{event_data.get('provider', 'unknown')}_{venue_name.lower().replace(' ', '_')}",
-            "provider": event_data.get("provider", "unknown"),
-            "name": venue_name,
-            "category": "event_venue",
-            "lat": event_data.get("lat"),
-            "lng": event_data.get("lng"),
-            "address": event_data.get("address"),
-        }
+        self._venue_name_index()[name_norm] = venue_id
+        return venue_id
+
+    def _venue_name_index(self) -> Dict[str, str]:
+        """name_norm -> venue_id map, loaded once and kept current on insert"""
+        if self._venue_names is None:
+            with self._venue_names_lock:
+                if self._venue_names is None:
+                    names: Dict[str, str] = {}
+                    for name_norm, venue_id in self.iter_query(
+                        "SELECT name_norm, venue_id FROM venues "
+                        "WHERE name_norm IS NOT NULL",
+                        row_format="tuple",
+                    ):
+                        names.setdefault(name_norm, venue_id)
+                    self._venue_names = names
+        return self._venue_names
+
+    def _venue_id_for_name(self, name_norm: str) -> Optional[str]:
+        """Resolve a normalized name from memory, falling back to the index"""
+        names = self._venue_name_index()
+        venue_id = names.get(name_norm)
+        if venue_id is None:
+            # Another process may have created it since the map was loaded
+            rows = self.execute_query(
+                "SELECT venue_id FROM venues WHERE name_norm = ? LIMIT 1",
+                (name_norm,),
+                prepared=True,
+            )
+            if rows:
+                venue_id = names[name_norm] = rows[0]["venue_id"]
+        return venue_id
 
-        result = self.upsert_venue(venue_data)
-        if result.success:
-            # Get the newly created venue ID
-            new_venue = self.execute_query(
-                "SELECT venue_id FROM venues WHERE external_id = ? AND provider = ?",
-                (venue_data["external_id"], venue_data["provider"]),
+    def normalize_venue_names(self) -> OperationResult:
+        """Backfill name_norm for venues written without it"""
+        try:
+            rows = self.execute_query(
+                "SELECT venue_id, name FROM venues "
+                "WHERE name_norm IS NULL AND name IS NOT NULL"
             )
-            return new_venue[0]["venue_id"] if new_venue else None
+            updates = [
+                (normalize_venue_name(row["name"]), row["venue_id"]) for row in rows
+            ]
 
-        return None
+            if updates:
+                with self.get_connection() as conn:
+                    cursor = self._cursor(conn)
+                    self._executemany(
+                        cursor,
+                        "UPDATE venues SET name_norm = ?, "
+                        "updated_at = CURRENT_TIMESTAMP, "
+                        f"change_seq = {next_change_seq('venues')} WHERE venue_id = ?",
+                        updates,
+                    )
+                    conn.commit()
+                self._data_version += 1
+                self._venue_names = None
+
+            return OperationResult(
+                success=True,
+                data=len(updates),
+                message=f"Normalized names for {len(updates)} venues",
+            )
+
+        except Exception as e:
+            self.logger.error(f"Venue name normalization failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Venue name normalization failed: {e}",
+            )
+
+    def normalize_psychographic_scores(self) -> OperationResult:
+        """Backfill the psychographic_* columns for rows written without them"""
+        try:
+            unset = " AND ".join(f"{c} IS NULL" for c in PSYCHOGRAPHIC_COLUMNS)
+            filled = 0
+            for table, key in (("venues", "venue_id"), ("events", "event_id")):
+                rows = self.execute_query(
+                    f"SELECT {key}, psychographic_relevance FROM {table} "
+                    f"WHERE psychographic_relevance IS NOT NULL AND {unset}"
+                )
+                updates = []
+                for row in rows:
+                    scores = psychographic_scores(row["psychographic_relevance"])
+                    if any(score is not None for score in scores):
+                        updates.append((*scores, row[key]))
+
+                if updates:
+                    with self.get_connection() as conn:
+                        cursor = self._cursor(conn)
+                        self._executemany(
+                            cursor,
+                            f"UPDATE {table} SET {self.PSYCHOGRAPHIC_SET}, "
+                            "updated_at = CURRENT_TIMESTAMP, "
+                            f"change_seq = {next_change_seq(table)} WHERE {key} = ?",
+                            updates,
+                        )
+                        conn.commit()
+                    self._data_version += 1
+                    filled += len(updates)
+
+            return OperationResult(
+                success=True,
+                data=filled,
+                message=f"Filled psychographic score columns for {filled} rows",
+            )
+
+        except Exception as e:
+            self.logger.error(f"Psychographic score backfill failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Psychographic score backfill failed: {e}",
+            )
 
     # ========== ML PREDICTION OPERATIONS ==========
 
-    def get_predictions(self, venue_ids: Optional[List[str]] = None) -> List[Dict]:
-        """Get ML predictions"""
+    PREDICTION_FILTERS = {
+        "prediction_id": ("p.prediction_id", "eq"),
+        "venue_id": ("p.venue_id", "eq"),
+        "venue_ids": ("p.venue_id", "eq"),
+        "prediction_type": ("p.prediction_type", "eq"),
+        "model_version": ("p.model_version", "eq"),
+        "min_value": ("p.prediction_value", "gte"),
+        "min_confidence": ("p.confidence_score", "gte"),
+        "generated_since": ("p.generated_at", "gte"),
+        "has_location": (("v.lat", "v.lng"), "not_null"),
+        "bounds": (("v.lat", "v.lng"), "bbox"),
+    }
+
+    def get_predictions(
+        self, venue_ids: Optional[List[str]] = None, filters: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Get ML predictions, highest value first.
+
+        All filters are pushed down into SQL; unsupported keys raise ValueError.
+        See PREDICTION_FILTERS and FilterCompiler for the supported keys.
+        """
+        return self.execute_query(*self._predictions_query(venue_ids, filters))
+
+    def iter_predictions(
+        self,
+        filters: Optional[Dict] = None,
+        batch_size: int = 1000,
+        row_format: str = "dict",
+    ) -> Iterator[Union[Dict, Tuple]]:
+        """Stream ML predictions matching filters, highest value first"""
+        query, params = self._predictions_query(None, filters)
+        return self.iter_query(query, params, batch_size, row_format)
+
+    def _predictions_query(
+        self, venue_ids: Optional[List[str]], filters: Optional[Dict]
+    ) -> Tuple[str, tuple]:
+        filters = dict(filters or {})
+        if venue_ids:
+            filters["venue_ids"] = list(venue_ids)
+
+        where_sql, tail_sql, params = self._filter_compiler(
+            "predictions",
+            self.PREDICTION_FILTERS,
+            [("p.prediction_value", "DESC"), ("p.prediction_id", "DESC")],
+        ).compile(filters)
+
         query = """
             SELECT p.prediction_id, p.venue_id, p.prediction_type, p.prediction_value,
                    p.confidence_score, p.model_version, p.generated_at,
@@ -419,16 +2287,7 @@ class Database:
             LEFT JOIN venues v ON p.venue_id = v.venue_id
             WHERE 1=1
         """
-        params = []
-
-        if venue_ids:
-            placeholders = ",".join(["?" for _ in venue_ids])
-            query += f" AND p.venue_id IN ({placeholders})"
-            params.extend(venue_ids)
-
-        query += " ORDER BY p.prediction_value DESC"
-
-        return self.execute_query(query, tuple(params))
+        return query + where_sql + tail_sql, tuple(params)
 
     def upsert_prediction(self, prediction_data: Dict) -> OperationResult:
         """Insert or update an ML prediction"""
@@ -444,10 +2303,11 @@ class Database:
 
             if existing:
                 # Update existing prediction
-                query = """
+                query = f"""
                     UPDATE ml_predictions SET
                         prediction_value = ?, confidence_score = ?, model_version = ?,
-                        features_used = ?, generated_at = ?
+                        features_used = ?, generated_at = ?,
+                        change_seq = {next_change_seq('ml_predictions')}
                     WHERE prediction_id = ?
                 """
                 params = (
@@ -470,11 +2330,11 @@ class Database:
                 return result
             else:
                 # Insert new prediction
-                query = """
+                query = f"""
                     INSERT INTO ml_predictions (
                         venue_id, prediction_type, prediction_value, confidence_score,
-                        model_version, features_used, generated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                        model_version, features_used, generated_at, change_seq
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, {next_change_seq('ml_predictions')})
                 """
                 params = (
                     prediction_data.get("venue_id"),
@@ -499,32 +2359,1193 @@ class Database:
                 success=False, error=str(e), message=f"Failed to upsert prediction: {e}"
             )
 
+    # ========== ML MODEL REGISTRY ==========
+
+    MODEL_VERSION_COLUMNS = (
+        "version",
+        "model_type",
+        "training_samples",
+        "validation_samples",
+        "training_date",
+        "average_precision",
+        "auc_roc",
+        "precision_at_k",
+        "recall_at_k",
+        "f1_score",
+        "calibration_score",
+        "feature_list",
+        "feature_importance",
+        "hyperparameters",
+        "model_file_path",
+        "model_size_mb",
+        "model_sha256",
+        "training_duration",
+        "notes",
+    )
+
+    # Stored as JSON text, decoded again by get_model_versions
+    MODEL_VERSION_JSON = ("feature_list", "feature_importance", "hyperparameters")
+
+    def register_model_version(self, model_data: Dict) -> OperationResult:
+        """Record a trained model artifact in ml_model_versions"""
+        missing = self._missing_fields(model_data, ("version", "model_type"))
+        if missing:
+            return OperationResult(
+                success=False,
+                error=f"Missing required fields: {missing}",
+                message="Model version not registered",
+            )
+
+        columns = [c for c in self.MODEL_VERSION_COLUMNS if c in model_data]
+        params = tuple(
+            (
+                json.dumps(model_data[column])
+                if column in self.MODEL_VERSION_JSON and model_data[column] is not None
+                else model_data[column]
+            )
+            for column in columns
+        )
+        result = self.execute_update(
+            f"INSERT INTO ml_model_versions ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            params,
+        )
+        if result.success:
+            result.message = f"Registered model version {model_data['version']}"
+        return result
+
+    def get_model_versions(
+        self, version: Optional[str] = None, production_only: bool = False
+    ) -> List[Dict]:
+        """Registered model versions, newest first, with JSON fields decoded"""
+        query = "SELECT * FROM ml_model_versions WHERE 1=1"
+        params = []
+        if version is not None:
+            query += " AND version = ?"
+            params.append(version)
+        if production_only:
+            query += " AND is_production = ?"
+            params.append(True)
+        query += " ORDER BY training_date DESC, created_at DESC"
+
+        versions = self.execute_query(query, tuple(params))
+        for row in versions:
+            for column in self.MODEL_VERSION_JSON:
+                if isinstance(row.get(column), str):
+                    row[column] = json.loads(row[column])
+        return versions
+
+    def get_production_model(self) -> Optional[Dict]:
+        """The model version currently marked is_production, if any"""
+        versions = self.get_model_versions(production_only=True)
+        return versions[0] if versions else None
+
+    def promote_model_version(self, version: str) -> OperationResult:
+        """
+        Make `version` the single production model.
+
+        One UPDATE sets the flag on the new version and clears it on the old,
+        so readers see either model as production but never both or neither.
+        Unknown versions change nothing.
+        """
+        result = self.execute_update(
+            """
+            UPDATE ml_model_versions SET
+                is_production = (version = ?),
+                promoted_at = CASE WHEN version = ? THEN ? ELSE promoted_at END
+            WHERE (is_production = ? OR version = ?)
+              AND EXISTS (SELECT 1 FROM ml_model_versions WHERE version = ?)
+            """,
+            (version, version, datetime.now(), True, version, version),
+        )
+        if result.success and not result.data:
+            return OperationResult(
+                success=False,
+                error=f"Unknown model version {version}",
+                message=f"Model version {version} is not registered",
+            )
+        if result.success:
+            result.message = f"Promoted model version {version} to production"
+        return result
+
+    # ========== BULK WRITE OPERATIONS ==========
+
+    # "psychographic_x = ?, ..." for UPDATEs, in PSYCHOGRAPHIC_COLUMNS order
+    PSYCHOGRAPHIC_SET = ", ".join(f"{column} = ?" for column in PSYCHOGRAPHIC_COLUMNS)
+
+    # "psychographic_x = excluded.psychographic_x, ..." for upserts
+    PSYCHOGRAPHIC_EXCLUDED = ", ".join(
+        f"{column} = excluded.{column}" for column in PSYCHOGRAPHIC_COLUMNS
+    )
+
+    VENUE_UPSERT_SQL = f"""
+        INSERT INTO venues (
+            external_id, provider, name, name_norm, description, category, subcategory,
+            lat, lng, address, phone, website, avg_rating, psychographic_relevance,
+            {', '.join(PSYCHOGRAPHIC_COLUMNS)}, change_seq
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+            {next_change_seq('venues')})
+        ON CONFLICT(external_id, provider) DO UPDATE SET
+            name = excluded.name, name_norm = excluded.name_norm,
+            description = excluded.description,
+            category = excluded.category, subcategory = excluded.subcategory,
+            lat = excluded.lat, lng = excluded.lng, address = excluded.address,
+            phone = excluded.phone, website = excluded.website,
+            avg_rating = excluded.avg_rating,
+            psychographic_relevance = excluded.psychographic_relevance,
+            {PSYCHOGRAPHIC_EXCLUDED},
+            updated_at = CURRENT_TIMESTAMP,
+            change_seq = excluded.change_seq
+    """
+
+    EVENT_UPSERT_SQL = f"""
+        INSERT INTO events (
+            external_id, provider, name, description, category, subcategory,
+            start_time, end_time, start_ts, end_ts, venue_id, psychographic_relevance,
+            {', '.join(PSYCHOGRAPHIC_COLUMNS)}, change_seq
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+            {next_change_seq('events')})
+        ON CONFLICT(external_id, provider) DO UPDATE SET
+            name = excluded.name, description = excluded.description,
+            category = excluded.category, subcategory = excluded.subcategory,
+            start_time = excluded.start_time, end_time = excluded.end_time,
+            start_ts = excluded.start_ts, end_ts = excluded.end_ts,
+            venue_id = excluded.venue_id,
+            psychographic_relevance = excluded.psychographic_relevance,
+            {PSYCHOGRAPHIC_EXCLUDED},
+            updated_at = CURRENT_TIMESTAMP,
+            change_seq = excluded.change_seq
+    """
+
+    PREDICTION_INSERT_SQL = f"""
+        INSERT INTO ml_predictions (
+            prediction_value, confidence_score, model_version, features_used,
+            generated_at, venue_id, prediction_type, change_seq
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, {next_change_seq('ml_predictions')})
+    """
+
+    PREDICTION_UPDATE_SQL = f"""
+        UPDATE ml_predictions SET
+            prediction_value = ?, confidence_score = ?, model_version = ?,
+            features_used = ?, generated_at = ?,
+            change_seq = {next_change_seq('ml_predictions')}
+        WHERE venue_id = ? AND prediction_type = ?
+    """
+
+    def upsert_venues_bulk(
+        self, venues: Iterable[Dict], chunk_size: int = 500
+    ) -> OperationResult:
+        """Insert or update many venues in a single transaction"""
+
+        def prepare(cursor, chunk):
+            rows, failures = [], []
+            for index, venue_data in chunk:
+                missing = self._missing_fields(
+                    venue_data, ("external_id", "provider", "name", "category")
+                )
+                if missing:
+                    failures.append((index, f"Missing required fields: {missing}"))
+                    continue
+                rows.append(
+                    (
+                        index,
+                        (venue_data["external_id"], venue_data["provider"]),
+                        self._venue_params(venue_data),
+                    )
+                )
+            return rows, failures
+
+        return self._bulk_write(
+            "venues",
+            venues,
+            chunk_size,
+            prepare,
+            lambda cursor, keys: self._existing_external_keys(cursor, "venues", keys),
+            lambda cursor, params, existing: self._executemany(
+                cursor, self.VENUE_UPSERT_SQL, params
+            ),
+        )
+
+    def upsert_events_bulk(
+        self, events: Iterable[Dict], chunk_size: int = 500
+    ) -> OperationResult:
+        """Insert or update many events (and their venues) in a single transaction"""
+
+        def prepare(cursor, chunk):
+            venue_ids = self._resolve_event_venues(
+                cursor, [event_data for _, event_data in chunk]
+            )
+            rows, failures = [], []
+            for index, event_data in chunk:
+                missing = self._missing_fields(
+                    event_data, ("external_id", "provider", "name", "category")
+                )
+                name_norm = normalize_venue_name(event_data.get("venue_name"))
+                venue_id = venue_ids.get(name_norm) if name_norm else None
+                if missing:
+                    failures.append((index, f"Missing required fields: {missing}"))
+                elif not venue_id:
+                    failures.append((index, "Could not find or create venue for event"))
+                else:
+                    rows.append(
+                        (
+                            index,
+                            (event_data["external_id"], event_data["provider"]),
+                            self._event_params(event_data, venue_id),
+                        )
+                    )
+            return rows, failures
+
+        return self._bulk_write(
+            "events",
+            events,
+            chunk_size,
+            prepare,
+            lambda cursor, keys: self._existing_external_keys(cursor, "events", keys),
+            lambda cursor, params, existing: self._executemany(
+                cursor, self.EVENT_UPSERT_SQL, params
+            ),
+        )
+
+    def upsert_predictions_bulk(
+        self, predictions: Iterable[Dict], chunk_size: int = 500
+    ) -> OperationResult:
+        """Insert or update many ML predictions in a single transaction"""
+        generated_at = datetime.now()
+
+        def prepare(cursor, chunk):
+            rows, failures = [], []
+            for index, prediction_data in chunk:
+                missing = self._missing_fields(
+                    prediction_data,
+                    (
+                        "venue_id",
+                        "prediction_type",
+                        "prediction_value",
+                        "model_version",
+                    ),
+                )
+                if missing:
+                    failures.append((index, f"Missing required fields: {missing}"))
+                    continue
+                key = (prediction_data["venue_id"], prediction_data["prediction_type"])
+                rows.append(
+                    (index, key, self._prediction_params(prediction_data, generated_at))
+                )
+            return rows, failures
+
+        def existing_keys(cursor, keys):
+            venue_ids = list({venue_id for venue_id, _ in keys})
+            placeholders = ",".join(["?" for _ in venue_ids])
+            cursor.execute(
+                f"SELECT venue_id, prediction_type FROM ml_predictions "
+                f"WHERE venue_id IN ({placeholders})",
+                tuple(venue_ids),
+            )
+            return {tuple(row) for row in cursor.fetchall()}
+
+        def write(cursor, params, existing):
+            # ml_predictions is unique on (venue_id, prediction_type,
+            # prediction_for_datetime) and the datetime is usually NULL, so
+            # ON CONFLICT never fires; split into INSERTs then keyed UPDATEs.
+            inserts, updates, seen = [], [], set(existing)
+            for row in params:
+                key = (row[5], row[6])
+                (updates if key in seen else inserts).append(row)
+                seen.add(key)
+            if inserts:
+                self._executemany(cursor, self.PREDICTION_INSERT_SQL, inserts)
+            if updates:
+                self._executemany(cursor, self.PREDICTION_UPDATE_SQL, updates)
+
+        return self._bulk_write(
+            "predictions", predictions, chunk_size, prepare, existing_keys, write
+        )
+
+    def _bulk_write(
+        self,
+        label: str,
+        records: Iterable[Dict],
+        chunk_size: int,
+        prepare: Callable,
+        existing_keys: Callable,
+        write: Callable,
+    ) -> OperationResult:
+        """
+        Shared driver for the bulk upsert APIs.
+
+        Each chunk is prepared into (index, key, params) rows, classified as
+        insert/update against the keys already stored, and written with one
+        executemany. If a chunk fails it is rolled back to a savepoint and
+        replayed row by row so only the offending rows are marked failed.
+        """
+        result = BulkWriteResult()
+        chunk_size = max(int(chunk_size), 1)
+
+        try:
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+
+                for chunk in self._chunked(enumerate(records), chunk_size):
+                    rows, failures = prepare(cursor, chunk)
+                    for index, error in failures:
+                        result.record(index, "failed", error)
+                    if not rows:
+                        continue
+
+                    existing = existing_keys(cursor, [key for _, key, _ in rows])
+
+                    def write_rows(batch):
+                        write(cursor, [params for _, _, params in batch], existing)
+
+                    cursor.execute("SAVEPOINT bulk_chunk")
+                    try:
+                        write_rows(rows)
+                        cursor.execute("RELEASE SAVEPOINT bulk_chunk")
+                        written = rows
+                    except (sqlite3.Error, psycopg2.Error) as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+                        cursor.execute("RELEASE SAVEPOINT bulk_chunk")
+                        self.logger.warning(
+                            f"Bulk {label} chunk failed ({e}); retrying row by row"
+                        )
+                        written = []
+                        for row in rows:
+                            cursor.execute("SAVEPOINT bulk_row")
+                            try:
+                                write_rows([row])
+                                cursor.execute("RELEASE SAVEPOINT bulk_row")
+                                written.append(row)
+                            except (sqlite3.Error, psycopg2.Error) as row_error:
+                                cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                                cursor.execute("RELEASE SAVEPOINT bulk_row")
+                                result.record(row[0], "failed", str(row_error))
+
+                    for index, key, _ in written:
+                        result.record(
+                            index, "updated" if key in existing else "inserted"
+                        )
+                        existing.add(key)
+
+                conn.commit()
+                self._data_version += 1
+
+            return OperationResult(
+                success=result.failed == 0 or (result.inserted + result.updated) > 0,
+                data=result,
+                message=(
+                    f"Bulk upserted {label}: {result.inserted} inserted, "
+                    f"{result.updated} updated, {result.failed} failed"
+                ),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Bulk {label} upsert failed: {e}")
+            return OperationResult(
+                success=False,
+                data=result,
+                error=str(e),
+                message=f"Failed to bulk upsert {label}: {e}",
+            )
+
+    def _begin(self, conn, cursor):
+        """Open an explicit transaction so savepoints nest inside it"""
+        if self._db_type == "sqlite" and not conn.in_transaction:
+            cursor.execute("BEGIN")
+
+    def _executemany(self, cursor, query: str, params: List[tuple]):
+        """executemany, using batched round-trips of a prepared plan on PostgreSQL"""
+        if self._db_type == "postgresql":
+            cursor.executemany(query, params, prepare=True)
+        else:
+            cursor.executemany(query, params)
+
+    @staticmethod
+    def _chunked(iterable: Iterable, size: int):
+        """Yield lists of up to `size` items"""
+        chunk = []
+        for item in iterable:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _missing_fields(record: Dict, fields: Tuple[str, ...]) -> List[str]:
+        return [field_name for field_name in fields if record.get(field_name) is None]
+
+    def _existing_external_keys(self, cursor, table: str, keys: List[Tuple]) -> set:
+        """Return the (external_id, provider) keys of `keys` already in `table`"""
+        external_ids = list({external_id for external_id, _ in keys})
+        placeholders = ",".join(["?" for _ in external_ids])
+        cursor.execute(
+            f"SELECT external_id, provider FROM {table} "
+            f"WHERE external_id IN ({placeholders})",
+            tuple(external_ids),
+        )
+        return {tuple(row) for row in cursor.fetchall()} & set(keys)
+
+    def _resolve_event_venues(self, cursor, events: List[Dict]) -> Dict[str, str]:
+        """Map normalized venue names to venue ids, creating missing venues"""
+        names = {}
+        for event_data in events:
+            name_norm = normalize_venue_name(event_data.get("venue_name"))
+            if name_norm and name_norm not in names:
+                names[name_norm] = event_data
+        if not names:
+            return {}
+
+        def lookup(wanted):
+            placeholders = ",".join(["?" for _ in wanted])
+            cursor.execute(
+                f"SELECT name_norm, venue_id FROM venues "
+                f"WHERE name_norm IN ({placeholders})",
+                tuple(wanted),
+            )
+            found = {}
+            for name_norm, venue_id in cursor.fetchall():
+                found.setdefault(name_norm, venue_id)
+            return found
+
+        known = self._venue_name_index()
+        venue_ids = {name: known[name] for name in names if name in known}
+        unknown = [name for name in names if name not in venue_ids]
+        if unknown:
+            venue_ids.update(lookup(unknown))
+        missing = [name for name in names if name not in venue_ids]
+        if missing:
+            self._executemany(
+                cursor,
+                self.VENUE_UPSERT_SQL,
+                [
+                    self._venue_params(self._event_venue_record(names[name]))
+                    for name in missing
+                ],
+            )
+            venue_ids.update(lookup(missing))
+        # Rows created here are still uncommitted, so only remember known ones
+        for name in names:
+            if name not in missing and name in venue_ids:
+                known.setdefault(name, venue_ids[name])
+        return venue_ids
+
+    @staticmethod
+    def _event_venue_record(event_data: Dict) -> Dict:
+        """Venue record created for an event whose venue is not yet known"""
+        venue_name = event_data["venue_name"]
+        provider = event_data.get("provider", "unknown")
+        return {
+            "external_id": f"{provider}_{venue_name.lower().replace(' ', '_')}",
+            "provider": provider,
+            "name": venue_name,
+            "category": "event_venue",
+            "lat": event_data.get("lat"),
+            "lng": event_data.get("lng"),
+            "address": event_data.get("address"),
+        }
+
+    @staticmethod
+    def _venue_params(venue_data: Dict) -> tuple:
+        return (
+            venue_data.get("external_id"),
+            venue_data.get("provider"),
+            venue_data.get("name"),
+            normalize_venue_name(venue_data.get("name")),
+            venue_data.get("description"),
+            venue_data.get("category"),
+            venue_data.get("subcategory"),
+            venue_data.get("lat"),
+            venue_data.get("lng"),
+            venue_data.get("address"),
+            venue_data.get("phone"),
+            venue_data.get("website"),
+            venue_data.get("avg_rating"),
+            (
+                json.dumps(venue_data.get("psychographic_relevance"))
+                if venue_data.get("psychographic_relevance")
+                else None
+            ),
+            *psychographic_scores(venue_data.get("psychographic_relevance")),
+        )
+
+    @classmethod
+    def _event_params(cls, event_data: Dict, venue_id: str) -> tuple:
+        return (
+            event_data.get("external_id"),
+            event_data.get("provider"),
+            event_data.get("name"),
+            event_data.get("description"),
+            event_data.get("category"),
+            event_data.get("subcategory"),
+            event_data.get("start_time"),
+            event_data.get("end_time"),
+            *cls._event_times(event_data),
+            venue_id,
+            (
+                json.dumps(event_data.get("psychographic_relevance"))
+                if event_data.get("psychographic_relevance")
+                else None
+            ),
+            *psychographic_scores(event_data.get("psychographic_relevance")),
+        )
+
+    @staticmethod
+    def _event_times(event_data: Dict) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Epoch (start_ts, end_ts) for an event.
+
+        end_ts falls back to start + duration_minutes, then to start_ts, so
+        every timed event has a non-NULL interval for overlap queries.
+        """
+        tz = event_data.get("timezone")
+        start_ts = to_epoch_seconds(event_data.get("start_time"), tz)
+        if start_ts is None:
+            return None, None
+        end_ts = to_epoch_seconds(event_data.get("end_time"), tz)
+        if end_ts is None and event_data.get("duration_minutes"):
+            end_ts = start_ts + int(event_data["duration_minutes"]) * 60
+        return start_ts, max(end_ts or start_ts, start_ts)
+
+    @staticmethod
+    def _prediction_params(prediction_data: Dict, generated_at: datetime) -> tuple:
+        return (
+            prediction_data.get("prediction_value"),
+            prediction_data.get("confidence_score"),
+            prediction_data.get("model_version"),
+            (
+                json.dumps(prediction_data.get("features_used"))
+                if prediction_data.get("features_used")
+                else None
+            ),
+            generated_at,
+            prediction_data.get("venue_id"),
+            prediction_data.get("prediction_type"),
+        )
+
+    # ========== BULK LOADS ==========
+
+    # table -> (columns, conflict key, column stamped on update, defaults)
+    LOAD_TABLES = {
+        "weather_data": (
+            (
+                "lat",
+                "lng",
+                "timestamp",
+                "forecast_timestamp",
+                "temperature_f",
+                "humidity_pct",
+                "precipitation_probability",
+                "conditions",
+                "is_forecast",
+                "provider",
+            ),
+            ("lat", "lng", "timestamp", "is_forecast"),
+            "collected_at",
+            {"is_forecast": False, "provider": "openweather"},
+        ),
+        "foot_traffic_data": (
+            (
+                "venue_id",
+                "timestamp",
+                "hour_of_day",
+                "day_of_week",
+                "visit_count",
+                "unique_visitors",
+                "dwell_time_minutes",
+                "provider",
+            ),
+            ("venue_id", "timestamp"),
+            "collected_at",
+            {"provider": "foot_traffic_api"},
+        ),
+        # Column order matches _event_params
+        "events": (
+            (
+                "external_id",
+                "provider",
+                "name",
+                "description",
+                "category",
+                "subcategory",
+                "start_time",
+                "end_time",
+                "start_ts",
+                "end_ts",
+                "venue_id",
+                "psychographic_relevance",
+                *PSYCHOGRAPHIC_COLUMNS,
+            ),
+            ("external_id", "provider"),
+            "updated_at",
+            {},
+        ),
+    }
+
+    COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+    def bulk_load(
+        self,
+        table: str,
+        records: Iterable[Dict],
+        chunk_size: int = 10000,
+        defer_indexes: bool = True,
+    ) -> OperationResult:
+        """
+        Load a large backfill into weather_data, foot_traffic_data or events.
+
+        PostgreSQL streams each chunk with COPY into a temporary staging table
+        and merges everything with one INSERT ... ON CONFLICT. SQLite writes all
+        chunks with executemany in one transaction, dropping the table's
+        non-unique indexes first and rebuilding them once at the end. The last
+        record wins when several share a conflict key. Events are matched to
+        venues like upsert_events_bulk; events without a venue are skipped.
+
+        data is a LoadResult with rows/sec.
+        """
+        if table not in self.LOAD_TABLES:
+            raise ValueError(
+                f"Unsupported load table '{table}'. "
+                f"Supported: {', '.join(sorted(self.LOAD_TABLES))}"
+            )
+
+        result = LoadResult(
+            table=table,
+            method="copy" if self._db_type == "postgresql" else "executemany",
+        )
+        started = time.perf_counter()
+        try:
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                chunks = self._load_chunks(cursor, table, records, chunk_size, result)
+                if self._db_type == "postgresql":
+                    self._copy_merge(cursor, table, chunks)
+                else:
+                    self._executemany_load(cursor, table, chunks, defer_indexes)
+                conn.commit()
+            self._data_version += 1
+            result.seconds = time.perf_counter() - started
+
+            message = (
+                f"Loaded {result.rows} {table} rows via {result.method} in "
+                f"{result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s)"
+            )
+            if result.skipped:
+                message += f", skipped {result.skipped}"
+            self.logger.info(message)
+            return OperationResult(success=True, data=result, message=message)
+
+        except Exception as e:
+            self.logger.error(f"Bulk load of {table} failed: {e}")
+            return OperationResult(
+                success=False,
+                data=result,
+                error=str(e),
+                message=f"Bulk load of {table} failed: {e}",
+            )
+
+    def _load_chunks(
+        self,
+        cursor,
+        table: str,
+        records: Iterable[Dict],
+        chunk_size: int,
+        result: LoadResult,
+    ) -> Iterator[List[tuple]]:
+        """Yield parameter tuples per chunk, counting loaded and skipped rows"""
+        for chunk in self._chunked(records, max(int(chunk_size), 1)):
+            if table == "events":
+                venue_ids = self._resolve_event_venues(cursor, chunk)
+                rows = []
+                for event_data in chunk:
+                    name_norm = normalize_venue_name(event_data.get("venue_name"))
+                    venue_id = venue_ids.get(name_norm) if name_norm else None
+                    if venue_id:
+                        rows.append(self._event_params(event_data, venue_id))
+                result.skipped += len(chunk) - len(rows)
+            else:
+                rows = [self._load_params(table, record) for record in chunk]
+            result.rows += len(rows)
+            yield rows
+
+    def _load_params(self, table: str, record: Dict) -> tuple:
+        columns, _, _, defaults = self.LOAD_TABLES[table]
+        return tuple(record.get(column, defaults.get(column)) for column in columns)
+
+    def _load_upsert_sql(self, table: str) -> str:
+        """INSERT ... ON CONFLICT DO UPDATE for one LOAD_TABLES row"""
+        columns, conflict, touched, _ = self.LOAD_TABLES[table]
+        updates = [f"{c} = excluded.{c}" for c in columns if c not in conflict]
+        updates.append(f"{touched} = CURRENT_TIMESTAMP")
+        targets, values = list(columns), ["?"] * len(columns)
+        if table in self.CHANGE_FEEDS:
+            targets.append("change_seq")
+            values.append(next_change_seq(table))
+            updates.append("change_seq = excluded.change_seq")
+        return (
+            f"INSERT INTO {table} ({', '.join(targets)}) "
+            f"VALUES ({', '.join(values)}) "
+            f"ON CONFLICT({', '.join(conflict)}) DO UPDATE SET {', '.join(updates)}"
+        )
+
+    def _executemany_load(
+        self, cursor, table: str, chunks: Iterator[List[tuple]], defer_indexes: bool
+    ):
+        """SQLite load: one transaction, secondary indexes rebuilt once at the end"""
+        indexes = []
+        if defer_indexes:
+            # Unique indexes stay: ON CONFLICT needs them
+            cursor.execute(
+                """
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL
+                AND sql NOT LIKE 'CREATE UNIQUE%'
+                """,
+                (table,),
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {name}")
+
+        query = self._load_upsert_sql(table)
+        for rows in chunks:
+            cursor.executemany(query, rows)
+
+        for _, sql in indexes:
+            cursor.execute(sql)
+
+    def _copy_merge(self, cursor, table: str, chunks: Iterator[List[tuple]]):
+        """PostgreSQL load: COPY into a staging table, then one set-based upsert"""
+        columns, conflict, touched, _ = self.LOAD_TABLES[table]
+        stage = f"load_{table}"
+        cursor.execute(
+            f"CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) "
+            f"ON COMMIT DROP"
+        )
+        cursor.execute(f"ALTER TABLE {stage} ADD COLUMN load_seq BIGINT")
+
+        copy_sql = f"COPY {stage} ({', '.join(columns)}, load_seq) FROM STDIN"
+        seq = 0
+        for rows in chunks:
+            if not rows:
+                continue
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write(self._copy_line(row + (seq,)))
+                seq += 1
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+
+        # DISTINCT ON keeps the last copy of each key; ON CONFLICT cannot
+        # touch the same target row twice in one statement
+        column_sql, key_sql = ", ".join(columns), ", ".join(conflict)
+        updates = [f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict]
+        updates.append(f"{touched} = CURRENT_TIMESTAMP")
+        target_sql = select_sql = column_sql
+        if table in self.CHANGE_FEEDS:
+            target_sql += ", change_seq"
+            select_sql += f", {next_change_seq(table)}"
+            updates.append("change_seq = EXCLUDED.change_seq")
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({target_sql})
+            SELECT DISTINCT ON ({key_sql}) {select_sql}
+            FROM {stage}
+            ORDER BY {key_sql}, load_seq DESC
+            ON CONFLICT ({key_sql}) DO UPDATE SET {', '.join(updates)}
+            """
+        )
+
+    @classmethod
+    def _copy_line(cls, values: tuple) -> str:
+        """Encode one row in COPY text format"""
+        fields = []
+        for value in values:
+            if value is None:
+                fields.append("\\N")
+                continue
+            if isinstance(value, bool):
+                value = "t" if value else "f"
+            elif isinstance(value, datetime):
+                value = value.isoformat(sep=" ")
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            fields.append(str(value).translate(cls.COPY_ESCAPES))
+        return "\t".join(fields) + "\n"
+
+    # ========== SPATIAL QUERIES ==========
+
+    # table -> (rtree, base table, extra joins, columns, lat expr, lng expr)
+    SPATIAL_TABLES = {
+        "venues": ("venues_rtree", "venues v", "", "v.*", "v.lat", "v.lng"),
+        "events": (
+            "events_rtree",
+            "events e",
+            "LEFT JOIN venues v ON e.venue_id = v.venue_id",
+            "e.*",
+            "COALESCE(v.lat, e.lat)",
+            "COALESCE(v.lng, e.lng)",
+        ),
+        "demographic_data": (
+            "demographic_data_rtree",
+            "demographic_data d",
+            "",
+            "d.*",
+            "d.lat",
+            "d.lng",
+        ),
+        "weather_data": (
+            "weather_data_rtree",
+            "weather_data w",
+            "",
+            "w.*",
+            "w.lat",
+            "w.lng",
+        ),
+    }
+
+    def nearby(
+        self,
+        table: str,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        k: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Find rows of a spatial table within radius_m of a point, nearest first.
+
+        Candidates come from a bounding-box probe of the table's R*Tree index
+        (plain lat/lng range scan on PostgreSQL), cut to the radius and, with
+        k, to the nearest few by a flat-earth distance in SQL. An exact
+        haversine refine follows. Each row gets a distance_m key; at most k
+        rows are returned.
+        """
+        dlat = radius_m / METERS_PER_DEGREE_LAT
+        dlng = radius_m / (
+            METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6)
+        )
+
+        # Over-fetch so the flat-earth ranking cannot push out a true k-nearest
+        limit = 2 * k + 10 if k is not None else None
+        rows = [
+            row
+            for row in self._spatial_candidates(
+                table, lat, lng, dlat, dlng, within=dlat, limit=limit
+            )
+            if row["distance_m"] <= radius_m
+        ]
+        return rows[:k] if k is not None else rows
+
+    def rebuild_spatial_index(self, table: Optional[str] = None) -> OperationResult:
+        """
+        Repopulate R*Tree indexes from their base tables (SQLite only).
+
+        Triggers keep the indexes in sync on insert/update/delete; run this after
+        creating the indexes on an existing database or after VACUUM, which may
+        renumber the rowids the indexes point at.
+        """
+        if self._db_type != "sqlite":
+            return OperationResult(
+                success=True, data=0, message="Spatial indexes are SQLite only"
+            )
+
+        tables = [table] if table else list(self.SPATIAL_TABLES)
+        try:
+            indexed = 0
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                for name in tables:
+                    rtree, base, joins, _, lat_sql, lng_sql = self.SPATIAL_TABLES[name]
+                    alias = base.split()[-1]
+                    cursor.execute(f"DELETE FROM {rtree}")
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {rtree} (id, min_lat, max_lat, min_lng, max_lng)
+                        SELECT {alias}.rowid, {lat_sql}, {lat_sql}, {lng_sql}, {lng_sql}
+                        FROM {base} {joins}
+                        WHERE {lat_sql} IS NOT NULL AND {lng_sql} IS NOT NULL
+                        """
+                    )
+                    indexed += cursor.rowcount
+                conn.commit()
+
+            self._known_tables.clear()
+            return OperationResult(
+                success=True,
+                data=indexed,
+                message=f"Indexed {indexed} points across {len(tables)} tables",
+            )
+
+        except Exception as e:
+            self.logger.error(f"Spatial index rebuild failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Spatial index rebuild failed: {e}",
+            )
+
+    def _spatial_candidates(
+        self,
+        table: str,
+        lat: float,
+        lng: float,
+        dlat: float,
+        dlng: float,
+        extra_sql: str = "",
+        extra_params: tuple = (),
+        within: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Rows inside the lat/lng box around a point, with distance_m, nearest first.
+
+        within (degrees of latitude) drops the box corners and limit keeps the
+        nearest rows, both by equirectangular distance evaluated in SQL.
+        """
+        if table not in self.SPATIAL_TABLES:
+            raise ValueError(
+                f"Unsupported spatial table '{table}', "
+                f"expected one of {sorted(self.SPATIAL_TABLES)}"
+            )
+
+        rtree, base, joins, columns, lat_sql, lng_sql = self.SPATIAL_TABLES[table]
+        alias = base.split()[-1]
+        box = (lat - dlat, lat + dlat, lng - dlng, lng + dlng)
+
+        select = f"SELECT {columns}, {lat_sql} AS nearby_lat, {lng_sql} AS nearby_lng"
+        if self._table_exists(rtree):
+            query = f"""
+                {select}
+                FROM {rtree} r
+                JOIN {base} ON {alias}.rowid = r.id
+                {joins}
+                WHERE r.max_lat >= ? AND r.min_lat <= ?
+                AND r.max_lng >= ? AND r.min_lng <= ?
+            """
+        else:
+            query = f"""
+                {select}
+                FROM {base} {joins}
+                WHERE {lat_sql} BETWEEN ? AND ?
+                AND {lng_sql} BETWEEN ? AND ?
+            """
+
+        params = box + tuple(extra_params)
+        if within is not None or limit is not None:
+            # Squared equirectangular distance in degrees of latitude
+            scale = math.cos(math.radians(lat)) ** 2
+            flat = (
+                f"(({lat_sql}) - ?) * (({lat_sql}) - ?) "
+                f"+ (({lng_sql}) - ?) * (({lng_sql}) - ?) * ?"
+            )
+            flat_params = (lat, lat, lng, lng, scale)
+            # Filter on real coordinates: R*Tree entries can be stale
+            extra_sql += f" AND {lat_sql} BETWEEN ? AND ? AND {lng_sql} BETWEEN ? AND ?"
+            params += box
+            if within is not None:
+                extra_sql += f" AND {flat} <= ?"
+                params += flat_params + (within * within * 1.01,)
+            if limit is not None:
+                extra_sql += f" ORDER BY {flat} LIMIT ?"
+                params += flat_params + (int(limit),)
+
+        rows = self.execute_query(query + extra_sql, params)
+        for row in rows:
+            # Index entries can outlive replaced rows; refine on real coordinates
+            row["lat"], row["lng"] = row.pop("nearby_lat"), row.pop("nearby_lng")
+            row["distance_m"] = haversine_m(lat, lng, row["lat"], row["lng"])
+
+        return sorted(
+            (
+                row
+                for row in rows
+                if box[0] <= row["lat"] <= box[1] and box[2] <= row["lng"] <= box[3]
+            ),
+            key=lambda row: row["distance_m"],
+        )
+
+    def _table_exists(self, name: str) -> bool:
+        """Whether a table exists in the SQLite catalog (cached per instance)"""
+        if self._db_type != "sqlite":
+            return False
+
+        if name not in self._known_tables:
+            self._known_tables[name] = bool(
+                self.execute_query(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (name,),
+                )
+            )
+        return self._known_tables[name]
+
+    # ========== FULL-TEXT SEARCH ==========
+
+    # kind -> (FTS5 table, base table, extra joins, columns, lat expr, lng expr)
+    SEARCH_TABLES = {
+        "venues": ("venues_fts", "venues v", "", VENUE_COLUMNS, "v.lat", "v.lng"),
+        "events": (
+            "events_fts",
+            "events e",
+            "LEFT JOIN venues v ON e.venue_id = v.venue_id",
+            EVENT_COLUMNS,
+            "COALESCE(v.lat, e.lat)",
+            "COALESCE(v.lng, e.lng)",
+        ),
+    }
+
+    # BM25 / ts_rank weights of the indexed (name, description) columns
+    SEARCH_WEIGHTS = (10.0, 1.0)
+
+    def search(
+        self,
+        text: str,
+        kind: str = "venues",
+        bounds: Optional[Dict] = None,
+        limit: int = 20,
+        match_all: bool = True,
+    ) -> List[Dict]:
+        """
+        Rank venues or events by how well their name and description match text.
+
+        Words match case- and accent-insensitively, and the last word also
+        matches as a prefix so partial input works as you type. match_all=False
+        returns rows matching any word, best first. bounds takes the same
+        min_lat/max_lat/min_lng/max_lng dict as the bounds filter. Each row
+        gets a score key, higher is better.
+        """
+        if kind not in self.SEARCH_TABLES:
+            raise ValueError(
+                f"Unsupported search kind '{kind}', "
+                f"expected one of {sorted(self.SEARCH_TABLES)}"
+            )
+
+        words = re.findall(r"\w+", (text or "").casefold())
+        if not words:
+            return []
+
+        fts, base, joins, columns, lat_sql, lng_sql = self.SEARCH_TABLES[kind]
+        alias = base.split()[-1]
+        where_sql, _, params = self._filter_compiler(
+            f"{kind} search", {"bounds": ((lat_sql, lng_sql), "bbox")}, []
+        ).compile({"bounds": bounds}, always_order=False)
+
+        if self._db_type == "postgresql":
+            # Weights run {D, C, B, A}, names are A and descriptions B
+            name_weight, description_weight = self.SEARCH_WEIGHTS
+            terms = [*words[:-1], f"{words[-1]}:*"]
+            query = f"""
+                SELECT {columns},
+                    ts_rank_cd('{{0, 0, {description_weight / name_weight}, 1}}',
+                        {alias}.search_tsv, q) AS score
+                FROM {base} {joins},
+                    to_tsquery('english', ?) q
+                WHERE {alias}.search_tsv @@ q {where_sql}
+                ORDER BY score DESC
+                LIMIT ?
+            """
+            match = (" & " if match_all else " | ").join(terms)
+        else:
+            terms = [*(f'"{w}"' for w in words[:-1]), f'"{words[-1]}"*']
+            weights = ", ".join(str(weight) for weight in self.SEARCH_WEIGHTS)
+            query = f"""
+                SELECT {columns}, -bm25({fts}, {weights}) AS score
+                FROM {fts} f
+                JOIN {base} ON {alias}.rowid = f.rowid
+                {joins}
+                WHERE {fts} MATCH ? {where_sql}
+                ORDER BY score DESC
+                LIMIT ?
+            """
+            match = (" AND " if match_all else " OR ").join(terms)
+
+        return self.execute_query(query, (match, *params, int(limit)))
+
+    def rebuild_search_index(self, kind: Optional[str] = None) -> OperationResult:
+        """
+        Repopulate the full-text indexes from their base tables.
+
+        On SQLite, triggers keep the FTS5 tables in sync when names or
+        descriptions change; run this after creating them on an existing
+        database or after VACUUM, which may renumber the rowids they point at.
+        On PostgreSQL this adds the generated search_tsv columns and their GIN
+        indexes if they are missing.
+        """
+        kinds = [kind] if kind else list(self.SEARCH_TABLES)
+        try:
+            indexed = 0
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                for name in kinds:
+                    fts = self.SEARCH_TABLES[name][0]
+                    if self._db_type == "postgresql":
+                        cursor.execute(
+                            f"""
+                            ALTER TABLE {name} ADD COLUMN IF NOT EXISTS search_tsv
+                            tsvector GENERATED ALWAYS AS (
+                                setweight(to_tsvector('english',
+                                    COALESCE(name, '')), 'A')
+                                || setweight(to_tsvector('english',
+                                    COALESCE(description, '')), 'B')
+                            ) STORED
+                            """
+                        )
+                        cursor.execute(
+                            f"CREATE INDEX IF NOT EXISTS idx_{name}_search "
+                            f"ON {name} USING GIN (search_tsv)"
+                        )
+                    else:
+                        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                    cursor.execute(f"SELECT COUNT(*) FROM {name}")
+                    indexed += cursor.fetchone()[0]
+                conn.commit()
+
+            return OperationResult(
+                success=True,
+                data=indexed,
+                message=f"Indexed {indexed} rows for search across {len(kinds)} tables",
+            )
+
+        except Exception as e:
+            self.logger.error(f"Search index rebuild failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Search index rebuild failed: {e}",
+            )
+
     # ========== ENRICHMENT DATA OPERATIONS ==========
 
     def get_demographic_data(
         self, lat: float, lng: float, radius_degrees: float = 0.01
     ) -> Optional[Dict]:
-        """Get demographic data for a location within radius"""
-        query = """
-            SELECT * FROM demographic_data
-            WHERE ABS(lat - ?) < ? AND ABS(lng - ?) < ?
-            ORDER BY 
-                (ABS(lat - ?) + ABS(lng - ?)) ASC
-            LIMIT 1
-        """
-        results = self.execute_query(
-            query, (lat, radius_degrees, lng, radius_degrees, lat, lng)
+        """Get the nearest demographic data for a location within radius"""
+        candidates = self._spatial_candidates(
+            "demographic_data", lat, lng, radius_degrees, radius_degrees
         )
-        return results[0] if results else None
+        return candidates[0] if candidates else None
 
     def upsert_demographic_data(self, demo_data: Dict) -> OperationResult:
         """Insert or update demographic data"""
         try:
             query = """
-                INSERT OR REPLACE INTO demographic_data (
+                INSERT INTO demographic_data (
                     lat, lng, census_tract, median_income, bachelor_degree_pct,
                     age_20_40_pct, professional_occupation_pct, data_source, year
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(lat, lng, census_tract) DO UPDATE SET
+                    median_income = excluded.median_income,
+                    bachelor_degree_pct = excluded.bachelor_degree_pct,
+                    age_20_40_pct = excluded.age_20_40_pct,
+                    professional_occupation_pct = excluded.professional_occupation_pct,
+                    data_source = excluded.data_source,
+                    year = excluded.year,
+                    collected_at = CURRENT_TIMESTAMP
             """
             params = (
                 demo_data.get("lat"),
@@ -549,38 +3570,23 @@ class Database:
 
     def get_foot_traffic(self, venue_id: str, hours: int = 24) -> List[Dict]:
         """Get recent foot traffic data for venue"""
-        query = """
-            SELECT * FROM foot_traffic_data
+        query = f"""
+            SELECT * FROM {self._partition_source("foot_traffic_data")}
             WHERE venue_id = ?
-            AND timestamp >= datetime('now', '-{} hours')
+            AND timestamp >= datetime('now', ?)
             ORDER BY timestamp DESC
-        """.format(
-            hours
-        )
-        return self.execute_query(query, (venue_id,))
+        """
+        return self.execute_query(query, (venue_id, f"-{int(hours)} hours"))
 
     def upsert_foot_traffic(self, traffic_data: Dict) -> OperationResult:
         """Insert or update foot traffic data"""
         try:
-            query = """
-                INSERT OR REPLACE INTO foot_traffic_data (
-                    venue_id, timestamp, hour_of_day, day_of_week,
-                    visit_count, unique_visitors, dwell_time_minutes, provider
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                traffic_data.get("venue_id"),
-                traffic_data.get("timestamp"),
-                traffic_data.get("hour_of_day"),
-                traffic_data.get("day_of_week"),
-                traffic_data.get("visit_count"),
-                traffic_data.get("unique_visitors"),
-                traffic_data.get("dwell_time_minutes"),
-                traffic_data.get("provider", "foot_traffic_api"),
+            return self.execute_update(
+                self._load_upsert_sql("foot_traffic_data"),
+                self._load_params("foot_traffic_data", traffic_data),
+                prepared=True,
             )
 
-            return self.execute_update(query, params)
-
         except Exception as e:
             return OperationResult(
                 success=False,
@@ -592,42 +3598,29 @@ class Database:
         self, lat: float, lng: float, hours: int = 24
     ) -> List[Dict]:
         """Get weather forecast for location"""
-        query = """
-            SELECT * FROM weather_data
-            WHERE ABS(lat - ?) < 0.1 AND ABS(lng - ?) < 0.1
-            AND is_forecast = 1
-            AND forecast_timestamp BETWEEN datetime('now') AND datetime('now', '+{} hours')
-            ORDER BY forecast_timestamp ASC
-        """.format(
-            hours
+        forecasts = self._spatial_candidates(
+            "weather_data",
+            lat,
+            lng,
+            0.1,
+            0.1,
+            extra_sql="""
+                AND w.is_forecast = 1
+                AND w.forecast_timestamp BETWEEN datetime('now') AND datetime('now', ?)
+            """,
+            extra_params=(f"+{int(hours)} hours",),
         )
-        return self.execute_query(query, (lat, lng))
+        return sorted(forecasts, key=lambda row: row["forecast_timestamp"])
 
     def upsert_weather_data(self, weather_data: Dict) -> OperationResult:
         """Insert or update weather data"""
         try:
-            query = """
-                INSERT OR REPLACE INTO weather_data (
-                    lat, lng, timestamp, forecast_timestamp, temperature_f,
-                    humidity_pct, precipitation_probability, conditions,
-                    is_forecast, provider
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                weather_data.get("lat"),
-                weather_data.get("lng"),
-                weather_data.get("timestamp"),
-                weather_data.get("forecast_timestamp"),
-                weather_data.get("temperature_f"),
-                weather_data.get("humidity_pct"),
-                weather_data.get("precipitation_probability"),
-                weather_data.get("conditions"),
-                weather_data.get("is_forecast", False),
-                weather_data.get("provider", "openweather"),
+            return self.execute_update(
+                self._load_upsert_sql("weather_data"),
+                self._load_params("weather_data", weather_data),
+                prepared=True,
             )
 
-            return self.execute_update(query, params)
-
         except Exception as e:
             return OperationResult(
                 success=False,
@@ -687,6 +3680,63 @@ class Database:
                 message=f"Failed to upsert social sentiment: {e}",
             )
 
+    # ========== WRITE-BEHIND BUFFER ==========
+
+    def flush_writes(self) -> int:
+        """Flush buffered cache hits, collection updates and quality logs"""
+        return self._write_buffer.flush()
+
+    def get_write_buffer_stats(self) -> Dict:
+        """Get write-behind queue counters"""
+        return self._write_buffer.stats()
+
+    def _apply_buffered_writes(self, batch: PendingWrites):
+        """Write one coalesced batch in a single transaction"""
+        with self.get_connection() as conn:
+            cursor = self._cursor(conn)
+            self._begin(conn, cursor)
+            if batch.api_cache_hits:
+                self._executemany(
+                    cursor,
+                    """
+                    UPDATE api_cache SET
+                        last_accessed = ?,
+                        access_count = access_count + ?
+                    WHERE cache_key = ?
+                    """,
+                    [
+                        (accessed_at, hits, key)
+                        for key, (hits, accessed_at) in batch.api_cache_hits.items()
+                    ],
+                )
+            if batch.geocode_hits:
+                self._executemany(
+                    cursor,
+                    "UPDATE geocoding_cache SET access_count = access_count + ? "
+                    "WHERE address = ?",
+                    [(hits, address) for address, hits in batch.geocode_hits.items()],
+                )
+            for query, params in batch.collection_updates:
+                cursor.execute(query, params)
+            if batch.quality_issues:
+                self._executemany(
+                    cursor,
+                    """
+                    INSERT INTO data_quality_log
+                    (table_name, record_id, validation_type, validation_result,
+                     field_name, error_message, severity, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    batch.quality_issues,
+                )
+            conn.commit()
+        self._data_version += 1
+
+    @staticmethod
+    def _utc_now_text() -> str:
+        """Current UTC time in SQLite's datetime('now') format"""
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
     # ========== CACHING OPERATIONS ==========
 
     def get_api_cache(self, cache_key: str) -> Optional[Dict]:
@@ -697,14 +3747,10 @@ class Database:
             AND expires_at > datetime('now')
             AND is_valid = 1
         """
-        results = self.execute_query(query, (cache_key,))
+        results = self.execute_query(query, (cache_key,), prepared=True)
 
         if results:
-            # Update last_accessed
-            self.execute_update(
-                "UPDATE api_cache SET last_accessed = datetime('now') WHERE cache_key = ?",
-                (cache_key,),
-            )
+            self._write_buffer.record_api_cache_hit(cache_key, self._utc_now_text())
             return results[0]
         return None
 
@@ -720,21 +3766,66 @@ class Database:
             ttl_hours
         )
 
-        return self.execute_update(
+        result = self.execute_update(
             query, (cache_key, api_source, response_data, len(response_data))
         )
+        self._maybe_sweep_cache()
+        return result
+
+    def sweep_expired_cache(self, batch_size: int = 1000) -> OperationResult:
+        """Delete expired API cache entries in bounded batches"""
+        removed = 0
+        try:
+            while True:
+                batch = self.execute_update(
+                    """
+                    DELETE FROM api_cache WHERE cache_key IN (
+                        SELECT cache_key FROM api_cache
+                        WHERE expires_at < datetime('now')
+                        LIMIT ?
+                    )
+                    """,
+                    (batch_size,),
+                )
+                if not batch.success:
+                    raise RuntimeError(batch.error)
+                removed += batch.data
+                if batch.data < batch_size:
+                    break
+
+            return OperationResult(
+                success=True,
+                data=removed,
+                message=f"Removed {removed} expired cache entries",
+            )
+
+        except Exception as e:
+            return OperationResult(
+                success=False,
+                data=removed,
+                error=str(e),
+                message=f"Failed to sweep expired cache: {e}",
+            )
+
+    def _maybe_sweep_cache(self):
+        """Run the expiry sweep at most once per CACHE_SWEEP_SECONDS"""
+        if self._cache_sweep_interval <= 0:
+            return
+        now = time.monotonic()
+        if now < self._next_cache_sweep:
+            return
+        self._next_cache_sweep = now + self._cache_sweep_interval
+        result = self.sweep_expired_cache()
+        if not result.success:
+            self.logger.warning(result.message)
 
     def geocode_cached(self, address: str) -> Optional[Tuple[float, float]]:
         """Get geocoded coordinates from cache"""
         query = "SELECT lat, lng FROM geocoding_cache WHERE address = ?"
-        results = self.execute_query(query, (address,))
+        results = self.execute_query(query, (address,), prepared=True)
 
         if results:
-            # Increment access count
-            self.execute_update(
-                "UPDATE geocoding_cache SET access_count = access_count + 1 WHERE address = ?",
-                (address,),
-            )
+            self._write_buffer.record_geocode_hit(address)
             return (results[0]["lat"], results[0]["lng"])
         return None
 
@@ -763,12 +3854,13 @@ class Database:
         duration_seconds: float = 0,
         error_message: Optional[str] = None,
     ) -> OperationResult:
-        """Update collection status after a run"""
+        """Queue a collection status update after a run"""
+        now = self._utc_now_text()
         if success:
             query = """
                 UPDATE collection_status SET
-                    last_successful_collection = datetime('now'),
-                    last_attempted_collection = datetime('now'),
+                    last_successful_collection = ?,
+                    last_attempted_collection = ?,
                     total_runs = total_runs + 1,
                     successful_runs = successful_runs + 1,
                     consecutive_errors = 0,
@@ -784,34 +3876,43 @@ class Database:
                         CASE WHEN collection_health_score < 1.0
                         THEN MIN(collection_health_score + 0.1, 1.0)
                         ELSE 1.0
-                        END
+                        END,
+                    updated_at = ?
                 WHERE source_name = ?
             """
             params = (
+                now,
+                now,
                 records_collected,
                 records_collected,
                 duration_seconds,
                 duration_seconds,
                 duration_seconds,
+                now,
                 source_name,
             )
         else:
             query = """
                 UPDATE collection_status SET
-                    last_attempted_collection = datetime('now'),
+                    last_attempted_collection = ?,
                     last_error_message = ?,
                     total_runs = total_runs + 1,
                     error_count = error_count + 1,
                     consecutive_errors = consecutive_errors + 1,
-                    collection_health_score = MAX(collection_health_score - 0.2, 0.0)
+                    collection_health_score = MAX(collection_health_score - 0.2, 0.0),
+                    updated_at = ?
                 WHERE source_name = ?
             """
-            params = (error_message, source_name)
+            params = (now, error_message, now, source_name)
 
-        return self.execute_update(query, params)
+        self._write_buffer.add_collection_update(query, params)
+        return OperationResult(
+            success=True, message=f"Queued collection status for {source_name}"
+        )
 
     def get_collection_health(self) -> List[Dict]:
         """Get collection health status for all sources"""
+        self.flush_writes()
         return self.execute_query("SELECT * FROM vw_collection_health")
 
     # ========== DATA QUALITY OPERATIONS ==========
@@ -826,15 +3927,22 @@ class Database:
         error_message: Optional[str] = None,
         severity: str = "medium",
     ) -> OperationResult:
-        """Log data quality issue"""
-        query = """
-            INSERT INTO data_quality_log 
-            (table_name, record_id, validation_type, validation_result,
-             field_name, error_message, severity)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        return self.execute_update(
-            query,
+        """Queue a data quality issue for the quality log"""
+        # Checked up front so one bad row cannot fail a whole buffered flush
+        if validation_result not in QUALITY_RESULTS:
+            return OperationResult(
+                success=False,
+                error=f"Invalid validation_result: {validation_result}",
+                message="Data quality issue not logged",
+            )
+        if severity not in QUALITY_SEVERITIES:
+            return OperationResult(
+                success=False,
+                error=f"Invalid severity: {severity}",
+                message="Data quality issue not logged",
+            )
+
+        self._write_buffer.add_quality_issue(
             (
                 table_name,
                 record_id,
@@ -843,11 +3951,16 @@ class Database:
                 field_name,
                 error_message,
                 severity,
-            ),
+                self._utc_now_text(),
+            )
+        )
+        return OperationResult(
+            success=True, message=f"Queued data quality issue for {table_name}"
         )
 
     def get_data_quality_summary(self) -> List[Dict]:
         """Get data quality summary from view"""
+        self.flush_writes()
         return self.execute_query("SELECT * FROM vw_data_quality_summary")
 
     # ========== SYSTEM CONFIGURATION ==========
@@ -857,7 +3970,7 @@ class Database:
         query = (
             "SELECT config_value, config_type FROM system_config WHERE config_key = ?"
         )
-        results = self.execute_query(query, (config_key,))
+        results = self.execute_query(query, (config_key,), prepared=True)
 
         if not results:
             return default_value
@@ -901,102 +4014,277 @@ class Database:
 
     # ========== UTILITY OPERATIONS ==========
 
-    def get_data_summary(self) -> Dict:
-        """Get summary statistics for the application"""
+    # Tables whose row counts are kept in table_stats by triggers
+    STATS_TABLES = (
+        "venues",
+        "events",
+        "ml_predictions",
+        "demographic_data",
+        "weather_data",
+        "foot_traffic_data",
+    )
+
+    def get_data_summary(self, max_age_seconds: Optional[float] = None) -> Dict:
+        """
+        Get summary statistics for the application.
+
+        Served from an in-process cache until max_age_seconds (DATA_SUMMARY_TTL,
+        default 30) elapse or this process writes to the database. A refresh is
+        one query: totals come from table_stats and only the 7-day counts touch
+        the venue/event tables, through their created_at indexes.
+        """
+        if max_age_seconds is None:
+            max_age_seconds = float(os.getenv("DATA_SUMMARY_TTL", 30))
+
+        cached = self._summary_cache
+        if (
+            cached
+            and cached[0] == self._data_version
+            and time.monotonic() - cached[1] < max_age_seconds
+        ):
+            return dict(cached[2])
+
         try:
-            venue_count = self.execute_query("SELECT COUNT(*) as count FROM venues")[0][
-                "count"
-            ]
-            event_count = self.execute_query("SELECT COUNT(*) as count FROM events")[0][
-                "count"
-            ]
-            prediction_count = self.execute_query(
-                "SELECT COUNT(*) as count FROM ml_predictions"
-            )[0]["count"]
-
-            # Get venues with location data
-            located_venues = self.execute_query(
-                "SELECT COUNT(*) as count FROM venues WHERE lat IS NOT NULL AND lng IS NOT NULL"
-            )[0]["count"]
-
-            # Get recent activity
-            recent_venues = self.execute_query(
-                "SELECT COUNT(*) as count FROM venues WHERE created_at >= datetime('now', '-7 days')"
-            )[0]["count"]
-
-            recent_events = self.execute_query(
-                "SELECT COUNT(*) as count FROM events WHERE created_at >= datetime('now', '-7 days')"
-            )[0]["count"]
-
-            # Get enrichment data counts
-            demographic_count = self.execute_query(
-                "SELECT COUNT(*) as count FROM demographic_data"
-            )[0]["count"]
-            weather_count = self.execute_query(
-                "SELECT COUNT(*) as count FROM weather_data"
-            )[0]["count"]
-            traffic_count = self.execute_query(
-                "SELECT COUNT(*) as count FROM foot_traffic_data"
-            )[0]["count"]
-
-            return {
-                "total_venues": venue_count,
-                "total_events": event_count,
-                "total_predictions": prediction_count,
-                "located_venues": located_venues,
-                "recent_venues": recent_venues,
-                "recent_events": recent_events,
-                "demographic_records": demographic_count,
-                "weather_records": weather_count,
-                "traffic_records": traffic_count,
-                "location_completeness": located_venues / max(venue_count, 1),
+            data_version = self._data_version
+            if self._table_exists("table_stats"):
+                totals = """
+                    SELECT
+                        SUM(CASE WHEN table_name = 'venues' THEN row_count END) AS venues,
+                        SUM(CASE WHEN table_name = 'venues' THEN located_count END)
+                            AS located_venues,
+                        SUM(CASE WHEN table_name = 'events' THEN row_count END) AS events,
+                        SUM(CASE WHEN table_name = 'ml_predictions' THEN row_count END)
+                            AS predictions,
+                        SUM(CASE WHEN table_name = 'demographic_data' THEN row_count END)
+                            AS demographics,
+                        SUM(CASE WHEN table_name = 'weather_data' THEN row_count END)
+                            AS weather,
+                        SUM(CASE WHEN table_name = 'foot_traffic_data' THEN row_count END)
+                            AS traffic
+                    FROM table_stats
+                """
+            else:
+                totals = """
+                    SELECT
+                        (SELECT COUNT(*) FROM venues) AS venues,
+                        (SELECT COUNT(*) FROM venues
+                         WHERE lat IS NOT NULL AND lng IS NOT NULL) AS located_venues,
+                        (SELECT COUNT(*) FROM events) AS events,
+                        (SELECT COUNT(*) FROM ml_predictions) AS predictions,
+                        (SELECT COUNT(*) FROM demographic_data) AS demographics,
+                        (SELECT COUNT(*) FROM weather_data) AS weather,
+                        (SELECT COUNT(*) FROM foot_traffic_data) AS traffic
+                """
+
+            rows = self.execute_query(
+                f"""
+                SELECT t.*,
+                    (SELECT COUNT(*) FROM venues
+                     WHERE created_at >= datetime('now', '-7 days')) AS recent_venues,
+                    (SELECT COUNT(*) FROM events
+                     WHERE created_at >= datetime('now', '-7 days')) AS recent_events
+                FROM ({totals}) t
+                """
+            )
+            if not rows:
+                raise RuntimeError("Data summary query returned no rows")
+
+            counts = {key: value or 0 for key, value in rows[0].items()}
+            summary = {
+                "total_venues": counts["venues"],
+                "total_events": counts["events"],
+                "total_predictions": counts["predictions"],
+                "located_venues": counts["located_venues"],
+                "recent_venues": counts["recent_venues"],
+                "recent_events": counts["recent_events"],
+                "demographic_records": counts["demographics"],
+                "weather_records": counts["weather"],
+                "traffic_records": counts["traffic"],
+                "location_completeness": counts["located_venues"]
+                / max(counts["venues"], 1),
                 "timestamp": datetime.now().isoformat(),
             }
 
+            self._summary_cache = (data_version, time.monotonic(), summary)
+            return dict(summary)
+
         except Exception as e:
             self.logger.error(f"Failed to get data summary: {e}")
             return {"error": str(e), "timestamp": datetime.now().isoformat()}
 
-    def cleanup_old_data(self, days: int = 30) -> OperationResult:
-        """Clean up old data to keep database size manageable"""
+    def refresh_table_stats(self) -> OperationResult:
+        """Recount table_stats from the base tables (triggers keep it current)"""
         try:
-            # Remove old predictions
-            old_predictions = self.execute_update(
-                "DELETE FROM ml_predictions WHERE generated_at < datetime('now', '-{} days')".format(
-                    days
-                )
-            )
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                for table in self.STATS_TABLES:
+                    located = (
+                        "SUM(CASE WHEN lat IS NOT NULL AND lng IS NOT NULL "
+                        "THEN 1 ELSE 0 END)"
+                        if table == "venues"
+                        else "0"
+                    )
+                    cursor.execute(
+                        f"""
+                        INSERT INTO table_stats (table_name, row_count, located_count)
+                        SELECT ?, COUNT(*), COALESCE({located}, 0)
+                        FROM {self._partition_source(table)}
+                        WHERE true
+                        ON CONFLICT(table_name) DO UPDATE SET
+                            row_count = excluded.row_count,
+                            located_count = excluded.located_count,
+                            version = table_stats.version + 1
+                        """,
+                        (table,),
+                    )
+                conn.commit()
 
-            # Remove old weather data
-            old_weather = self.execute_update(
-                "DELETE FROM weather_data WHERE collected_at < datetime('now', '-{} days')".format(
-                    days
-                )
+            self._data_version += 1
+            self._known_tables.pop("table_stats", None)
+            return OperationResult(
+                success=True,
+                data=len(self.STATS_TABLES),
+                message=f"Refreshed stats for {len(self.STATS_TABLES)} tables",
             )
 
-            # Remove old API cache
-            old_cache = self.execute_update(
-                "DELETE FROM api_cache WHERE expires_at < datetime('now')"
+        except Exception as e:
+            self.logger.error(f"Table stats refresh failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Table stats refresh failed: {e}",
             )
 
-            # Remove events that are very old and have no venue association
-            old_events = self.execute_update(
-                """DELETE FROM events 
-                   WHERE start_time < datetime('now', '-{} days') 
-                   AND venue_id NOT IN (SELECT venue_id FROM venues WHERE lat IS NOT NULL)""".format(
-                    days * 2
+    # table -> (primary key, predicate) for cleanup_old_data, deleted in order.
+    # Weather and foot traffic are dropped as whole monthly partitions instead.
+    CLEANUP_TARGETS = {
+        "ml_predictions": ("prediction_id", "generated_at < datetime('now', ?)"),
+        "api_cache": ("cache_key", "expires_at < datetime('now')"),
+        # Very old events whose venue was never located
+        "events": (
+            "event_id",
+            """start_ts < ? AND venue_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM venues v
+                WHERE v.venue_id = events.venue_id AND v.lat IS NOT NULL
+            )""",
+        ),
+    }
+
+    CLEANUP_PROGRESS_KEY = "cleanup_progress"
+
+    def cleanup_old_data(
+        self,
+        days: int = 30,
+        chunk_size: int = 1000,
+        latency_budget: float = 0.1,
+        pause_seconds: float = 0.05,
+        progress: Optional[Callable[[Dict], None]] = None,
+    ) -> OperationResult:
+        """
+        Clean up old data as a resumable job of short transactions.
+
+        Rows are deleted in primary-key order, at most chunk_size per
+        transaction. A chunk slower than latency_budget seconds halves the
+        next one. The job sleeps pause_seconds between chunks so other writers
+        get the database. Its position is saved in system_config after each
+        chunk, so a run with the same days resumes where an interrupted one
+        stopped. Weather and foot traffic are dropped as whole monthly
+        partitions. Freed pages are then returned with PRAGMA incremental_vacuum,
+        or VACUUM on PostgreSQL. progress is called with a status dict after
+        every chunk.
+        """
+        days = int(days)
+        try:
+            state = self.get_system_config(self.CLEANUP_PROGRESS_KEY)
+            resumed = bool(state) and state.get("days") == days
+            if not resumed:
+                state = {"days": days, "table": None, "cursor": "", "deleted": {}}
+            else:
+                self.logger.info(
+                    f"Resuming cleanup at {state['table']} after {state['cursor']!r}"
                 )
+            size_before = self._database_size()
+
+            params = {
+                "ml_predictions": (f"-{days} days",),
+                "api_cache": (),
+                "events": (int(time.time()) - days * 2 * 86400,),
+            }
+            tables = list(self.CLEANUP_TARGETS)
+            first = tables.index(state["table"]) if state["table"] in tables else 0
+            for table in tables[first:]:
+                if table != state["table"]:
+                    state["table"], state["cursor"] = table, ""
+                for deleted, last_key in self._delete_in_chunks(
+                    table,
+                    params[table],
+                    state["cursor"],
+                    chunk_size,
+                    latency_budget,
+                    pause_seconds,
+                ):
+                    state["cursor"] = last_key
+                    state["deleted"][table] = state["deleted"].get(table, 0) + deleted
+                    self.set_system_config(self.CLEANUP_PROGRESS_KEY, state)
+                    if progress:
+                        progress(
+                            {
+                                "table": table,
+                                "deleted": state["deleted"][table],
+                                "tables_done": tables.index(table),
+                                "tables_total": len(tables),
+                            }
+                        )
+
+            # Seal finished months, then drop whole partitions past retention
+            partitions = self.maintain_partitions()
+            if not partitions.success:
+                raise RuntimeError(partitions.error)
+            retention = self.drop_partitions_before(
+                datetime.now() - timedelta(days=days)
+            )
+            if not retention.success:
+                raise RuntimeError(retention.error)
+            removed = retention.data["rows_removed"]
+
+            # Deleted rows left tombstones, so only their keys are recomputed.
+            # Dropped partitions hold past observations the views never join.
+            refreshed = self.refresh_materialized(
+                chunk_size=chunk_size,
+                latency_budget=latency_budget,
+                pause_seconds=pause_seconds,
+            )
+            if not refreshed.success:
+                raise RuntimeError(refreshed.error)
+            self._reclaim_space(pause_seconds)
+            self.execute_update(
+                "DELETE FROM system_config WHERE config_key = ?",
+                (self.CLEANUP_PROGRESS_KEY,),
             )
 
+            deleted = state["deleted"]
+            freed = max(size_before - self._database_size(), 0)
             return OperationResult(
                 success=True,
                 data={
-                    "predictions_removed": old_predictions.data,
-                    "events_removed": old_events.data,
-                    "weather_removed": old_weather.data,
-                    "cache_removed": old_cache.data,
+                    "predictions_removed": deleted.get("ml_predictions", 0),
+                    "events_removed": deleted.get("events", 0),
+                    "weather_removed": removed["weather_data"],
+                    "traffic_removed": removed["foot_traffic_data"],
+                    "cache_removed": deleted.get("api_cache", 0),
+                    "views_refreshed": refreshed.data,
+                    "freed_bytes": freed,
+                    "resumed": resumed,
                 },
-                message=f"Cleaned up old data: {old_predictions.data} predictions, {old_events.data} events, {old_weather.data} weather records, {old_cache.data} cache entries",
+                message=(
+                    f"Cleaned up old data: {deleted.get('ml_predictions', 0)} "
+                    f"predictions, {deleted.get('events', 0)} events, "
+                    f"{removed['weather_data']} weather records, "
+                    f"{removed['foot_traffic_data']} traffic records, "
+                    f"{deleted.get('api_cache', 0)} cache entries, "
+                    f"{freed / 1024 / 1024:.1f} MB freed"
+                ),
             )
 
         except Exception as e:
@@ -1004,25 +4292,910 @@ class Database:
                 success=False, error=str(e), message=f"Failed to cleanup old data: {e}"
             )
 
+    def _delete_in_chunks(
+        self,
+        table: str,
+        params: tuple,
+        after: str,
+        chunk_size: int,
+        latency_budget: float,
+        pause_seconds: float,
+    ) -> Iterator[Tuple[int, str]]:
+        """Yield (rows deleted, last key) per short key-ordered transaction"""
+        key, predicate = self.CLEANUP_TARGETS[table]
+        chunk_size = max(int(chunk_size), 1)
+        size = chunk_size
+        while True:
+            started = time.perf_counter()
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                cursor.execute(
+                    f"SELECT {key} FROM {table} WHERE {key} > ? AND {predicate} "
+                    f"ORDER BY {key} LIMIT ?",
+                    (after, *params, size),
+                )
+                keys = [row[0] for row in cursor.fetchall()]
+                deleted = 0
+                if keys:
+                    cursor.execute(
+                        f"DELETE FROM {table} "
+                        f"WHERE {key} > ? AND {key} <= ? AND {predicate}",
+                        (after, keys[-1], *params),
+                    )
+                    deleted = cursor.rowcount
+                conn.commit()
+            if not keys:
+                return
+
+            after = keys[-1]
+            self._data_version += 1
+            yield deleted, after
+            if len(keys) < size:
+                return
+
+            size = self._next_chunk_size(
+                size, time.perf_counter() - started, chunk_size, latency_budget
+            )
+            time.sleep(pause_seconds)
+
+    @staticmethod
+    def _next_chunk_size(
+        size: int, elapsed: float, chunk_size: int, latency_budget: float
+    ) -> int:
+        """Halve a chunk that ran over latency_budget, grow back when well under"""
+        if elapsed > latency_budget:
+            return max(size // 2, 1)
+        if elapsed < latency_budget / 4:
+            return min(size * 2, chunk_size)
+        return size
+
+    def enable_incremental_vacuum(self) -> OperationResult:
+        """Switch SQLite to auto_vacuum=INCREMENTAL (one full VACUUM)"""
+        if self._db_type != "sqlite":
+            return OperationResult(success=True, message="Not needed on PostgreSQL")
+        try:
+            with self.get_connection() as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                    return OperationResult(
+                        success=True, message="Incremental vacuum already enabled"
+                    )
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+                indexed = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'table'"
+                    )
+                }
+
+            # VACUUM may renumber rowids, which the R*Tree and FTS5 indexes use
+            for table, (rtree, *_) in self.SPATIAL_TABLES.items():
+                if rtree in indexed:
+                    rebuilt = self.rebuild_spatial_index(table)
+                    if not rebuilt.success:
+                        raise RuntimeError(rebuilt.error)
+            for kind, (fts, *_) in self.SEARCH_TABLES.items():
+                if fts in indexed:
+                    rebuilt = self.rebuild_search_index(kind)
+                    if not rebuilt.success:
+                        raise RuntimeError(rebuilt.error)
+            return OperationResult(success=True, message="Enabled incremental vacuum")
+
+        except Exception as e:
+            self.logger.error(f"Enabling incremental vacuum failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Enabling incremental vacuum failed: {e}",
+            )
+
+    def _reclaim_space(self, pause_seconds: float, pages: int = 2000):
+        """Return free pages to the OS in small steps (VACUUM on PostgreSQL)"""
+        if self._db_type == "postgresql":
+            with self.get_connection() as conn:
+                conn.autocommit = True
+                try:
+                    cursor = self._cursor(conn)
+                    for table in self.CLEANUP_TARGETS:
+                        cursor.execute(f"VACUUM (ANALYZE) {table}")
+                finally:
+                    conn.autocommit = False
+            return
+
+        with self.get_connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                self.logger.info(
+                    "auto_vacuum is not INCREMENTAL, free pages stay in the file "
+                    "(see enable_incremental_vacuum)"
+                )
+                return
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            while free:
+                conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+                conn.commit()
+                remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if remaining >= free:
+                    break
+                free = remaining
+                time.sleep(pause_seconds)
+
+    def _database_size(self) -> int:
+        """Size of the database in bytes"""
+        if self._db_type == "postgresql":
+            rows = self.execute_query(
+                "SELECT pg_database_size(current_database()) AS size"
+            )
+            return rows[0]["size"] if rows else 0
+        rows = self.execute_query(
+            "SELECT page_count * page_size AS size "
+            "FROM pragma_page_count(), pragma_page_size()"
+        )
+        return rows[0]["size"] if rows else 0
+
+    # ========== TIME PARTITIONS ==========
+
+    # table -> time column; rows are partitioned by calendar month of it
+    PARTITIONED_TABLES = {
+        "weather_data": "timestamp",
+        "foot_traffic_data": "timestamp",
+    }
+
+    # rollup -> (source table, (column, group expr), (column, aggregate), filter)
+    ROLLUPS = {
+        "foot_traffic_rollup": (
+            "foot_traffic_data",
+            (("venue_id", "venue_id"),),
+            (
+                ("visit_count_sum", "SUM(visit_count)"),
+                ("unique_visitors_sum", "SUM(unique_visitors)"),
+                ("dwell_minutes_sum", "SUM(dwell_time_minutes)"),
+            ),
+            "",
+        ),
+        "weather_rollup": (
+            "weather_data",
+            (
+                ("lat_cell", "ROUND(CAST(lat AS NUMERIC), 2)"),
+                ("lng_cell", "ROUND(CAST(lng AS NUMERIC), 2)"),
+            ),
+            (
+                ("temperature_sum", "SUM(temperature_f)"),
+                ("precipitation_probability_sum", "SUM(precipitation_probability)"),
+                ("severe_count", "SUM(CASE WHEN is_severe THEN 1 ELSE 0 END)"),
+            ),
+            "AND is_forecast = 0",
+        ),
+    }
+
+    # Rollup watermark: rows collected after it are re-rolled up (PostgreSQL)
+    ROLLUP_WATERMARK_KEY = "partition_rollup_watermark"
+
+    def maintain_partitions(self) -> OperationResult:
+        """
+        Seal past months into partitions and refresh the hourly rollups.
+
+        On SQLite the base table holds the current month (and forecasts ahead
+        of it). Rows from earlier months move into one table per month, such
+        as weather_data_p202601. The <table>_all view stitches the base table
+        and its partitions back together with UNION ALL. On PostgreSQL the
+        tables are PARTITION BY RANGE on their time column (see
+        create_postgres_partitions in setup_database.py). The current and next
+        months get a partition ahead of time, and rows that fell into the
+        default partition move into a partition of their own month.
+
+        Rollups are recomputed for every month touched. They group rows by
+        day of week (0 = Sunday) and hour of day, and they outlive retention.
+        """
+        try:
+            sealed, rolled_up = {}, 0
+            current = self._month_key(datetime.now())
+            since = watermark = None
+            if self._db_type == "postgresql":
+                since = self.get_system_config(
+                    self.ROLLUP_WATERMARK_KEY, "1970-01-01 00:00:00"
+                )
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                months = set()
+                if self._db_type == "postgresql":
+                    # An hour of overlap catches writes that committed late
+                    cursor.execute("SELECT LOCALTIMESTAMP - INTERVAL '1 hour'")
+                    watermark = str(cursor.fetchone()[0])
+                for table, column in self.PARTITIONED_TABLES.items():
+                    if self._db_type == "postgresql":
+                        sealed[table], touched = self._attach_months(
+                            cursor, table, current, since
+                        )
+                        months.update((table, month) for month in touched)
+                        continue
+
+                    cursor.execute(
+                        f'SELECT DISTINCT substr("{column}", 1, 7) FROM {table} '
+                        f'WHERE "{column}" < ?',
+                        (self._month_bounds(current)[1],),
+                    )
+                    touched = sorted(row[0] for row in cursor.fetchall())
+                    sealed[table] = [month for month in touched if month < current]
+                    for month in sealed[table]:
+                        self._seal_month(cursor, table, month)
+                    self._rebuild_partition_view(cursor, table)
+                    months.update((table, month) for month in touched)
+
+                for rollup, (source, *_) in self.ROLLUPS.items():
+                    for table, month in sorted(months):
+                        if table == source:
+                            self._refresh_rollup(cursor, rollup, month)
+                            rolled_up += 1
+                conn.commit()
+
+            if watermark:
+                self.set_system_config(self.ROLLUP_WATERMARK_KEY, watermark)
+            self._data_version += 1
+            self._known_tables.clear()
+            months_sealed = sum(len(months) for months in sealed.values())
+            return OperationResult(
+                success=True,
+                data={"sealed": sealed, "rollups_refreshed": rolled_up},
+                message=(
+                    f"Sealed {months_sealed} partition months, "
+                    f"refreshed {rolled_up} rollup months"
+                ),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Partition maintenance failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Partition maintenance failed: {e}",
+            )
+
+    def drop_partitions_before(self, cutoff: datetime) -> OperationResult:
+        """Drop whole monthly partitions that end on or before cutoff"""
+        try:
+            dropped, removed = {}, {}
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                for table, column in self.PARTITIONED_TABLES.items():
+                    dropped[table], removed[table] = [], 0
+                    for partition in self._list_partitions(cursor, table):
+                        month = f"{partition[-6:-2]}-{partition[-2:]}"
+                        end = self._month_bounds(month)[1]
+                        if datetime.strptime(end, "%Y-%m-%d") > cutoff:
+                            continue
+                        cursor.execute(f"SELECT COUNT(*) FROM {partition}")
+                        removed[table] += cursor.fetchone()[0]
+                        if self._db_type == "postgresql":
+                            cursor.execute(
+                                f"ALTER TABLE {table} DETACH PARTITION {partition}"
+                            )
+                        cursor.execute(f"DROP TABLE {partition}")
+                        dropped[table].append(partition)
+
+                    if self._db_type == "postgresql":
+                        # Rows of the same months still in the default partition
+                        cursor.execute(
+                            f'DELETE FROM {table}_pdefault WHERE "{column}" < ?',
+                            (self._month_bounds(self._month_key(cutoff))[0],),
+                        )
+                        removed[table] += cursor.rowcount
+                    elif dropped[table]:
+                        self._rebuild_partition_view(cursor, table)
+                        self._adjust_table_stats(cursor, table, -removed[table])
+                conn.commit()
+
+            self._data_version += 1
+            self._known_tables.clear()
+            return OperationResult(
+                success=True,
+                data={"dropped": dropped, "rows_removed": removed},
+                message=(
+                    f"Dropped {sum(len(p) for p in dropped.values())} partitions "
+                    f"({sum(removed.values())} rows)"
+                ),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Partition retention failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Partition retention failed: {e}",
+            )
+
+    def get_traffic_profile(self, venue_id: str) -> List[Dict]:
+        """Average foot traffic per day of week and hour across all months"""
+        return self.execute_query(
+            """
+            SELECT * FROM vw_foot_traffic_profile
+            WHERE venue_id = ?
+            ORDER BY day_of_week, hour_of_day
+            """,
+            (venue_id,),
+        )
+
+    def get_weather_profile(self, lat: float, lng: float) -> List[Dict]:
+        """Average observed weather per day of week and hour for a ~1 km cell"""
+        return self.execute_query(
+            """
+            SELECT * FROM vw_weather_profile
+            WHERE lat_cell = ROUND(CAST(? AS NUMERIC), 2)
+            AND lng_cell = ROUND(CAST(? AS NUMERIC), 2)
+            ORDER BY day_of_week, hour_of_day
+            """,
+            (lat, lng),
+        )
+
+    def _partition_source(self, table: str) -> str:
+        """Relation covering every partition of table"""
+        if self._db_type == "sqlite" and table in self.PARTITIONED_TABLES:
+            return f"{table}_all"
+        return table
+
+    def _attach_months(
+        self, cursor, table: str, current: str, since: str
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Give the current and next months, and months found in the default
+        partition, a partition of their own (PostgreSQL). Returns the months
+        attached and the months with rows collected since the watermark.
+        """
+        column = self.PARTITIONED_TABLES[table]
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE relname = ? "
+            "AND pg_table_is_visible(oid)",
+            (table,),
+        )
+        row = cursor.fetchone()
+        if not row or row[0] != "p":
+            raise ValueError(f"{table} is not partitioned, run setup_database.py")
+
+        month_of = f"to_char(\"{column}\", 'YYYY-MM')"
+        cursor.execute(f"SELECT DISTINCT {month_of} FROM {table}_pdefault")
+        wanted = {row[0] for row in cursor.fetchall()}
+        wanted.update((current, self._shift_month(current, 1)))
+        existing = {
+            f"{partition[-6:-2]}-{partition[-2:]}"
+            for partition in self._list_partitions(cursor, table)
+        }
+        attached = sorted(wanted - existing)
+        for month in attached:
+            self._ensure_partition(cursor, table, month)
+
+        cursor.execute(
+            f"SELECT DISTINCT {month_of} FROM {table} WHERE collected_at >= ?",
+            (since,),
+        )
+        return attached, sorted(row[0] for row in cursor.fetchall())
+
+    def _seal_month(self, cursor, table: str, month: str):
+        """Move one month of rows from the base table into its partition"""
+        column = self.PARTITIONED_TABLES[table]
+        partition = self._ensure_partition(cursor, table, month)
+        columns = ", ".join(f'"{c}"' for c in self._columns(cursor, table))
+        bounds = self._month_bounds(month)
+
+        cursor.execute(f"SELECT COUNT(*) FROM {partition}")
+        before = cursor.fetchone()[0]
+        # Late rows for an already sealed month replace their earlier copy
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {partition} ({columns}) "
+            f'SELECT {columns} FROM {table} WHERE "{column}" >= ? AND "{column}" < ?',
+            bounds,
+        )
+        cursor.execute(
+            f'DELETE FROM {table} WHERE "{column}" >= ? AND "{column}" < ?', bounds
+        )
+        moved = cursor.rowcount
+        cursor.execute(f"SELECT COUNT(*) FROM {partition}")
+        # The delete trigger already subtracted the moved rows
+        self._adjust_table_stats(cursor, table, cursor.fetchone()[0] - before)
+        self.logger.info(f"Sealed {moved} {table} rows into {partition}")
+
+    def _ensure_partition(self, cursor, table: str, month: str) -> str:
+        """Create the partition for month if needed and return its name"""
+        partition = f"{table}_p{month.replace('-', '')}"
+        if self._db_type == "postgresql":
+            # The new range may not overlap rows left in the default partition,
+            # so they move into the partition before it is attached
+            column = self.PARTITIONED_TABLES[table]
+            start, end = self._month_bounds(month)
+            cursor.execute(
+                f"CREATE TABLE {partition} "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+            for statement in (
+                f"INSERT INTO {partition} SELECT * FROM {table}_pdefault",
+                f"DELETE FROM {table}_pdefault",
+            ):
+                cursor.execute(
+                    f'{statement} WHERE "{column}" >= ? AND "{column}" < ?',
+                    (start, end),
+                )
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+            return partition
+
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        )
+        create_sql = cursor.fetchone()[0]
+        cursor.execute(
+            re.sub(
+                rf'^CREATE TABLE\s+(?:IF NOT EXISTS\s+)?"?{table}"?',
+                f"CREATE TABLE IF NOT EXISTS {partition}",
+                create_sql,
+                count=1,
+            )
+        )
+        # Columns added to the base table since the partition was created
+        existing = set(self._columns(cursor, partition))
+        cursor.execute(f"PRAGMA table_info({table})")
+        for _, name, column_type, *_ in cursor.fetchall():
+            if name not in existing:
+                cursor.execute(
+                    f'ALTER TABLE {partition} ADD COLUMN "{name}" {column_type}'
+                )
+        return partition
+
+    def _list_partitions(self, cursor, table: str) -> List[str]:
+        if self._db_type == "postgresql":
+            cursor.execute(
+                """
+                SELECT child.relname FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                WHERE parent.relname = ? ORDER BY child.relname
+                """,
+                (table,),
+            )
+            # Skips the default partition
+            return [
+                row[0]
+                for row in cursor.fetchall()
+                if re.fullmatch(rf"{table}_p\d{{6}}", row[0])
+            ]
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name GLOB ? ORDER BY name",
+            (f"{table}_p[0-9][0-9][0-9][0-9][0-9][0-9]",),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _rebuild_partition_view(self, cursor, table: str):
+        """Point <table>_all at the base table and every SQLite partition"""
+        columns = self._columns(cursor, table)
+        # A late upsert for a sealed month lands in the base table until the
+        # next seal replaces the partition copy, so the base row wins its key
+        shadowed = " AND ".join(
+            f'b."{c}" = p."{c}"' for c in self.LOAD_TABLES[table][1]
+        )
+        base_columns = ", ".join(f'b."{c}"' for c in columns)
+        partition_columns = ", ".join(f'p."{c}"' for c in columns)
+        arms = [f"SELECT {base_columns} FROM {table} b"]
+        arms += [
+            f"SELECT {partition_columns} FROM {partition} p "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} b WHERE {shadowed})"
+            for partition in self._list_partitions(cursor, table)
+        ]
+        cursor.execute(f"DROP VIEW IF EXISTS {table}_all")
+        cursor.execute(f"CREATE VIEW {table}_all AS {' UNION ALL '.join(arms)}")
+
+    def _refresh_rollup(self, cursor, rollup: str, month: str):
+        """Recompute one month of a rollup from every partition of its source"""
+        source, groups, aggregates, extra = self.ROLLUPS[rollup]
+        column = f'"{self.PARTITIONED_TABLES[source]}"'
+        if self._db_type == "postgresql":
+            dow = f"CAST(EXTRACT(DOW FROM {column}) AS INTEGER)"
+            hour = f"CAST(EXTRACT(HOUR FROM {column}) AS INTEGER)"
+        else:
+            dow = f"CAST(strftime('%w', {column}) AS INTEGER)"
+            hour = f"CAST(strftime('%H', {column}) AS INTEGER)"
+
+        targets = ["month", *(name for name, _ in groups), "day_of_week"]
+        targets += ["hour_of_day", "samples", *(name for name, _ in aggregates)]
+        selects = ["?", *(expr for _, expr in groups), dow, hour, "COUNT(*)"]
+        selects += [expr for _, expr in aggregates]
+        group_by = ", ".join(str(i) for i in range(2, len(groups) + 4))
+
+        cursor.execute(f"DELETE FROM {rollup} WHERE month = ?", (month,))
+        cursor.execute(
+            f"""
+            INSERT INTO {rollup} ({', '.join(targets)})
+            SELECT {', '.join(selects)}
+            FROM {self._partition_source(source)}
+            WHERE {column} >= ? AND {column} < ? {extra}
+            GROUP BY {group_by}
+            """,
+            (month, *self._month_bounds(month)),
+        )
+
+    def _adjust_table_stats(self, cursor, table: str, delta: int):
+        if delta and self._db_type == "sqlite" and self._table_exists("table_stats"):
+            cursor.execute(
+                "UPDATE table_stats SET row_count = row_count + ?, "
+                "version = version + 1 WHERE table_name = ?",
+                (delta, table),
+            )
+
+    @staticmethod
+    def _columns(cursor, table: str) -> List[str]:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _month_key(moment: datetime) -> str:
+        return f"{moment.year:04d}-{moment.month:02d}"
+
+    @staticmethod
+    def _shift_month(month: str, offset: int) -> str:
+        year, month_number = divmod(
+            int(month[:4]) * 12 + int(month[5:7]) - 1 + offset, 12
+        )
+        return f"{year:04d}-{month_number + 1:02d}"
+
+    @classmethod
+    def _month_bounds(cls, month: str) -> Tuple[str, str]:
+        """Half-open [first day, first day of next month) as date strings"""
+        return f"{month}-01", f"{cls._shift_month(month, 1)}-01"
+
+    # ========== MATERIALIZED VIEWS ==========
+
+    # view -> (backing table, key column)
+    MATERIALIZED_VIEWS = {
+        "vw_master_venue_data": ("mv_master_venue_data", "venue_id"),
+        "vw_master_events_data": ("mv_master_events_data", "event_id"),
+    }
+
+    # Secondary indexes on backing tables, created on full rebuilds
+    MATERIALIZED_INDEXES = {
+        "mv_master_venue_data": ("prediction_value",),
+        "mv_master_events_data": ("start_ts",),
+    }
+
+    # Change-tracking column per source table, used as refresh watermarks
+    WATERMARK_COLUMNS = {
+        "venues": "change_seq",
+        "events": "change_seq",
+        "ml_predictions": "change_seq",
+        "demographic_data": "collected_at",
+        "weather_data": "collected_at",
+    }
+
+    def refresh_materialized(
+        self,
+        full: bool = False,
+        chunk_size: int = 500,
+        latency_budget: Optional[float] = None,
+        pause_seconds: float = 0.0,
+    ) -> OperationResult:
+        """
+        Bring the materialized master view tables up to date (SQLite only).
+
+        Incremental refreshes recompute only keys whose source venue, event,
+        prediction, demographic or weather rows changed or were deleted
+        (change_tombstones) since the previous refresh's watermarks, plus rows
+        invalidated by the clock (events that started since). They run in
+        transactions of at most chunk_size keys, halved when a chunk exceeds
+        latency_budget seconds, with pause_seconds between chunks. full=True,
+        a first refresh or a view whose columns changed rebuilds the whole
+        table in one transaction.
+        """
+        if self._db_type != "sqlite":
+            return OperationResult(
+                success=True, data={}, message="Materialized views are SQLite only"
+            )
+
+        try:
+            refreshed = {}
+            pending = {}
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                state = self._load_materialized_state(cursor)
+
+                # Read new watermarks first so concurrent writes land in the next run
+                watermarks = {
+                    table: cursor.execute(
+                        f"SELECT {next_change_seq(table)} - 1"
+                        if column == "change_seq"
+                        else f"SELECT COALESCE(MAX({column}), '') FROM {table}"
+                    ).fetchone()[0]
+                    for table, column in self.WATERMARK_COLUMNS.items()
+                }
+                now, now_ts = cursor.execute(
+                    "SELECT datetime('now'), CAST(strftime('%s', 'now') AS INTEGER)"
+                ).fetchone()
+                watermarks["now"] = now
+                watermarks["now_ts"] = now_ts
+
+                for view, (table, key) in self.MATERIALIZED_VIEWS.items():
+                    previous = state.get(view)
+                    if (
+                        full
+                        or previous is None
+                        or self._view_drifted(cursor, view, table)
+                    ):
+                        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                        cursor.execute(f"CREATE TABLE {table} AS SELECT * FROM {view}")
+                        cursor.execute(
+                            f"CREATE INDEX idx_{table}_key ON {table}({key})"
+                        )
+                        for column in self.MATERIALIZED_INDEXES.get(table, ()):
+                            cursor.execute(
+                                f"CREATE INDEX idx_{table}_{column} "
+                                f"ON {table}({column})"
+                            )
+                        refreshed[view] = cursor.execute(
+                            f"SELECT COUNT(*) FROM {table}"
+                        ).fetchone()[0]
+                        self._save_materialized_state(cursor, view, watermarks)
+                    else:
+                        # Collected up front: venue keys of deleted events are
+                        # read from the events table before it is refreshed
+                        pending[view] = self._changed_materialized_keys(
+                            cursor, view, previous
+                        )
+
+                conn.commit()
+            self._data_version += 1
+
+            # An interrupted run keeps the old watermarks and recomputes again
+            for view, keys in pending.items():
+                table, key = self.MATERIALIZED_VIEWS[view]
+                self._refresh_materialized_keys(
+                    view, table, key, keys, chunk_size, latency_budget, pause_seconds
+                )
+                with self.get_connection() as conn:
+                    cursor = self._cursor(conn)
+                    self._begin(conn, cursor)
+                    if view == "vw_master_events_data":
+                        cursor.execute(
+                            f"DELETE FROM {table} "
+                            "WHERE start_ts < CAST(strftime('%s', 'now') AS INTEGER)"
+                        )
+                    self._save_materialized_state(cursor, view, watermarks)
+                    conn.commit()
+                refreshed[view] = len(keys)
+
+            self._data_version += 1
+            for table, _ in self.MATERIALIZED_VIEWS.values():
+                self._known_tables.pop(table, None)
+
+            return OperationResult(
+                success=True,
+                data=refreshed,
+                message=(
+                    f"{'Rebuilt' if full else 'Refreshed'} materialized views: "
+                    + ", ".join(
+                        f"{view} ({rows} rows)" for view, rows in refreshed.items()
+                    )
+                ),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Materialized view refresh failed: {e}")
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Materialized view refresh failed: {e}",
+            )
+
+    @staticmethod
+    def _save_materialized_state(cursor, view: str, watermarks: Dict):
+        cursor.execute(
+            """
+            INSERT INTO materialized_view_state
+                (view_name, watermarks, refreshed_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(view_name) DO UPDATE SET
+                watermarks = excluded.watermarks,
+                refreshed_at = excluded.refreshed_at
+            """,
+            (view, json.dumps(watermarks)),
+        )
+
+    @staticmethod
+    def _load_materialized_state(cursor) -> Dict[str, Dict]:
+        cursor.execute("SELECT view_name, watermarks FROM materialized_view_state")
+        states = {view: json.loads(marks) for view, marks in cursor.fetchall()}
+        # States saved before change_seq watermarks hold timestamps, so rebuild
+        return {
+            view: marks
+            for view, marks in states.items()
+            if not isinstance(marks.get("venues"), str)
+        }
+
+    @staticmethod
+    def _view_drifted(cursor, view: str, table: str) -> bool:
+        """Whether the backing table is missing or its columns no longer match"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        table_columns = [row[1] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT * FROM {view} LIMIT 0")
+        view_columns = [desc[0] for desc in cursor.description]
+        return table_columns != view_columns
+
+    @staticmethod
+    def _changed_materialized_keys(cursor, view: str, since: Dict) -> List:
+        """Keys of one materialized view whose sources changed or were deleted"""
+        if view == "vw_master_venue_data":
+            cursor.execute(
+                """
+                SELECT venue_id FROM venues WHERE change_seq > ?
+                UNION
+                SELECT venue_id FROM ml_predictions
+                WHERE change_seq > ? AND prediction_type = 'psychographic_match'
+                UNION
+                SELECT venue_id FROM events
+                WHERE venue_id IS NOT NULL
+                AND (
+                    change_seq > ?
+                    OR (start_ts > ? AND start_ts <= CAST(strftime('%s', 'now') AS INTEGER))
+                )
+                UNION
+                SELECT venue_id FROM change_tombstones
+                WHERE table_name = 'venues' AND change_seq > ?
+                UNION
+                SELECT venue_id FROM change_tombstones
+                WHERE table_name = 'ml_predictions' AND change_seq > ?
+                AND venue_id IS NOT NULL
+                UNION
+                SELECT venue_id FROM change_tombstones
+                WHERE table_name = 'events' AND change_seq > ?
+                AND venue_id IS NOT NULL
+                UNION
+                SELECT v.venue_id
+                FROM demographic_data d
+                JOIN venues_rtree r
+                    ON r.max_lat >= d.lat - 0.01 AND r.min_lat <= d.lat + 0.01
+                    AND r.max_lng >= d.lng - 0.01 AND r.min_lng <= d.lng + 0.01
+                JOIN venues v ON v.rowid = r.id
+                WHERE d.collected_at >= ?
+                """,
+                (
+                    since["venues"],
+                    since["ml_predictions"],
+                    since["events"],
+                    # States saved before epoch columns existed lack now_ts
+                    since.get("now_ts", 0),
+                    since["venues"],
+                    since["ml_predictions"],
+                    since["events"],
+                    since["demographic_data"],
+                ),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT event_id FROM events WHERE change_seq > ?
+                UNION
+                SELECT e.event_id FROM venues v JOIN events e ON e.venue_id = v.venue_id
+                WHERE v.change_seq > ?
+                UNION
+                SELECT row_key FROM change_tombstones
+                WHERE table_name = 'events' AND change_seq > ?
+                UNION
+                SELECT e.event_id
+                FROM change_tombstones t JOIN events e ON e.venue_id = t.row_key
+                WHERE t.table_name = 'venues' AND t.change_seq > ?
+                UNION
+                SELECT e.event_id
+                FROM weather_data w
+                JOIN events e
+                    ON e.start_ts BETWEEN CAST(strftime('%s', w.timestamp) AS INTEGER) - 3599
+                    AND CAST(strftime('%s', w.timestamp) AS INTEGER) + 3599
+                WHERE w.collected_at >= ? AND w.is_forecast = 1
+                AND e.start_ts >= CAST(strftime('%s', 'now') AS INTEGER)
+                """,
+                (
+                    since["events"],
+                    since["venues"],
+                    since["events"],
+                    since["venues"],
+                    since["weather_data"],
+                ),
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _refresh_materialized_keys(
+        self,
+        view: str,
+        table: str,
+        key: str,
+        keys: List,
+        chunk_size: int,
+        latency_budget: Optional[float],
+        pause_seconds: float,
+    ):
+        """Recompute keys of one materialized view, a short transaction per chunk"""
+        chunk_size = max(int(chunk_size), 1)
+        size = chunk_size
+        done = 0
+        while done < len(keys):
+            chunk = keys[done : done + size]
+            placeholders = ", ".join("?" for _ in chunk)
+            started = time.perf_counter()
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                self._begin(conn, cursor)
+                # Deleted keys are removed and not re-inserted
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE {key} IN ({placeholders})", chunk
+                )
+                # Literal IN lists let SQLite push the key filter into the view
+                cursor.execute(
+                    f"INSERT INTO {table} SELECT * FROM {view} "
+                    f"WHERE {key} IN ({placeholders})",
+                    chunk,
+                )
+                conn.commit()
+            self._data_version += 1
+            done += len(chunk)
+            if done >= len(keys):
+                return
+
+            if latency_budget is not None:
+                size = self._next_chunk_size(
+                    size, time.perf_counter() - started, chunk_size, latency_budget
+                )
+            time.sleep(pause_seconds)
+
+    def _master_source(self, view: str) -> str:
+        """Materialized table for a master view when it has been built"""
+        table = self.MATERIALIZED_VIEWS[view][0]
+        return table if self._table_exists(table) else view
+
     def get_master_venue_data(self, limit: Optional[int] = None) -> List[Dict]:
-        """Get enriched venue data from master view"""
-        query = "SELECT * FROM vw_master_venue_data ORDER BY prediction_value DESC"
+        """Get enriched venue data from the materialized master view"""
+        source = self._master_source("vw_master_venue_data")
+        query = f"SELECT * FROM {source} ORDER BY prediction_value DESC"
+        params: Tuple = ()
         if limit:
-            query += f" LIMIT {limit}"
-        return self.execute_query(query)
+            query += " LIMIT ?"
+            params = (FilterCompiler._non_negative_int("limit", limit),)
+        return self.execute_query(query, params)
 
     def get_master_events_data(self, limit: Optional[int] = None) -> List[Dict]:
-        """Get enriched event data from master view"""
-        query = "SELECT * FROM vw_master_events_data ORDER BY start_time ASC"
+        """Get enriched upcoming event data from the materialized master view"""
+        source = self._master_source("vw_master_events_data")
+        query = f"""
+            SELECT * FROM {source}
+            WHERE start_ts >= ?
+            ORDER BY start_ts ASC
+        """
+        params: Tuple = (int(time.time()),)
         if limit:
-            query += f" LIMIT {limit}"
-        return self.execute_query(query)
+            query += " LIMIT ?"
+            params += (FilterCompiler._non_negative_int("limit", limit),)
+        return self.execute_query(query, params)
 
     def get_high_value_predictions(self, min_confidence: float = 0.7) -> List[Dict]:
         """Get high-value predictions for recommendations"""
+        if self._master_source("vw_master_venue_data") == "vw_master_venue_data":
+            query = """
+                SELECT * FROM vw_high_value_predictions 
+                WHERE confidence_score >= ? 
+                ORDER BY psychographic_fit_score DESC
+            """
+            return self.execute_query(query, (min_confidence,))
+
+        # Same rows as vw_high_value_predictions, read from precomputed venue data
         query = """
-            SELECT * FROM vw_high_value_predictions 
-            WHERE confidence_score >= ? 
+            SELECT venue_id, name, category, lat, lng, address,
+                   prediction_value, confidence_score,
+                   career_driven_score, competent_score, fun_score,
+                   (career_driven_score * 0.35 + competent_score * 0.30
+                    + fun_score * 0.35) as psychographic_fit_score
+            FROM mv_master_venue_data
+            WHERE prediction_value >= 0.6
+            AND confidence_score >= 0.7
+            AND confidence_score >= ?
             ORDER BY psychographic_fit_score DESC
         """
         return self.execute_query(query, (min_confidence,))
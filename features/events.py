@@ -330,11 +330,8 @@ class EventService:
                     failed_venues += 1
                     continue
 
-            # Process and store events
-            stored_count = 0
-            for event_data in all_events:
-                if self._validate_and_store_event(event_data):
-                    stored_count += 1
+            # Validate and store all events in one bulk write
+            stored_count = self._store_events(all_events)
 
             duration = (datetime.now() - start_time).total_seconds()
 
@@ -445,19 +442,14 @@ class EventService:
         Get events from database with optional filtering.
 
         Args:
-            filters: Optional filters (category, date_range, has_location, etc.)
+            filters: Optional filters (category, start_date, end_date, during, etc.)
             limit: Optional limit on number of results
 
         Returns:
             List of event dictionaries
         """
         try:
-            # Add limit to filters if provided
-            if filters is None:
-                filters = {}
-            if limit is not None:
-                filters["limit"] = limit
-            return self.db.get_events(filters)
+            return self.db.get_events(filters, limit=limit)
         except Exception as e:
             self.logger.error(f"Failed to get events: {e}")
             return []
@@ -486,8 +478,7 @@ class EventService:
             Event dictionary or None if not found
         """
         try:
-            events = self.db.get_events({"event_id": event_id})
-            return events[0] if events else None
+            return self.db.get_event(event_id)
         except Exception as e:
             self.logger.error(f"Failed to get event {event_id}: {e}")
             return None
@@ -1303,118 +1294,137 @@ Content:
 
     def _validate_and_store_event(self, event_data: EventData) -> bool:
         """Validate event data and store in database with lenient validation"""
-        try:
-            # Convert to dictionary for validation
-            event_dict = {
-                "external_id": event_data.external_id,
-                "provider": event_data.provider,
-                "name": event_data.name,
-                "description": event_data.description,
-                "category": event_data.category,
-                "subcategory": event_data.subcategory,
-                "start_time": event_data.start_time,
-                "end_time": event_data.end_time,
-                "venue_name": event_data.venue_name,
-                "lat": event_data.lat,
-                "lng": event_data.lng,
-                "address": event_data.address,
-                "psychographic_relevance": event_data.psychographic_scores,
-            }
-
-            # Basic validation - only check essential fields
-            if not event_data.name or len(event_data.name.strip()) < 2:
-                self.logger.warning(f"Event rejected: missing or invalid name")
-                return False
-
-            if not event_data.external_id:
-                self.logger.warning(f"Event rejected: missing external_id")
-                return False
-
-            # Try quality validation but don't fail if it has issues
+        return self._store_events([event_data]) == 1
+
+    def _store_events(self, events: List[EventData]) -> int:
+        """Validate events and store them with a single bulk write"""
+        event_dicts = []
+        for event_data in events:
             try:
-                is_valid, validation_results = self.quality_validator.validate_event(
-                    event_dict
+                event_dict = self._prepare_event_record(event_data)
+                if event_dict:
+                    event_dicts.append(event_dict)
+            except Exception as e:
+                self.logger.error(
+                    f"Error validating event {getattr(event_data, 'name', None)}: {e}"
                 )
 
-                if not is_valid:
-                    # Log validation warnings but continue with storage
-                    errors = [
-                        r.error_message
-                        for r in validation_results
-                        if hasattr(r, "error_message") and r.error_message
-                    ]
-                    if errors:
-                        self.logger.debug(
-                            f"Event validation warnings for {event_data.name}: {'; '.join(errors)}"
-                        )
-                    # Continue with storage despite validation warnings
+        if not event_dicts:
+            return 0
 
-            except Exception as validation_error:
-                self.logger.debug(
-                    f"Validation error for {event_data.name}: {validation_error}. Proceeding with basic validation."
-                )
+        result = self.db.upsert_events_bulk(event_dicts)
+        for index, error in result.data.errors.items():
+            self.logger.error(
+                f"Failed to store event {event_dicts[index]['name']}: {error}"
+            )
+        if not result.success:
+            self.logger.error(f"Failed to store events: {result.message}")
+            return 0
+
+        self.logger.debug(result.message)
+        return result.data.inserted + result.data.updated
+
+    def _prepare_event_record(self, event_data: EventData) -> Optional[Dict]:
+        """Validate event data and convert it to a database record"""
+        # Convert to dictionary for validation
+        event_dict = {
+            "external_id": event_data.external_id,
+            "provider": event_data.provider,
+            "name": event_data.name,
+            "description": event_data.description,
+            "category": event_data.category,
+            "subcategory": event_data.subcategory,
+            "start_time": event_data.start_time,
+            "end_time": event_data.end_time,
+            "venue_name": event_data.venue_name,
+            "lat": event_data.lat,
+            "lng": event_data.lng,
+            "address": event_data.address,
+            "psychographic_relevance": event_data.psychographic_scores,
+        }
 
-            # Try to enrich with venue coordinates before storing
-            if event_data.venue_name and not event_data.lat and not event_data.lng:
-                venue_coords = self._lookup_venue_coordinates(event_data.venue_name)
-                if venue_coords:
-                    event_dict["lat"] = venue_coords["lat"]
-                    event_dict["lng"] = venue_coords["lng"]
-                    if not event_dict.get("address") and venue_coords.get("address"):
-                        event_dict["address"] = venue_coords["address"]
-
-            # Store in database
-            result = self.db.upsert_event(event_dict)
-
-            if result.success:
-                self.logger.debug(f"Successfully stored event: {event_data.name}")
-                return True
-            else:
-                self.logger.error(
-                    f"Failed to store event {event_data.name}: {result.error}"
-                )
-                return False
+        # Basic validation - only check essential fields
+        if not event_data.name or len(event_data.name.strip()) < 2:
+            self.logger.warning(f"Event rejected: missing or invalid name")
+            return None
 
-        except Exception as e:
-            self.logger.error(f"Error validating/storing event {event_data.name}: {e}")
-            return False
+        if not event_data.external_id:
+            self.logger.warning(f"Event rejected: missing external_id")
+            return None
+
+        # Try quality validation but don't fail if it has issues
+        try:
+            is_valid, validation_results = self.quality_validator.validate_event(
+                event_dict
+            )
+
+            if not is_valid:
+                # Log validation warnings but continue with storage
+                errors = [
+                    r.error_message
+                    for r in validation_results
+                    if hasattr(r, "error_message") and r.error_message
+                ]
+                if errors:
+                    self.logger.debug(
+                        f"Event validation warnings for {event_data.name}: {'; '.join(errors)}"
+                    )
+                # Continue with storage despite validation warnings
+
+        except Exception as validation_error:
+            self.logger.debug(
+                f"Validation error for {event_data.name}: {validation_error}. Proceeding with basic validation."
+            )
+
+        # Try to enrich with venue coordinates before storing
+        if event_data.venue_name and not event_data.lat and not event_data.lng:
+            venue_coords = self._lookup_venue_coordinates(event_data.venue_name)
+            if venue_coords:
+                event_dict["lat"] = venue_coords["lat"]
+                event_dict["lng"] = venue_coords["lng"]
+                if not event_dict.get("address") and venue_coords.get("address"):
+                    event_dict["address"] = venue_coords["address"]
+
+        return event_dict
 
     def _lookup_venue_coordinates(self, venue_name: str) -> Optional[Dict]:
         """Look up venue coordinates from existing venues in database"""
         try:
-            # Get all venues from database
-            venues = self.db.get_venues()
+            # Full-text candidates sharing any word with the name, best first
+            venues = [
+                venue
+                for venue in self.db.search(venue_name, "venues", match_all=False)
+                if venue.get("name") and venue.get("lat") and venue.get("lng")
+            ]
+            search_name = venue_name.lower()
 
             # Try exact match first
             for venue in venues:
-                if venue.get("name") and venue["name"].lower() == venue_name.lower():
-                    if venue.get("lat") and venue.get("lng"):
-                        return {
-                            "lat": venue["lat"],
-                            "lng": venue["lng"],
-                            "address": venue.get("address"),
-                        }
+                if venue["name"].lower() == search_name:
+                    return {
+                        "lat": venue["lat"],
+                        "lng": venue["lng"],
+                        "address": venue.get("address"),
+                    }
 
             # Try partial match (venue name contains or is contained in database venue name)
             for venue in venues:
-                if venue.get("name") and venue.get("lat") and venue.get("lng"):
-                    db_name = venue["name"].lower()
-                    search_name = venue_name.lower()
-
-                    # Check if names are similar (contains relationship)
-                    if (
-                        search_name in db_name
-                        or db_name in search_name
-                        or self._names_are_similar(search_name, db_name)
-                    ):
-                        self.logger.debug(
-                            f"Found venue coordinates for '{venue_name}' using '{venue['name']}'"
-                        )
-                        return {
-                            "lat": venue["lat"],
-                            "lng": venue["lng"],
-                            "address": venue.get("address"),
-                        }
+                db_name = venue["name"].lower()
+
+                # Check if names are similar (contains relationship)
+                if (
+                    search_name in db_name
+                    or db_name in search_name
+                    or self._names_are_similar(search_name, db_name)
+                ):
+                    self.logger.debug(
+                        f"Found venue coordinates for '{venue_name}' using '{venue['name']}'"
+                    )
+                    return {
+                        "lat": venue["lat"],
+                        "lng": venue["lng"],
+                        "address": venue.get("address"),
+                    }
 
             return None
 
@@ -12,6 +12,7 @@ Single service that consolidates ALL map visualization functionality:
 Replaces the entire features/visualization/ directory structure.
 """
 
+import itertools
 import logging
 import os
 import json
@@ -21,6 +22,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import folium
 import numpy as np
+import pandas as pd
 
 # Folium plugins with graceful fallback
 try:
@@ -195,7 +197,7 @@ class MapService:
         Create interactive map showing events.
 
         Args:
-            event_filters: Optional filters for events (category, date_range, etc.)
+            event_filters: Optional filters for events (category, during, etc.)
             output_path: Output HTML file path
 
         Returns:
@@ -271,9 +273,12 @@ class MapService:
         self.logger.info("🤖 Creating prediction heatmap")
 
         try:
-            # Get prediction data
-            predictions = self.db.get_predictions()
-            if not predictions:
+            # Get located prediction data as columns, bounds pushed down
+            prediction_filters = {"has_location": True}
+            if bounds:
+                prediction_filters["bounds"] = bounds
+            predictions = self.db.predictions_frame(prediction_filters)
+            if predictions.empty:
                 return OperationResult(
                     success=False,
                     error="No predictions found",
@@ -281,12 +286,12 @@ class MapService:
                 )
 
             # Filter predictions with location data
-            located_predictions = []
-            for pred in predictions:
-                if pred.get("lat") and pred.get("lng"):
-                    located_predictions.append(pred)
+            located_predictions = predictions[
+                (predictions["lat"].fillna(0) != 0)
+                & (predictions["lng"].fillna(0) != 0)
+            ]
 
-            if not located_predictions:
+            if located_predictions.empty:
                 return OperationResult(
                     success=False,
                     error="No predictions with location data",
@@ -303,7 +308,7 @@ class MapService:
             else:
                 # Fallback to circle markers
                 pred_layer = folium.FeatureGroup(name="Predictions", show=True)
-                for pred in located_predictions:
+                for pred in located_predictions.to_dict("records"):
                     self._add_prediction_marker(pred_layer, pred, "calculated")
                 pred_layer.add_to(m)
 
@@ -451,13 +456,13 @@ class MapService:
         self.logger.info(f"📄 Exporting {data_type} to GeoJSON")
 
         try:
-            # Get data based on type
+            # Stream rows so large tables are never held in memory at once
             if data_type == "venues":
-                data = self.db.get_venues(filters)
+                rows = self.db.iter_venues(filters)
             elif data_type == "events":
-                data = self.db.get_events(filters)
+                rows = self.db.iter_events(filters)
             elif data_type == "predictions":
-                data = self.db.get_predictions()
+                rows = self.db.iter_predictions()
             else:
                 return OperationResult(
                     success=False,
@@ -465,47 +470,35 @@ class MapService:
                     message=f"Data type '{data_type}' not supported. Use 'venues', 'events', or 'predictions'",
                 )
 
-            if not data:
+            first = next(rows, None)
+            if first is None:
                 return OperationResult(
                     success=False,
                     error="No data found",
                     message=f"No {data_type} data available for export",
                 )
 
-            # Convert to GeoJSON
-            features = []
-            for item in data:
-                lat = item.get("lat") or item.get("latitude")
-                lng = item.get("lng") or item.get("longitude")
-
-                if lat and lng:
-                    feature = {
-                        "type": "Feature",
-                        "geometry": {
-                            "type": "Point",
-                            "coordinates": [lng, lat],  # GeoJSON uses [lng, lat] order
-                        },
-                        "properties": {
-                            k: v
-                            for k, v in item.items()
-                            if k not in ["lat", "lng", "latitude", "longitude"]
-                        },
-                    }
-                    features.append(feature)
-
-            geojson_data = {"type": "FeatureCollection", "features": features}
-
-            # Save GeoJSON file
+            # Save GeoJSON file, writing one feature at a time
             output_file = Path(output_path).resolve()
             output_file.parent.mkdir(parents=True, exist_ok=True)
 
+            feature_count = 0
             with open(output_file, "w") as f:
-                json.dump(geojson_data, f, indent=2, default=str)
+                f.write('{"type": "FeatureCollection", "features": [')
+                for item in itertools.chain([first], rows):
+                    feature = self._to_geojson_feature(item)
+                    if feature is None:
+                        continue
+
+                    f.write(",\n" if feature_count else "\n")
+                    f.write(json.dumps(feature, default=str))
+                    feature_count += 1
+                f.write("\n]}\n")
 
             return OperationResult(
                 success=True,
                 data=str(output_file),
-                message=f"Exported {len(features)} {data_type} features to GeoJSON: {output_file}",
+                message=f"Exported {feature_count} {data_type} features to GeoJSON: {output_file}",
             )
 
         except Exception as e:
@@ -514,6 +507,27 @@ class MapService:
                 success=False, error=str(e), message=f"GeoJSON export failed: {e}"
             )
 
+    def _to_geojson_feature(self, item: Dict) -> Optional[Dict]:
+        """Convert a row with coordinates to a GeoJSON Point feature"""
+        lat = item.get("lat") or item.get("latitude")
+        lng = item.get("lng") or item.get("longitude")
+
+        if not (lat and lng):
+            return None
+
+        return {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [lng, lat],  # GeoJSON uses [lng, lat] order
+            },
+            "properties": {
+                k: v
+                for k, v in item.items()
+                if k not in ["lat", "lng", "latitude", "longitude"]
+            },
+        }
+
     def open_map_in_browser(self, file_path: str) -> OperationResult:
         """
         Open generated map in default browser.
@@ -779,83 +793,67 @@ class MapService:
         ).add_to(layer)
 
     def _add_prediction_heatmap_layer(
-        self, map_obj: folium.Map, predictions: List[Dict]
+        self, map_obj: folium.Map, predictions: pd.DataFrame
     ):
         """Add prediction heatmap layer using HeatMap plugin"""
         if not HEATMAP_AVAILABLE:
             return
 
-        # Prepare heatmap data
-        heat_data = []
-
-        # Get prediction values, filtering out None values
-        prediction_values = [
-            p.get("prediction_value", 0)
-            for p in predictions
-            if p.get("prediction_value") is not None and p.get("prediction_value") > 0
-        ]
-
-        # Calculate max_value safely
-        if prediction_values:
-            max_value = max(prediction_values)
-        else:
-            max_value = 1.0
+        # Only positive prediction values contribute heat
+        values = predictions["prediction_value"].astype("float64")
+        positive = predictions[values.fillna(0) > 0]
+        if positive.empty:
+            return
 
-        # Ensure max_value is not zero or None
-        if max_value is None or max_value <= 0:
+        # Scale intensities to the strongest prediction, with a minimum intensity
+        max_value = values.max()
+        if not max_value or max_value <= 0:
             max_value = 1.0
+        intensity = np.maximum(0.1, positive["prediction_value"] / max_value)
 
-        for pred in predictions:
-            lat, lng = pred.get("lat"), pred.get("lng")
-            value = pred.get("prediction_value")
-
-            if lat and lng and value is not None and value > 0:
-                # Safe division with additional check
-                try:
-                    intensity = value / max_value if max_value > 0 else 0.5
-                    heat_data.append(
-                        [lat, lng, max(0.1, intensity)]
-                    )  # Ensure minimum intensity
-                except (TypeError, ZeroDivisionError):
-                    heat_data.append([lat, lng, 0.5])  # Default intensity
-
-        if heat_data:
-            HeatMap(
-                heat_data,
-                radius=20,
-                blur=15,
-                max_zoom=15,
-                gradient={
-                    0.0: "navy",
-                    0.3: "blue",
-                    0.5: "green",
-                    0.7: "yellow",
-                    1.0: "red",
-                },
-            ).add_to(map_obj)
+        heat_data = np.column_stack(
+            [
+                positive["lat"].to_numpy(np.float64),
+                positive["lng"].to_numpy(np.float64),
+                intensity.to_numpy(np.float64),
+            ]
+        ).tolist()
+
+        HeatMap(
+            heat_data,
+            radius=20,
+            blur=15,
+            max_zoom=15,
+            gradient={
+                0.0: "navy",
+                0.3: "blue",
+                0.5: "green",
+                0.7: "yellow",
+                1.0: "red",
+            },
+        ).add_to(map_obj)
 
     def _add_high_value_prediction_markers(
-        self, map_obj: folium.Map, predictions: List[Dict]
+        self, map_obj: folium.Map, predictions: pd.DataFrame
     ):
         """Add special markers for high-value predictions"""
-        if not predictions:
+        if predictions.empty:
             return
 
         # Find high-value predictions (top 20%)
-        values = [p.get("prediction_value", 0) for p in predictions]
-        threshold = np.percentile(values, 80) if values else 0.8
-
-        for pred in predictions:
-            value = pred.get("prediction_value", 0)
-            if value >= threshold:
-                lat, lng = pred.get("lat"), pred.get("lng")
-                if lat and lng:
-                    folium.Marker(
-                        location=(lat, lng),
-                        popup=f"High Value Prediction: {value:.3f}",
-                        tooltip=f"High Value: {value:.3f}",
-                        icon=folium.Icon(color="red", icon="star"),
-                    ).add_to(map_obj)
+        values = predictions["prediction_value"].fillna(0)
+        threshold = np.percentile(values, 80)
+        high_value = predictions[values >= threshold]
+
+        for lat, lng, value in zip(
+            high_value["lat"], high_value["lng"], values[values >= threshold]
+        ):
+            folium.Marker(
+                location=(float(lat), float(lng)),
+                popup=f"High Value Prediction: {value:.3f}",
+                tooltip=f"High Value: {value:.3f}",
+                icon=folium.Icon(color="red", icon="star"),
+            ).add_to(map_obj)
 
     def _calculate_center_from_venues(self, venues: List[Dict]) -> List[float]:
         """Calculate map center from venue coordinates"""
@@ -878,17 +876,18 @@ class MapService:
             return list(self.config.center_coords)
 
     def _calculate_center_from_predictions(
-        self, predictions: List[Dict]
+        self, predictions: pd.DataFrame
     ) -> List[float]:
         """Calculate map center from prediction coordinates"""
-        lats = [p["lat"] for p in predictions if p.get("lat")]
-        lngs = [p["lng"] for p in predictions if p.get("lng")]
-
-        if lats and lngs:
-            return [sum(lats) / len(lats), sum(lngs) / len(lngs)]
-        else:
+        if predictions.empty:
             return list(self.config.center_coords)
 
+        # Average in float64 so float32 coordinates don't lose precision
+        return [
+            float(predictions["lat"].astype("float64").mean()),
+            float(predictions["lng"].astype("float64").mean()),
+        ]
+
     def _calculate_center_from_all_data(
         self, venues: List[Dict], events: List[Dict], predictions: List[Dict]
     ) -> List[float]:
@@ -1009,17 +1008,11 @@ class MapService:
             return None
 
         try:
-            # Get predictions from database for this venue
-            predictions = self.db.get_predictions()
-            if not predictions:
-                return None
-
-            # Find prediction for this specific venue
-            for pred in predictions:
-                if pred.get("venue_id") == venue_id:
-                    return pred
-
-            return None
+            # Get the highest prediction for this venue
+            predictions = self.db.get_predictions(
+                filters={"venue_id": venue_id, "limit": 1}
+            )
+            return predictions[0] if predictions else None
 
         except Exception as e:
             self.logger.error(f"Error getting venue prediction for {venue_id}: {e}")
@@ -11,13 +11,17 @@ Single service that consolidates ALL ML prediction functionality:
 Replaces the entire features/ml/ directory structure.
 """
 
+import hashlib
+import json
 import logging
 import os
-import json
 import pickle
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 import pandas as pd
 import numpy as np
 
@@ -96,6 +100,7 @@ class PredictionResult:
     features_used: List[str]
     model_version: str
     generated_at: datetime
+    shadow: Optional["PredictionResult"] = None  # same venue, shadow model
 
 
 @dataclass
@@ -112,6 +117,117 @@ class TrainingResult:
     error_message: Optional[str] = None
 
 
+@dataclass
+class FeaturePipeline:
+    """
+    Fitted venue feature transform, saved next to the model it was fit for.
+
+    Training and serving both call transform(), so a model always sees the
+    category vocabulary, fill values and column order it was trained with.
+    Category codes are 1-based positions in `categories`; unseen is 0.
+    """
+
+    columns: List[str]
+    categories: List[str] = field(default_factory=list)
+    defaults: Dict[str, float] = field(default_factory=dict)
+
+    # Fill values before fitting, and for columns fit() leaves alone
+    DEFAULTS = {
+        "avg_rating": 3.0,
+        "venue_age_days": 30.0,
+        "avg_event_attendance": 100.0,
+    }
+
+    @classmethod
+    def fit(cls, venues: pd.DataFrame, columns: List[str]) -> "FeaturePipeline":
+        """Learn the category vocabulary and median fills from training rows"""
+        pipeline = cls(columns=list(columns), defaults=dict(cls.DEFAULTS))
+        if "category" in venues.columns:
+            pipeline.categories = sorted(
+                str(value) for value in venues["category"].dropna().unique()
+            )
+
+        raw = pipeline._raw_features(venues)
+        for name in ("avg_rating", "venue_age_days", "avg_event_attendance"):
+            known = raw[name].dropna()
+            if not known.empty:
+                pipeline.defaults[name] = float(known.median())
+        return pipeline
+
+    def transform(self, venues: pd.DataFrame) -> np.ndarray:
+        """Float32 matrix with one row per venue and one column per feature"""
+        raw = self._raw_features(venues)
+        matrix = np.empty((len(venues), len(self.columns)), dtype=np.float32)
+        for i, name in enumerate(self.columns):
+            default = self.defaults.get(name, 0.0)
+            if name in raw:
+                matrix[:, i] = raw[name].fillna(default).to_numpy(dtype=np.float32)
+            else:
+                matrix[:, i] = default
+        return matrix
+
+    def _raw_features(self, venues: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Feature columns before fills; NaN marks a missing value"""
+
+        def numeric(name: str) -> pd.Series:
+            if name in venues.columns:
+                return pd.to_numeric(venues[name], errors="coerce")
+            return pd.Series(np.nan, index=venues.index, dtype=float)
+
+        category = (
+            venues["category"]
+            if "category" in venues.columns
+            else pd.Series(None, index=venues.index, dtype=object)
+        )
+        lat = numeric("lat").fillna(0.0)
+        lng = numeric("lng").fillna(0.0)
+        created_at = (
+            pd.to_datetime(venues["created_at"], errors="coerce")
+            if "created_at" in venues.columns
+            else pd.Series(pd.NaT, index=venues.index)
+        )
+
+        raw = {
+            "venue_category_encoded": pd.Series(
+                pd.Index(self.categories).get_indexer(category) + 1,
+                index=venues.index,
+                dtype=float,
+            ),
+            # A 0.0 rating counts as missing, like None
+            "avg_rating": numeric("avg_rating").replace(0.0, np.nan),
+            "has_location": ((lat != 0) & (lng != 0)).astype(float),
+            "venue_age_days": (datetime.now() - created_at).dt.days.astype(float),
+        }
+        for name in self.columns:
+            if name not in raw:
+                raw[name] = numeric(name)
+        return raw
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(asdict(self), f)
+
+    @classmethod
+    def load(cls, path: str) -> "FeaturePipeline":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+@dataclass
+class LoadedModel:
+    """A deserialized model kept resident, with the file state it was read from"""
+
+    model: Any
+    version: str
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    loaded_at: datetime
+    load_seconds: float
+    pipeline: FeaturePipeline
+
+
 @dataclass
 class HeatmapPrediction:
     """Prediction data for heatmap visualization"""
@@ -124,6 +240,48 @@ class HeatmapPrediction:
     area_type: str  # 'high_density', 'medium_density', 'low_density'
 
 
+class ModelWatcher:
+    """
+    One daemon thread that keeps every live PredictionService on the current
+    model. Services are held weakly, so watching never keeps one alive, and
+    the registry is read once per tick for all of them.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._services = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, service: "PredictionService"):
+        with self._lock:
+            self._services.add(service)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ppm-model-reload", daemon=True
+                )
+                self._thread.start()
+
+    def watching(self) -> int:
+        return len(self._services)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Model watch failed: {e}")
+
+    def poll(self):
+        """Reload every watched service; references end with this call"""
+        services = list(self._services)
+        if services:
+            production = services[0]._production_model()
+            for service in services:
+                service._reload_model(production)
+
+
 class PredictionService:
     """
     Unified prediction service that handles ALL ML operations.
@@ -142,16 +300,42 @@ class PredictionService:
         self.db = get_database()
         self.quality_validator = get_quality_validator()
 
-        # Model configuration
+        # Model configuration; the registry's production version wins
         self.model_dir = "models"
         self.current_model_version = "v1.0"
         self.model_path = os.path.join(
             self.model_dir, f"ppm_model_{self.current_model_version}.pkl"
         )
+        self.lightgbm_params = {
+            "objective": "binary",
+            "metric": "auc",
+            "learning_rate": 0.05,
+            "num_leaves": 31,
+            "feature_fraction": 0.8,
+            "bagging_fraction": 0.8,
+            "bagging_freq": 5,
+            "verbose": -1,
+        }
 
         # Ensure model directory exists
         os.makedirs(self.model_dir, exist_ok=True)
 
+        # Resident model, replaced whole so readers never take the lock
+        self._model_cache: Optional[LoadedModel] = None
+        self._model_lock = threading.Lock()
+        self._model_stats = {"hits": 0, "misses": 0, "reloads": 0}
+        self._model_reload_interval = float(os.getenv("MODEL_RELOAD_SECONDS", "30"))
+        self._rejected_model_file: Optional[Tuple[str, int, int]] = None
+
+        # Recently served versions stay loaded for shadow scoring and rollback
+        self._loaded_models: Dict[str, LoadedModel] = {}
+        self._max_loaded_models = int(os.getenv("MODEL_VERSIONS_RESIDENT", "3"))
+
+        production = self._production_model()
+        if production and production.get("model_file_path"):
+            self.current_model_version = production["version"]
+            self.model_path = production["model_file_path"]
+
         # Feature configuration
         self.feature_columns = [
             "venue_category_encoded",
@@ -163,8 +347,12 @@ class PredictionService:
             "psychographic_adventurous",
             "has_location",
             "venue_age_days",
+            "event_count_last_7d",
             "event_count_last_30d",
+            "event_count_last_90d",
+            "upcoming_event_count",
             "avg_event_attendance",
+            "prime_time_share",
         ]
 
         # Psychographic weights for different venue types
@@ -210,12 +398,18 @@ class PredictionService:
 
     # ========== PUBLIC API METHODS ==========
 
-    def train_model(self, retrain: bool = False) -> TrainingResult:
+    def train_model(
+        self, retrain: bool = False, promote: bool = True
+    ) -> TrainingResult:
         """
         Train the ML model for venue attendance prediction.
 
+        Every trained artifact is saved under a new version and registered in
+        ml_model_versions with its metrics, hyperparameters and features.
+
         Args:
             retrain: Whether to retrain even if a model exists
+            promote: Whether to make the new version the production model
 
         Returns:
             TrainingResult with training statistics
@@ -252,7 +446,7 @@ class PredictionService:
                 )
 
             # Preprocess data
-            X, y = self._preprocess_training_data(training_data)
+            X, y, pipeline = self._preprocess_training_data(training_data)
 
             # Train model
             if ML_LIBS_AVAILABLE:
@@ -260,18 +454,31 @@ class PredictionService:
             else:
                 model, validation_score = self._train_mock_model(X, y)
 
-            # Save model
-            self._save_model(model)
+            # Save model under a new version and register it
+            version = f"v{start_time:%Y%m%d.%H%M%S.%f}"
+            loaded = self._save_model(model, version, pipeline)
+            if loaded is None:
+                raise RuntimeError(f"Could not save model {version}")
 
             duration = (datetime.now() - start_time).total_seconds()
+            registered = self._register_model(
+                loaded, validation_score, len(training_data), duration
+            )
+            if not registered.success:
+                raise RuntimeError(registered.message)
+
+            if promote:
+                promoted = self.promote(version)
+                if not promoted.success:
+                    raise RuntimeError(promoted.message)
 
             result = TrainingResult(
                 success=True,
-                model_version=self.current_model_version,
+                model_version=version,
                 validation_score=validation_score,
                 training_samples=len(training_data),
                 features_used=self.feature_columns,
-                model_path=self.model_path,
+                model_path=loaded.path,
                 training_duration=duration,
             )
 
@@ -294,12 +501,15 @@ class PredictionService:
                 error_message=str(e),
             )
 
-    def predict_venue_attendance(self, venue_id: str) -> Optional[PredictionResult]:
+    def predict_venue_attendance(
+        self, venue_id: str, store: bool = True
+    ) -> Optional[PredictionResult]:
         """
         Predict attendance probability for a specific venue.
 
         Args:
             venue_id: ID of the venue to predict for
+            store: Whether to store the prediction immediately
 
         Returns:
             PredictionResult or None if prediction fails
@@ -312,19 +522,22 @@ class PredictionService:
                 return None
 
             # Load model
-            model = self._load_model()
-            if not model:
+            loaded = self._load_resident_model()
+            if not loaded:
                 self.logger.warning("No trained model available")
                 return None
 
             # Make prediction
-            features = self._prepare_prediction_features(venue_data)
-            prediction_value, confidence_score = self._make_prediction(model, features)
+            features = self._prepare_prediction_features(venue_data, loaded.pipeline)
+            prediction_value, confidence_score = self._make_prediction(
+                loaded.model, features
+            )
 
             # Store prediction in database
-            self._store_prediction(
-                venue_id, "attendance", prediction_value, confidence_score
-            )
+            if store:
+                self._store_prediction(
+                    venue_id, "attendance", prediction_value, confidence_score
+                )
 
             return PredictionResult(
                 venue_id=venue_id,
@@ -333,7 +546,7 @@ class PredictionService:
                 prediction_value=prediction_value,
                 confidence_score=confidence_score,
                 features_used=self.feature_columns,
-                model_version=self.current_model_version,
+                model_version=loaded.version,
                 generated_at=datetime.now(),
             )
 
@@ -341,6 +554,56 @@ class PredictionService:
             self.logger.error(f"Venue prediction failed for {venue_id}: {e}")
             return None
 
+    def predict_venues_batch(
+        self,
+        venue_ids: Optional[List[str]] = None,
+        store: bool = True,
+        shadow_version: Optional[str] = None,
+    ) -> List[PredictionResult]:
+        """
+        Predict attendance for many venues at once.
+
+        Features come from one venue query (every venue when venue_ids is
+        None), the model scores them as a single float32 matrix and the
+        results are stored with one bulk write. A shadow version scores the
+        same matrix; its results hang off each prediction's `shadow` and are
+        stored as "<type>_shadow" rows so production rows stay untouched.
+
+        Args:
+            venue_ids: IDs of the venues to predict for, or None for all
+            store: Whether to store the predictions
+            shadow_version: Registered version to score alongside production
+
+        Returns:
+            PredictionResult per venue found, in venue_id order
+        """
+        try:
+            loaded = self._load_resident_model()
+            if not loaded:
+                self.logger.warning("No trained model available")
+                return []
+            shadow = self._get_loaded_model(shadow_version) if shadow_version else None
+
+            if venue_ids is None:
+                venues = self.db.venues_frame()
+            else:
+                # Stay under SQLite's bound parameter limit
+                ids = list(venue_ids)
+                frames = [
+                    self.db.venues_frame({"venue_id": ids[i : i + 10000]})
+                    for i in range(0, len(ids), 10000)
+                ]
+                venues = pd.concat(frames, ignore_index=True) if frames else None
+
+            predictions = self._predict_frame(loaded, venues, shadow)
+            if store:
+                self._store_predictions(predictions)
+            return predictions
+
+        except Exception as e:
+            self.logger.error(f"Batch venue prediction failed: {e}")
+            return []
+
     def predict_event_attendance(self, event_id: str) -> Optional[PredictionResult]:
         """
         Predict attendance probability for a specific event.
@@ -411,15 +674,19 @@ class PredictionService:
 
             # Get venues with location data
             venues = self._get_venues_for_heatmap(bounds)
-            if not venues:
+            if venues.empty:
                 self.logger.warning("No venues found for heatmap generation")
                 return []
 
-            # Generate predictions for each venue
+            # Score every venue in one batch, storing them in one bulk write
+            loaded = self._load_resident_model()
+            if not loaded:
+                self.logger.warning("No trained model available")
+            venue_predictions = self._predict_frame(loaded, venues) if loaded else []
+
             heatmap_predictions = []
-            for venue in venues:
-                prediction = self.predict_venue_attendance(venue["venue_id"])
-                if prediction and venue.get("lat") and venue.get("lng"):
+            for venue, prediction in zip(venues.to_dict("records"), venue_predictions):
+                if venue.get("lat") and venue.get("lng"):
                     heatmap_predictions.append(
                         HeatmapPrediction(
                             lat=venue["lat"],
@@ -431,6 +698,8 @@ class PredictionService:
                         )
                     )
 
+            self._store_predictions(venue_predictions)
+
             # Add grid-based predictions for areas without venues
             grid_predictions = self._generate_grid_predictions(bounds, venues)
             heatmap_predictions.extend(grid_predictions)
@@ -493,6 +762,33 @@ class PredictionService:
             self.logger.error(f"Failed to get prediction summary: {e}")
             return {"error": str(e)}
 
+    def promote(self, version: str) -> OperationResult:
+        """
+        Make a registered model version the production model.
+
+        The artifact is loaded before the registry flag flips, so a missing or
+        corrupt file never reaches production. Versions served recently are
+        still in memory, which makes a rollback one UPDATE and a swap.
+        """
+        try:
+            loaded = self._get_loaded_model(version)
+        except Exception as e:
+            return OperationResult(
+                success=False,
+                error=str(e),
+                message=f"Cannot load model version {version}: {e}",
+            )
+
+        result = self.db.promote_model_version(version)
+        if result.success:
+            self._activate_model(loaded)
+            self.logger.info(f"Model {version} is now in production")
+        return result
+
+    def get_model_versions(self) -> List[Dict]:
+        """Registered model versions, newest first"""
+        return self.db.get_model_versions()
+
     # ========== PRIVATE IMPLEMENTATION METHODS ==========
 
     def _model_exists(self) -> bool:
@@ -512,13 +808,11 @@ class PredictionService:
     def _load_training_data(self) -> pd.DataFrame:
         """Load training data from database"""
         try:
-            # Get venues with sufficient data for training
-            venues = self.db.get_venues()
-            if not venues:
+            # Get venues with sufficient data for training, already columnar
+            df = self.db.venues_frame()
+            if df.empty:
                 return pd.DataFrame()
-
-            # Convert to DataFrame and create features
-            df = pd.DataFrame(venues)
+            df = self._with_event_features(df)
 
             # Create synthetic labels for demonstration
             # In a real system, these would be actual attendance/engagement metrics
@@ -532,101 +826,45 @@ class PredictionService:
 
     def _generate_synthetic_labels(self, df: pd.DataFrame) -> pd.Series:
         """Generate synthetic training labels based on venue characteristics"""
-        labels = []
-
-        for _, venue in df.iterrows():
-            # Base probability from rating
-            base_prob = (venue.get("avg_rating", 3.0) - 1) / 4  # Scale 1-5 to 0-1
-
-            # Adjust based on category
-            category_boost = {
-                "restaurant": 0.1,
-                "bar": 0.2,
-                "nightclub": 0.3,
-                "theater": 0.0,
-                "museum": -0.1,
-                "sports_venue": 0.2,
-            }.get(venue.get("category", ""), 0.0)
-
-            # Adjust based on location (has coordinates)
-            location_boost = 0.1 if venue.get("lat") and venue.get("lng") else -0.2
+        # Base probability from rating
+        base_prob = (df["avg_rating"].fillna(3.0) - 1) / 4  # Scale 1-5 to 0-1
+
+        # Adjust based on category
+        category_boost = (
+            df["category"]
+            .map(
+                {
+                    "restaurant": 0.1,
+                    "bar": 0.2,
+                    "nightclub": 0.3,
+                    "theater": 0.0,
+                    "museum": -0.1,
+                    "sports_venue": 0.2,
+                }
+            )
+            .fillna(0.0)
+        )
 
-            # Add some randomness
-            noise = np.random.normal(0, 0.1)
+        # Adjust based on location (has coordinates)
+        location_boost = np.where(df["lat"].notna() & df["lng"].notna(), 0.1, -0.2)
 
-            final_prob = np.clip(
-                base_prob + category_boost + location_boost + noise, 0, 1
-            )
-            labels.append(1 if final_prob > 0.5 else 0)
+        # Add some randomness
+        noise = np.random.normal(0, 0.1, len(df))
 
-        return pd.Series(labels)
+        final_prob = np.clip(base_prob + category_boost + location_boost + noise, 0, 1)
+        return (final_prob > 0.5).astype(int)
 
     def _preprocess_training_data(
         self, df: pd.DataFrame
-    ) -> Tuple[pd.DataFrame, pd.Series]:
-        """Preprocess training data for model training"""
-        # Create feature columns
-        features = pd.DataFrame()
-
-        # Encode categorical variables
-        if "category" in df.columns:
-            le = LabelEncoder()
-            features["venue_category_encoded"] = le.fit_transform(
-                df["category"].fillna("unknown")
-            )
-        else:
-            features["venue_category_encoded"] = 0
-
-        # Numerical features
-        features["avg_rating"] = df.get("avg_rating", 3.0).fillna(3.0)
-        features["has_location"] = (
-            (df.get("lat").notna()) & (df.get("lng").notna())
-        ).astype(int)
-
-        # Psychographic features
-        psychographic_data = df.get("psychographic_relevance", {})
-        if isinstance(
-            psychographic_data.iloc[0] if len(psychographic_data) > 0 else {}, str
-        ):
-            # Parse JSON strings
-            psychographic_data = psychographic_data.apply(
-                lambda x: json.loads(x) if isinstance(x, str) and x else {}
-            )
-
-        for psych_type in [
-            "career_driven",
-            "competent",
-            "fun",
-            "social",
-            "adventurous",
-        ]:
-            features[f"psychographic_{psych_type}"] = psychographic_data.apply(
-                lambda x: x.get(psych_type, 0.0) if isinstance(x, dict) else 0.0
-            )
-
-        # Temporal features
-        if "created_at" in df.columns:
-            created_at = pd.to_datetime(df["created_at"])
-            features["venue_age_days"] = (datetime.now() - created_at).dt.days
-        else:
-            features["venue_age_days"] = 30  # Default
-
-        # Mock event-related features
-        features["event_count_last_30d"] = np.random.poisson(5, len(df))
-        features["avg_event_attendance"] = np.random.normal(100, 50, len(df)).clip(
-            0, None
+    ) -> Tuple[pd.DataFrame, pd.Series, FeaturePipeline]:
+        """Fit the feature pipeline and build the training matrix with it"""
+        pipeline = FeaturePipeline.fit(df, self.feature_columns)
+        X = pd.DataFrame(
+            pipeline.transform(df), columns=self.feature_columns, index=df.index
         )
-
-        # Ensure all feature columns exist
-        for col in self.feature_columns:
-            if col not in features.columns:
-                features[col] = 0.0
-
-        # Select only the defined feature columns
-        X = features[self.feature_columns].fillna(0)
         y = df["label"]
 
-        return X, y
+        return X, y, pipeline
 
     def _train_lightgbm_model(self, X: pd.DataFrame, y: pd.Series) -> Tuple[Any, float]:
         """Train LightGBM model with time series cross-validation"""
@@ -642,21 +880,9 @@ class PredictionService:
             dtrain = lgb.Dataset(X_train, label=y_train)
             dval = lgb.Dataset(X_val, label=y_val, reference=dtrain)
 
-            # Model parameters
-            params = {
-                "objective": "binary",
-                "metric": "auc",
-                "learning_rate": 0.05,
-                "num_leaves": 31,
-                "feature_fraction": 0.8,
-                "bagging_fraction": 0.8,
-                "bagging_freq": 5,
-                "verbose": -1,
-            }
-
             # Train model
             model = lgb.train(
-                params,
+                self.lightgbm_params,
                 dtrain,
                 valid_sets=[dval],
                 callbacks=[lgb.early_stopping(50), lgb.log_evaluation(0)],
@@ -688,51 +914,297 @@ class PredictionService:
 
         return mock_model, mock_score
 
-    def _save_model(self, model: Any):
-        """Save trained model to disk"""
+    def _save_model(
+        self, model: Any, version: str, pipeline: FeaturePipeline
+    ) -> Optional[LoadedModel]:
+        """Save a trained model and its feature pipeline as a new version"""
+        path = os.path.join(self.model_dir, f"ppm_model_{version}.pkl")
         try:
+            # Pipeline first: a watcher that sees the model file finds both
+            pipeline.save(self._pipeline_path(path))
+
             if ML_LIBS_AVAILABLE and hasattr(model, "save_model"):
                 # Save LightGBM model
-                model.save_model(self.model_path)
+                model.save_model(path)
             else:
                 # Save using pickle for mock models
-                with open(self.model_path, "wb") as f:
+                with open(path, "wb") as f:
                     pickle.dump(model, f)
 
-            self.logger.info(f"Model saved to {self.model_path}")
+            self.logger.info(f"Model saved to {path}")
+
+            # The trained object is already in memory; only fingerprint the file
+            loaded = self._read_model(path, version, model=model, pipeline=pipeline)
+            self._remember_model(loaded)
+            return loaded
 
         except Exception as e:
             self.logger.error(f"Failed to save model: {e}")
+            return None
 
-    def _load_model(self) -> Optional[Any]:
-        """Load trained model from disk"""
+    def _register_model(
+        self,
+        loaded: LoadedModel,
+        validation_score: float,
+        training_samples: int,
+        duration: float,
+    ) -> OperationResult:
+        """Record a saved model and how it was trained in the registry"""
+        model = loaded.model
+        is_lightgbm = hasattr(model, "feature_importance")
+        return self.db.register_model_version(
+            {
+                "version": loaded.version,
+                "model_type": "lightgbm" if is_lightgbm else "mock",
+                "training_samples": training_samples,
+                "training_date": datetime.now(),
+                "average_precision": float(validation_score),
+                "feature_list": self.feature_columns,
+                "feature_importance": (
+                    dict(
+                        zip(
+                            self.feature_columns,
+                            model.feature_importance("gain").tolist(),
+                        )
+                    )
+                    if is_lightgbm
+                    else None
+                ),
+                "hyperparameters": self.lightgbm_params if is_lightgbm else None,
+                "model_file_path": loaded.path,
+                "model_size_mb": loaded.size / (1024 * 1024),
+                "model_sha256": loaded.sha256,
+                "training_duration": duration,
+            }
+        )
+
+    def _production_model(self) -> Optional[Dict]:
+        """The registry's production row, or None if the registry is unusable"""
         try:
-            if not self._model_exists():
-                return None
+            return self.db.get_production_model()
+        except Exception as e:
+            self.logger.warning(f"Model registry unavailable: {e}")
+            return None
 
-            if ML_LIBS_AVAILABLE:
-                try:
-                    # Try loading as LightGBM model
-                    model = lgb.Booster(model_file=self.model_path)
-                    return model
-                except:
-                    # Fallback to pickle
-                    with open(self.model_path, "rb") as f:
-                        return pickle.load(f)
-            else:
-                # Load pickle model
-                with open(self.model_path, "rb") as f:
-                    return pickle.load(f)
+    def _get_loaded_model(self, version: str) -> LoadedModel:
+        """A registered version, loaded from disk unless already resident"""
+        loaded = self._loaded_models.get(version)
+        if loaded is not None:
+            return loaded
+
+        rows = self.db.get_model_versions(version=version)
+        if not rows or not rows[0].get("model_file_path"):
+            raise ValueError(f"Model version {version} is not registered")
+
+        loaded = self._read_model(
+            rows[0]["model_file_path"], version, expected=rows[0].get("model_sha256")
+        )
+        self._remember_model(loaded)
+        return loaded
+
+    def _remember_model(self, loaded: LoadedModel):
+        """Keep a loaded version resident, dropping the least recently added"""
+        with self._model_lock:
+            self._loaded_models.pop(loaded.version, None)
+            self._loaded_models[loaded.version] = loaded
+            current = self.current_model_version
+            for version in list(self._loaded_models):
+                if len(self._loaded_models) <= self._max_loaded_models:
+                    break
+                if version not in (current, loaded.version):
+                    del self._loaded_models[version]
+
+    def _activate_model(self, loaded: LoadedModel):
+        """Serve `loaded` from now on; readers pick it up on their next call"""
+        with self._model_lock:
+            self.current_model_version = loaded.version
+            self.model_path = loaded.path
+            self._model_cache = loaded
+        self._start_model_watcher()
+
+    def _load_model(self) -> Optional[Any]:
+        """Return the resident model, reading it from disk only on first use"""
+        loaded = self._load_resident_model()
+        return loaded.model if loaded else None
+
+    def _load_resident_model(self) -> Optional[LoadedModel]:
+        """The resident model with its feature pipeline, loaded on first use"""
+        cached = self._model_cache
+        if cached is not None and cached.path == self.model_path:
+            self._model_stats["hits"] += 1
+            return cached
+
+        self._model_stats["misses"] += 1
+        try:
+            with self._model_lock:
+                cached = self._model_cache
+                if cached is None or cached.path != self.model_path:
+                    if not self._model_exists():
+                        return None
+                    cached = self._read_model(
+                        self.model_path, self.current_model_version
+                    )
+                    self._model_cache = cached
+                    self._loaded_models[cached.version] = cached
+                self._start_model_watcher()
+            return cached
 
         except Exception as e:
             self.logger.error(f"Failed to load model: {e}")
             return None
 
+    def reload_model(self) -> bool:
+        """
+        Follow the registry's production version, or re-read the model file
+        if it changed on disk since it was loaded.
+
+        The new model is deserialized off to the side and swapped in with one
+        assignment, so predictions running meanwhile keep using the old one.
+        A file that fails to load leaves the resident model in place.
+
+        Returns:
+            True if a new model was swapped in
+        """
+        return self._reload_model(self._production_model())
+
+    def _reload_model(self, production: Optional[Dict]) -> bool:
+        """reload_model against an already-read registry production row"""
+        path = self.model_path
+        cached = self._model_cache
+        if cached is not None and cached.path != path:
+            cached = None
+        try:
+            if production and production["version"] != self.current_model_version:
+                self._activate_model(self._get_loaded_model(production["version"]))
+                self._model_stats["reloads"] += 1
+                self.logger.info(
+                    f"Switched to production model {production['version']}"
+                )
+                return True
+
+            stat = os.stat(path)
+            state = (path, stat.st_mtime_ns, stat.st_size)
+            if state == self._rejected_model_file or (
+                cached and (cached.mtime_ns, cached.size) == state[1:]
+            ):
+                return False
+
+            # A registered version must stay the bytes the registry describes
+            version = self.current_model_version
+            rows = self.db.get_model_versions(version=version)
+            expected = rows[0].get("model_sha256") if rows else None
+            try:
+                loaded = self._read_model(path, version, cached, expected=expected)
+            except Exception:
+                # Retried once the file changes again, not on every poll
+                self._rejected_model_file = state
+                raise
+            with self._model_lock:
+                self._model_cache = loaded
+                self._loaded_models[loaded.version] = loaded
+                self._model_stats["reloads"] += 1
+
+            self.logger.info(
+                f"Reloaded model {loaded.version} in {loaded.load_seconds:.3f}s"
+            )
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Model reload failed, keeping current model: {e}")
+            return False
+
+    def get_model_cache_stats(self) -> Dict:
+        """Resident model identity, load time and cache hit counters"""
+        cached = self._model_cache
+        return {
+            **self._model_stats,
+            "version": cached.version if cached else None,
+            "path": cached.path if cached else None,
+            "sha256": cached.sha256 if cached else None,
+            "loaded_at": cached.loaded_at if cached else None,
+            "load_seconds": cached.load_seconds if cached else None,
+        }
+
+    def _read_model(
+        self,
+        path: str,
+        version: str,
+        previous: Optional[LoadedModel] = None,
+        model: Any = None,
+        pipeline: Optional[FeaturePipeline] = None,
+        expected: Optional[str] = None,
+    ) -> LoadedModel:
+        """
+        Read and fingerprint a model file, deserializing only new content.
+
+        Raises ValueError, before deserializing, if the file's sha256 is not
+        the `expected` one.
+        """
+        start = time.perf_counter()
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if expected is not None and sha256 != expected:
+            raise ValueError(f"Model file for {version} does not match the registry")
+
+        if model is None:
+            if previous is not None and previous.sha256 == sha256:
+                model = previous.model  # touched, not changed
+            else:
+                model = self._deserialize_model(data)
+
+        if pipeline is None:
+            pipeline_path = self._pipeline_path(path)
+            if os.path.exists(pipeline_path):
+                pipeline = FeaturePipeline.load(pipeline_path)
+            else:
+                # Models saved before pipelines were persisted
+                columns = (
+                    list(model.feature_name())
+                    if hasattr(model, "feature_name")
+                    else self.feature_columns
+                )
+                pipeline = FeaturePipeline(
+                    columns, defaults=dict(FeaturePipeline.DEFAULTS)
+                )
+
+        return LoadedModel(
+            model=model,
+            version=version,
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            sha256=sha256,
+            loaded_at=datetime.now(),
+            load_seconds=time.perf_counter() - start,
+            pipeline=pipeline,
+        )
+
+    @staticmethod
+    def _pipeline_path(model_path: str) -> str:
+        return os.path.splitext(model_path)[0] + ".features.json"
+
+    @staticmethod
+    def _deserialize_model(data: bytes) -> Any:
+        if ML_LIBS_AVAILABLE:
+            try:
+                # Try loading as LightGBM model
+                return lgb.Booster(model_str=data.decode())
+            except Exception:
+                pass
+        # Fallback to pickle
+        return pickle.loads(data)
+
+    def _start_model_watcher(self):
+        """Have the shared watcher pick up new versions off the request path"""
+        if self._model_reload_interval > 0:
+            get_model_watcher().watch(self)
+
     def _get_venue_features(self, venue_id: str) -> Optional[Dict]:
         """Get venue data for prediction"""
         try:
-            venues = self.db.get_venues({"venue_id": venue_id})
-            return venues[0] if venues else None
+            return self.db.get_venue(venue_id)
         except Exception as e:
             self.logger.error(f"Failed to get venue features for {venue_id}: {e}")
             return None
@@ -740,84 +1212,116 @@ class PredictionService:
     def _get_event_features(self, event_id: str) -> Optional[Dict]:
         """Get event data for prediction"""
         try:
-            events = self.db.get_events({"event_id": event_id})
-            return events[0] if events else None
+            return self.db.get_event(event_id)
         except Exception as e:
             self.logger.error(f"Failed to get event features for {event_id}: {e}")
             return None
 
-    def _prepare_prediction_features(self, venue_data: Dict) -> np.ndarray:
+    def _prepare_prediction_features(
+        self, venue_data: Dict, pipeline: Optional[FeaturePipeline] = None
+    ) -> np.ndarray:
         """Prepare features for prediction"""
-        features = {}
-
-        # Encode category
-        category = venue_data.get("category", "unknown")
-        features["venue_category_encoded"] = hash(category) % 10  # Simple encoding
-
-        # Numerical features
-        features["avg_rating"] = venue_data.get("avg_rating", 3.0) or 3.0
-        features["has_location"] = (
-            1 if (venue_data.get("lat") and venue_data.get("lng")) else 0
-        )
-
-        # Psychographic features
-        psychographic_data = venue_data.get("psychographic_relevance", {})
-        if isinstance(psychographic_data, str):
-            try:
-                psychographic_data = json.loads(psychographic_data)
-            except:
-                psychographic_data = {}
-
-        for psych_type in [
-            "career_driven",
-            "competent",
-            "fun",
-            "social",
-            "adventurous",
-        ]:
-            features[f"psychographic_{psych_type}"] = psychographic_data.get(
-                psych_type, 0.0
+        venues = self._with_event_features(pd.DataFrame([venue_data]))
+        return self._feature_matrix(venues, pipeline)
+
+    def _feature_matrix(
+        self, venues: pd.DataFrame, pipeline: Optional[FeaturePipeline] = None
+    ) -> np.ndarray:
+        """Float32 feature matrix for venue rows, from the serving pipeline"""
+        if pipeline is None:
+            loaded = self._load_resident_model()
+            pipeline = (
+                loaded.pipeline
+                if loaded
+                else FeaturePipeline(
+                    self.feature_columns, defaults=dict(FeaturePipeline.DEFAULTS)
+                )
             )
+        return pipeline.transform(venues)
 
-        # Temporal features
-        if venue_data.get("created_at"):
-            try:
-                created_at = pd.to_datetime(venue_data["created_at"])
-                features["venue_age_days"] = (datetime.now() - created_at).days
-            except:
-                features["venue_age_days"] = 30
-        else:
-            features["venue_age_days"] = 30
+    def _with_event_features(self, venues: pd.DataFrame) -> pd.DataFrame:
+        """Join the per-venue event aggregates onto venue rows"""
+        # Large batches read every venue's aggregates rather than bind each id
+        venue_ids = None if len(venues) > 10000 else venues["venue_id"].tolist()
+        events = self.db.venue_event_features(venue_ids)
+        merged = venues.merge(events, on="venue_id", how="left")
 
-        # Mock event features
-        features["event_count_last_30d"] = 5  # Default
-        features["avg_event_attendance"] = 100  # Default
-
-        # Ensure all features are present
-        feature_vector = []
-        for col in self.feature_columns:
-            feature_vector.append(features.get(col, 0.0))
-
-        return np.array(feature_vector).reshape(1, -1)
+        # No events means zero counts; attendance stays unknown
+        counts = [column for column in events.columns if "count" in column]
+        merged[counts] = merged[counts].fillna(0)
+        return merged
 
     def _make_prediction(self, model: Any, features: np.ndarray) -> Tuple[float, float]:
         """Make prediction using trained model"""
+        predictions, confidences = self._make_predictions(model, features)
+        return float(predictions[0]), float(confidences[0])
+
+    def _make_predictions(
+        self, model: Any, features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every row of a feature matrix with one model call"""
+        n = len(features)
         try:
             if ML_LIBS_AVAILABLE and hasattr(model, "predict"):
                 # LightGBM prediction
-                prediction = model.predict(features)[0]
-                confidence = min(0.8 + np.random.random() * 0.2, 1.0)  # Mock confidence
+                predictions = np.asarray(model.predict(features), dtype=float)
+                confidences = np.minimum(0.8 + np.random.random(n) * 0.2, 1.0)
             else:
                 # Mock model prediction
-                feature_sum = np.sum(features)
-                prediction = 1 / (1 + np.exp(-feature_sum / 10))  # Sigmoid
-                confidence = 0.6 + np.random.random() * 0.3
+                feature_sums = features.sum(axis=1, dtype=float)
+                predictions = 1 / (1 + np.exp(-feature_sums / 10))  # Sigmoid
+                confidences = 0.6 + np.random.random(n) * 0.3
 
-            return float(prediction), float(confidence)
+            return predictions, confidences
 
         except Exception as e:
             self.logger.error(f"Prediction failed: {e}")
-            return 0.5, 0.5  # Default values
+            return np.full(n, 0.5), np.full(n, 0.5)  # Default values
+
+    def _predict_frame(
+        self,
+        loaded: LoadedModel,
+        venues: Optional[pd.DataFrame],
+        shadow: Optional[LoadedModel] = None,
+    ) -> List[PredictionResult]:
+        """Attendance predictions for venue rows, scored as one matrix"""
+        if venues is None or venues.empty:
+            return []
+
+        venues = self._with_event_features(venues)
+        features = loaded.pipeline.transform(venues)
+        generated_at = datetime.now()
+
+        def score(model: LoadedModel, prediction_type: str):
+            matrix = (
+                features
+                if model.pipeline == loaded.pipeline
+                else model.pipeline.transform(venues)
+            )
+            predictions, confidences = self._make_predictions(model.model, matrix)
+            return [
+                PredictionResult(
+                    venue_id=venue_id,
+                    venue_name=venue_name or "Unknown",
+                    prediction_type=prediction_type,
+                    prediction_value=float(prediction),
+                    confidence_score=float(confidence),
+                    features_used=model.pipeline.columns,
+                    model_version=model.version,
+                    generated_at=generated_at,
+                )
+                for venue_id, venue_name, prediction, confidence in zip(
+                    venues["venue_id"], venues["name"], predictions, confidences
+                )
+            ]
+
+        results = score(loaded, "attendance")
+        if shadow is not None:
+            for result, shadow_result in zip(
+                results, score(shadow, "attendance_shadow")
+            ):
+                result.shadow = shadow_result
+        return results
 
     def _store_prediction(
         self,
@@ -844,32 +1348,49 @@ class PredictionService:
         except Exception as e:
             self.logger.error(f"Error storing prediction: {e}")
 
-    def _get_venues_for_heatmap(self, bounds: Dict) -> List[Dict]:
+    def _store_predictions(self, predictions: List[PredictionResult]):
+        """Store many predictions with a single bulk write"""
+        if not predictions:
+            return
+
+        try:
+            result = self.db.upsert_predictions_bulk(
+                [
+                    {
+                        "venue_id": prediction.venue_id,
+                        "prediction_type": prediction.prediction_type,
+                        "prediction_value": prediction.prediction_value,
+                        "confidence_score": prediction.confidence_score,
+                        "model_version": prediction.model_version,
+                        "features_used": prediction.features_used,
+                    }
+                    for prediction in predictions
+                    + [p.shadow for p in predictions if p.shadow is not None]
+                ]
+            )
+            if result.data.failed:
+                self.logger.warning(
+                    f"Failed to store {result.data.failed} predictions: "
+                    f"{list(result.data.errors.values())[:3]}"
+                )
+            if not result.success:
+                self.logger.warning(f"Failed to store predictions: {result.message}")
+
+        except Exception as e:
+            self.logger.error(f"Error storing predictions: {e}")
+
+    def _get_venues_for_heatmap(self, bounds: Dict) -> pd.DataFrame:
         """Get venues within geographic bounds for heatmap"""
         try:
-            # Get venues with location data
-            venues = self.db.get_venues({"has_location": True})
-
-            # Filter by bounds
-            filtered_venues = []
-            for venue in venues:
-                lat, lng = venue.get("lat"), venue.get("lng")
-                if (
-                    lat
-                    and lng
-                    and bounds["min_lat"] <= lat <= bounds["max_lat"]
-                    and bounds["min_lng"] <= lng <= bounds["max_lng"]
-                ):
-                    filtered_venues.append(venue)
-
-            return filtered_venues
+            # Bounds are pushed down into the venue query
+            return self.db.venues_frame({"has_location": True, "bounds": bounds})
 
         except Exception as e:
             self.logger.error(f"Failed to get venues for heatmap: {e}")
-            return []
+            return pd.DataFrame()
 
     def _generate_grid_predictions(
-        self, bounds: Dict, existing_venues: List[Dict]
+        self, bounds: Dict, existing_venues: pd.DataFrame
     ) -> List[HeatmapPrediction]:
         """Generate grid-based predictions for areas without venues"""
         grid_predictions = []
@@ -898,47 +1419,44 @@ class PredictionService:
                 return []
 
             # Filter venues to only those with valid coordinates
-            valid_venues = []
-            if existing_venues:
-                for venue in existing_venues:
-                    lat, lng = venue.get("lat"), venue.get("lng")
-                    if (
-                        lat is not None
-                        and lng is not None
-                        and isinstance(lat, (int, float))
-                        and isinstance(lng, (int, float))
-                    ):
-                        valid_venues.append(venue)
+            valid_venues = existing_venues
+            if not valid_venues.empty:
+                valid_venues = valid_venues[
+                    valid_venues["lat"].notna() & valid_venues["lng"].notna()
+                ]
 
             self.logger.debug(
-                f"Using {len(valid_venues)} venues with valid coordinates out of {len(existing_venues or [])} total venues"
+                f"Using {len(valid_venues)} venues with valid coordinates out of {len(existing_venues)} total venues"
             )
 
             # Create a grid of points
             lat_step = (max_lat - min_lat) / 20
             lng_step = (max_lng - min_lng) / 20
+            grid_lat, grid_lng = np.meshgrid(
+                min_lat + np.arange(20) * lat_step,
+                min_lng + np.arange(20) * lng_step,
+                indexing="ij",
+            )
 
-            for i in range(20):
-                for j in range(20):
-                    lat = min_lat + i * lat_step
-                    lng = min_lng + j * lng_step
-
-                    # Calculate prediction based on distance to existing venues
-                    prediction_value = self._calculate_grid_prediction(
-                        lat, lng, valid_venues
-                    )
+            # Calculate predictions based on distance to existing venues
+            prediction_values = self._calculate_grid_predictions(
+                grid_lat.ravel(), grid_lng.ravel(), valid_venues
+            )
 
-                    if prediction_value > 0.1:  # Only include meaningful predictions
-                        grid_predictions.append(
-                            HeatmapPrediction(
-                                lat=lat,
-                                lng=lng,
-                                prediction_value=prediction_value,
-                                confidence_score=0.4,  # Lower confidence for grid predictions
-                                venue_count=0,
-                                area_type="grid_prediction",
-                            )
+            for lat, lng, prediction_value in zip(
+                grid_lat.ravel(), grid_lng.ravel(), prediction_values
+            ):
+                if prediction_value > 0.1:  # Only include meaningful predictions
+                    grid_predictions.append(
+                        HeatmapPrediction(
+                            lat=float(lat),
+                            lng=float(lng),
+                            prediction_value=float(prediction_value),
+                            confidence_score=0.4,  # Lower confidence for grid predictions
+                            venue_count=0,
+                            area_type="grid_prediction",
                         )
+                    )
 
             self.logger.debug(f"Generated {len(grid_predictions)} grid predictions")
             return grid_predictions
@@ -947,46 +1465,43 @@ class PredictionService:
             self.logger.error(f"Failed to generate grid predictions: {e}")
             return []
 
-    def _calculate_grid_prediction(
-        self, lat: float, lng: float, venues: List[Dict]
-    ) -> float:
-        """Calculate prediction value for a grid point based on nearby venues"""
-        if not venues:
-            return 0.1  # Base prediction for areas with no venues
-
-        # Calculate distance-weighted prediction
-        total_weight = 0
-        weighted_prediction = 0
-
-        for venue in venues:
-            venue_lat, venue_lng = venue.get("lat"), venue.get("lng")
-
-            # CRITICAL FIX: Check for None values before using in calculations
-            if venue_lat is None or venue_lng is None:
-                continue
-
-            # Additional safety check for valid numeric values
-            if not isinstance(venue_lat, (int, float)) or not isinstance(
-                venue_lng, (int, float)
-            ):
-                continue
+    def _calculate_grid_predictions(
+        self,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        venues: pd.DataFrame,
+        chunk_size: int = 10000,
+    ) -> np.ndarray:
+        """Calculate prediction values for grid points based on nearby venues"""
+        if venues.empty:
+            return np.full(len(lats), 0.1)  # Base prediction for areas with no venues
+
+        venue_lats = venues["lat"].to_numpy(dtype=np.float32)
+        venue_lngs = venues["lng"].to_numpy(dtype=np.float32)
+        # Base prediction for venue (could be enhanced with actual predictions)
+        venue_predictions = (
+            0.5 + (venues["avg_rating"].fillna(3.0).to_numpy(np.float32) - 3.0) * 0.1
+        )
 
+        # Distance-weighted prediction, accumulated over venue chunks so the
+        # grid x venue distance matrix stays bounded
+        weighted_prediction = np.zeros(len(lats))
+        total_weight = np.zeros(len(lats))
+        for start in range(0, len(venues), chunk_size):
+            end = start + chunk_size
             # Simple distance calculation (not geodesic, but sufficient for small areas)
-            distance = ((lat - venue_lat) ** 2 + (lng - venue_lng) ** 2) ** 0.5
+            distance = np.hypot(
+                lats[:, None] - venue_lats[None, start:end],
+                lngs[:, None] - venue_lngs[None, start:end],
+            )
 
             # Weight decreases with distance
             weight = 1 / (1 + distance * 100)  # Scale factor for reasonable weights
 
-            # Base prediction for venue (could be enhanced with actual predictions)
-            venue_prediction = 0.5 + (venue.get("avg_rating", 3.0) - 3.0) * 0.1
+            weighted_prediction += weight @ venue_predictions[start:end]
+            total_weight += weight.sum(axis=1)
 
-            weighted_prediction += venue_prediction * weight
-            total_weight += weight
-
-        if total_weight > 0:
-            return min(weighted_prediction / total_weight, 1.0)
-        else:
-            return 0.1
+        return np.minimum(weighted_prediction / total_weight, 1.0)
 
     def _classify_area_density(self, venue: Dict) -> str:
         """Classify area density based on venue characteristics"""
@@ -1040,6 +1555,10 @@ class PredictionService:
 # Global prediction service instance
 _prediction_service = None
 
+# Shared model watcher, started by the first service that loads a model
+_model_watcher = None
+_model_watcher_lock = threading.Lock()
+
 
 def get_prediction_service() -> PredictionService:
     """Get the global prediction service instance"""
@@ -1047,3 +1566,15 @@ def get_prediction_service() -> PredictionService:
     if _prediction_service is None:
         _prediction_service = PredictionService()
     return _prediction_service
+
+
+def get_model_watcher() -> ModelWatcher:
+    """Get the watcher shared by all prediction services"""
+    global _model_watcher
+    if _model_watcher is None:
+        with _model_watcher_lock:
+            if _model_watcher is None:
+                _model_watcher = ModelWatcher(
+                    float(os.getenv("MODEL_RELOAD_SECONDS", "30"))
+                )
+    return _model_watcher
@@ -424,17 +424,19 @@ class VenueService:
                 if place_id and place_id not in unique_venues:
                     unique_venues[place_id] = venue
 
-            # Process and store venues
-            stored_count = 0
+            # Process venues, then store them in one bulk write
+            processed_venues = []
             for venue_data in unique_venues.values():
                 try:
-                    processed_venue = self._process_google_places_venue(venue_data)
-                    if self._validate_and_store_venue(processed_venue):
-                        stored_count += 1
+                    processed_venues.append(
+                        self._process_google_places_venue(venue_data)
+                    )
                 except Exception as e:
                     self.logger.debug(f"Failed to process venue: {e}")
                     continue
 
+            stored_count = self._store_venues(processed_venues)
+
             duration = (datetime.now() - start_time).total_seconds()
 
             # Update collection status
@@ -534,6 +536,8 @@ class VenueService:
 
         self.logger.info(f"Processing {total_venues} venue sources...")
 
+        scraped_venues = []
+
         for idx, (venue_key, venue_config) in enumerate(self.kc_venues.items(), 1):
             try:
                 self.logger.info(
@@ -581,17 +585,10 @@ class VenueService:
                         source_type="llm_scraper",
                     )
 
-                    # Store venue
-                    if self._validate_and_store_venue(venue_data):
-                        venues_processed += 1
-                        self.logger.info(
-                            f"  ✅ Successfully scraped {venue_config['name']}"
-                        )
-                    else:
-                        venues_failed += 1
-                        self.logger.warning(
-                            f"  ⚠️  Failed to store {venue_config['name']}"
-                        )
+                    scraped_venues.append(venue_data)
+                    self.logger.info(
+                        f"  ✅ Successfully scraped {venue_config['name']}"
+                    )
                 else:
                     venues_failed += 1
                     self.logger.warning(
@@ -606,6 +603,10 @@ class VenueService:
                 self.logger.error(f"  ❌ Error scraping {venue_key}: {e}")
                 continue
 
+        # Store all scraped venues in one bulk write
+        venues_processed = self._store_venues(scraped_venues)
+        venues_failed += len(scraped_venues) - venues_processed
+
         duration = (datetime.now() - start_time).total_seconds()
 
         self.logger.info(
@@ -647,18 +648,7 @@ class VenueService:
             List of venue dictionaries
         """
         try:
-            if filters is None:
-                filters = {}
-
-            # Add bounds filter if specified
-            if filters.get("bounds"):
-                bounds = filters["bounds"]
-                # Database will need to handle this - add to query
-
-            if limit is not None:
-                filters["limit"] = limit
-
-            return self.db.get_venues(filters)
+            return self.db.get_venues(filters, limit=limit)
 
         except Exception as e:
             self.logger.error(f"Failed to get venues: {e}")
@@ -688,8 +678,7 @@ class VenueService:
             Venue dictionary or None if not found
         """
         try:
-            venues = self.db.get_venues({"venue_id": venue_id})
-            return venues[0] if venues else None
+            return self.db.get_venue(venue_id)
         except Exception as e:
             self.logger.error(f"Failed to get venue {venue_id}: {e}")
             return None
@@ -990,7 +979,7 @@ Content:
             },
         }
 
-        venues_processed = 0
+        static_venue_data = []
 
         for venue_key, venue_config in static_venues.items():
             try:
@@ -1017,12 +1006,8 @@ Content:
                     source_type="static",
                 )
 
-                # Validate and store venue
-                if self._validate_and_store_venue(venue_data):
-                    venues_processed += 1
-                    self.logger.debug(
-                        f"✅ Processed static venue: {venue_config['name']}"
-                    )
+                static_venue_data.append(venue_data)
+                self.logger.debug(f"✅ Processed static venue: {venue_config['name']}")
 
                 # Respectful delay
                 time.sleep(1)
@@ -1031,6 +1016,9 @@ Content:
                 self.logger.error(f"❌ Failed to process static venue {venue_key}: {e}")
                 continue
 
+        # Validate and store all static venues in one bulk write
+        venues_processed = self._store_venues(static_venue_data)
+
         duration = (datetime.now() - start_time).total_seconds()
 
         return OperationResult(
@@ -1070,9 +1058,7 @@ Content:
         for source_key, source_config in dynamic_sources.items():
             try:
                 venues = self._scrape_dynamic_venues(source_config)
-                for venue_data in venues:
-                    if self._validate_and_store_venue(venue_data):
-                        venues_processed += 1
+                venues_processed += self._store_venues(venues)
 
                 self.logger.debug(
                     f"✅ Processed {len(venues)} venues from {source_config['name']}"
@@ -1269,74 +1255,89 @@ Content:
 
     def _validate_and_store_venue(self, venue_data: VenueData) -> bool:
         """Validate venue data and store in database."""
-        try:
-            # Convert to dictionary for validation
-            venue_dict = {
-                "external_id": venue_data.external_id,
-                "provider": venue_data.provider,
-                "name": venue_data.name,
-                "description": venue_data.description,
-                "category": venue_data.category,
-                "subcategory": venue_data.subcategory,
-                "website": venue_data.website,
-                "address": venue_data.address,
-                "phone": venue_data.phone,
-                "lat": venue_data.lat,
-                "lng": venue_data.lng,
-                "avg_rating": venue_data.avg_rating,
-                "psychographic_relevance": venue_data.psychographic_scores,
-            }
+        return self._store_venues([venue_data]) == 1
 
-            # Validate data quality with improved error handling
+    def _store_venues(self, venues: List[VenueData]) -> int:
+        """Validate venues and store them with a single bulk write."""
+        venue_dicts = []
+        for venue_data in venues:
             try:
-                is_valid, validation_results = self.quality_validator.validate_venue(
-                    venue_dict
-                )
-            except Exception as validation_error:
-                self.logger.warning(
-                    f"Venue validation error for {venue_data.name}: {validation_error}. Proceeding with basic validation."
+                venue_dicts.append(self._prepare_venue_record(venue_data))
+            except Exception as e:
+                self.logger.error(
+                    f"Error validating venue {getattr(venue_data, 'name', None)}: {e}"
                 )
-                # Basic validation - ensure we have required fields
-                is_valid = bool(venue_data.name and venue_data.external_id)
-                validation_results = []
-
-            if not is_valid:
-                # Log validation errors but don't fail completely
-                if validation_results:
-                    errors = [
-                        r.error_message
-                        for r in validation_results
-                        if hasattr(r, "error_message") and r.error_message
-                    ]
-                    self.logger.warning(
-                        f"Venue validation failed for {venue_data.name}: {'; '.join(errors)}"
-                    )
-                else:
-                    self.logger.warning(
-                        f"Venue validation failed for {venue_data.name}: Missing required fields"
-                    )
 
-                # For now, continue with storing even if validation fails
-                # This prevents the entire process from stopping due to validation issues
-                self.logger.info(
-                    f"Proceeding to store venue {venue_data.name} despite validation warnings"
-                )
+        if not venue_dicts:
+            return 0
 
-            # Store in database
-            result = self.db.upsert_venue(venue_dict)
+        result = self.db.upsert_venues_bulk(venue_dicts)
+        for index, error in result.data.errors.items():
+            self.logger.error(
+                f"Failed to store venue {venue_dicts[index]['name']}: {error}"
+            )
+        if not result.success:
+            self.logger.error(f"Failed to store venues: {result.message}")
+            return 0
+
+        self.logger.debug(result.message)
+        return result.data.inserted + result.data.updated
+
+    def _prepare_venue_record(self, venue_data: VenueData) -> Dict:
+        """Validate venue data and convert it to a database record."""
+        # Convert to dictionary for validation
+        venue_dict = {
+            "external_id": venue_data.external_id,
+            "provider": venue_data.provider,
+            "name": venue_data.name,
+            "description": venue_data.description,
+            "category": venue_data.category,
+            "subcategory": venue_data.subcategory,
+            "website": venue_data.website,
+            "address": venue_data.address,
+            "phone": venue_data.phone,
+            "lat": venue_data.lat,
+            "lng": venue_data.lng,
+            "avg_rating": venue_data.avg_rating,
+            "psychographic_relevance": venue_data.psychographic_scores,
+        }
 
-            if result.success:
-                self.logger.debug(f"Successfully stored venue: {venue_data.name}")
-                return True
+        # Validate data quality with improved error handling
+        try:
+            is_valid, validation_results = self.quality_validator.validate_venue(
+                venue_dict
+            )
+        except Exception as validation_error:
+            self.logger.warning(
+                f"Venue validation error for {venue_data.name}: {validation_error}. Proceeding with basic validation."
+            )
+            # Basic validation - ensure we have required fields
+            is_valid = bool(venue_data.name and venue_data.external_id)
+            validation_results = []
+
+        if not is_valid:
+            # Log validation errors but don't fail completely
+            if validation_results:
+                errors = [
+                    r.error_message
+                    for r in validation_results
+                    if hasattr(r, "error_message") and r.error_message
+                ]
+                self.logger.warning(
+                    f"Venue validation failed for {venue_data.name}: {'; '.join(errors)}"
+                )
             else:
-                self.logger.error(
-                    f"Failed to store venue {venue_data.name}: {result.error}"
+                self.logger.warning(
+                    f"Venue validation failed for {venue_data.name}: Missing required fields"
                 )
-                return False
 
-        except Exception as e:
-            self.logger.error(f"Error validating/storing venue {venue_data.name}: {e}")
-            return False
+            # For now, continue with storing even if validation fails
+            # This prevents the entire process from stopping due to validation issues
+            self.logger.info(
+                f"Proceeding to store venue {venue_data.name} despite validation warnings"
+            )
+
+        return venue_dict
 
     def _search_google_places(
         self, api_key: str, location: str, radius: int, venue_type: str
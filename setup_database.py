@@ -19,7 +19,12 @@ from typing import Dict, List, Optional, Any
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from core.database import get_database
+from core.database import (
+    PSYCHOGRAPHIC_KEYS,
+    Database,
+    get_database,
+    next_change_seq,
+)
 
 
 def create_sqlite_schema():
@@ -34,6 +39,7 @@ def create_sqlite_schema():
         external_id TEXT NOT NULL,
         provider TEXT NOT NULL,
         name TEXT NOT NULL,
+        name_norm TEXT, -- casefolded, whitespace-collapsed name for lookups
         description TEXT,
         category TEXT NOT NULL,
         subcategory TEXT,
@@ -65,6 +71,11 @@ def create_sqlite_schema():
         
         -- Psychographic Data (JSON)
         psychographic_relevance TEXT, -- JSON with career_driven, competent, fun, social, adventurous scores
+        psychographic_career_driven REAL, -- psychographic_relevance scores as plain floats
+        psychographic_competent REAL,
+        psychographic_fun REAL,
+        psychographic_social REAL,
+        psychographic_adventurous REAL,
         
         -- Metadata
         data_quality_score REAL DEFAULT 0.0,
@@ -89,6 +100,8 @@ def create_sqlite_schema():
         -- Timing
         start_time TIMESTAMP,
         end_time TIMESTAMP,
+        start_ts INTEGER, -- epoch seconds, normalized from start_time
+        end_ts INTEGER, -- epoch seconds, start_ts when the end is unknown
         duration_minutes INTEGER,
         timezone TEXT DEFAULT 'America/Chicago',
         
@@ -119,6 +132,11 @@ def create_sqlite_schema():
         
         -- Psychographic Data (JSON)
         psychographic_relevance TEXT,
+        psychographic_career_driven REAL, -- psychographic_relevance scores as plain floats
+        psychographic_competent REAL,
+        psychographic_fun REAL,
+        psychographic_social REAL,
+        psychographic_adventurous REAL,
         
         -- Impact
         impact_score REAL, -- PredictHQ impact score
@@ -418,6 +436,7 @@ def create_sqlite_schema():
         training_date TIMESTAMP,
         
         -- Performance Metrics
+        average_precision REAL,
         auc_roc REAL,
         precision_at_k REAL,
         recall_at_k REAL,
@@ -434,10 +453,13 @@ def create_sqlite_schema():
         -- Model File
         model_file_path TEXT,
         model_size_mb REAL,
+        model_sha256 TEXT,
+        training_duration REAL, -- seconds
         
         -- Status
         is_active BOOLEAN DEFAULT 0,
         is_production BOOLEAN DEFAULT 0,
+        promoted_at TIMESTAMP,
         
         -- Metadata
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -607,9 +629,97 @@ def create_sqlite_schema():
         last_modified TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         modified_by TEXT DEFAULT 'system'
     );
+
+    -- Row counts kept current by triggers, for O(1) data summaries
+    CREATE TABLE IF NOT EXISTS table_stats (
+        table_name TEXT PRIMARY KEY,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        located_count INTEGER NOT NULL DEFAULT 0, -- rows with lat/lng (venues)
+        version INTEGER NOT NULL DEFAULT 0 -- bumped on every counted change
+    );
+
+    -- Source watermarks of the last materialized master view refresh
+    CREATE TABLE IF NOT EXISTS materialized_view_state (
+        view_name TEXT PRIMARY KEY,
+        watermarks TEXT NOT NULL, -- JSON of source table -> max change timestamp
+        refreshed_at TIMESTAMP
+    );
+
+    -- Monthly rollups of the partitioned time series by day of week (0 = Sunday)
+    -- and hour of day. They are kept after raw partitions are dropped.
+    CREATE TABLE IF NOT EXISTS foot_traffic_rollup (
+        venue_id TEXT NOT NULL,
+        month TEXT NOT NULL, -- 'YYYY-MM'
+        day_of_week INTEGER NOT NULL,
+        hour_of_day INTEGER NOT NULL,
+        samples INTEGER NOT NULL,
+        visit_count_sum REAL,
+        unique_visitors_sum REAL,
+        dwell_minutes_sum REAL,
+        PRIMARY KEY (venue_id, month, day_of_week, hour_of_day)
+    );
+
+    CREATE TABLE IF NOT EXISTS weather_rollup (
+        lat_cell REAL NOT NULL, -- lat/lng rounded to 2 decimals (about 1 km)
+        lng_cell REAL NOT NULL,
+        month TEXT NOT NULL,
+        day_of_week INTEGER NOT NULL,
+        hour_of_day INTEGER NOT NULL,
+        samples INTEGER NOT NULL,
+        temperature_sum REAL,
+        precipitation_probability_sum REAL,
+        severe_count INTEGER,
+        PRIMARY KEY (lat_cell, lng_cell, month, day_of_week, hour_of_day)
+    );
+
+    -- Deleted rows of the change-feed tables, numbered in the same change_seq
+    -- sequence as the rows themselves
+    CREATE TABLE IF NOT EXISTS change_tombstones (
+        table_name TEXT NOT NULL,
+        row_key TEXT NOT NULL,
+        change_seq INTEGER NOT NULL,
+        venue_id TEXT,
+        deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (table_name, change_seq, row_key)
+    );
     """
 
 
+# (table, column, type) added to databases created before the column existed
+COLUMN_MIGRATIONS = [
+    ("events", "start_ts", "INTEGER"),
+    ("events", "end_ts", "INTEGER"),
+    ("venues", "name_norm", "TEXT"),
+    ("venues", "change_seq", "INTEGER"),
+    ("events", "change_seq", "INTEGER"),
+    ("ml_predictions", "change_seq", "INTEGER"),
+    ("change_tombstones", "venue_id", "TEXT"),
+    ("ml_model_versions", "average_precision", "REAL"),
+    ("ml_model_versions", "model_sha256", "TEXT"),
+    ("ml_model_versions", "training_duration", "REAL"),
+    ("ml_model_versions", "promoted_at", "TIMESTAMP"),
+    *(
+        (table, f"psychographic_{key}", "REAL")
+        for table in ("venues", "events")
+        for key in PSYCHOGRAPHIC_KEYS
+    ),
+]
+
+
+def apply_column_migrations():
+    """Add columns introduced after a database was first created"""
+    db = get_database()
+    added = []
+    for table, column, column_type in COLUMN_MIGRATIONS:
+        existing = {
+            row["name"] for row in db.execute_query(f"PRAGMA table_info({table})")
+        }
+        if column not in existing:
+            db.execute_query(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            added.append(f"{table}.{column}")
+    return added
+
+
 def create_indexes():
     """Create comprehensive indexes for performance optimization"""
 
@@ -622,26 +732,47 @@ def create_indexes():
     CREATE INDEX IF NOT EXISTS idx_venues_provider ON venues(provider);
     CREATE INDEX IF NOT EXISTS idx_venues_rating ON venues(avg_rating);
     CREATE INDEX IF NOT EXISTS idx_venues_updated ON venues(updated_at);
-
-    -- Events
-    CREATE INDEX IF NOT EXISTS idx_events_time ON events(start_time, end_time);
+    CREATE INDEX IF NOT EXISTS idx_venues_created ON venues(created_at);
+    CREATE INDEX IF NOT EXISTS idx_venues_name_norm ON venues(name_norm);
+    CREATE INDEX IF NOT EXISTS idx_venues_change_seq ON venues(change_seq, venue_id);
+    CREATE INDEX IF NOT EXISTS idx_venues_career_driven ON venues(psychographic_career_driven);
+    CREATE INDEX IF NOT EXISTS idx_venues_competent ON venues(psychographic_competent);
+    CREATE INDEX IF NOT EXISTS idx_venues_fun ON venues(psychographic_fun);
+
+    -- Events (time ranges use the epoch columns, start_time is display only)
+    DROP INDEX IF EXISTS idx_events_time;
+    CREATE INDEX IF NOT EXISTS idx_events_start_ts ON events(start_ts, venue_id);
+    CREATE INDEX IF NOT EXISTS idx_events_span ON events(end_ts - start_ts);
+    CREATE INDEX IF NOT EXISTS idx_events_page ON events(start_ts, event_id);
     CREATE INDEX IF NOT EXISTS idx_events_venue ON events(venue_id);
     CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
     CREATE INDEX IF NOT EXISTS idx_events_location ON events(lat, lng);
     CREATE INDEX IF NOT EXISTS idx_events_provider ON events(provider);
+    CREATE INDEX IF NOT EXISTS idx_events_created ON events(created_at);
+    CREATE INDEX IF NOT EXISTS idx_events_updated ON events(updated_at);
+    CREATE INDEX IF NOT EXISTS idx_events_change_seq ON events(change_seq, event_id);
+    CREATE INDEX IF NOT EXISTS idx_events_career_driven ON events(psychographic_career_driven);
+    CREATE INDEX IF NOT EXISTS idx_events_competent ON events(psychographic_competent);
+    CREATE INDEX IF NOT EXISTS idx_events_fun ON events(psychographic_fun);
 
     -- Demographics
     CREATE INDEX IF NOT EXISTS idx_demographics_location ON demographic_data(lat, lng);
     CREATE INDEX IF NOT EXISTS idx_demographics_income ON demographic_data(median_income);
     CREATE INDEX IF NOT EXISTS idx_demographics_education ON demographic_data(bachelor_degree_pct);
+    CREATE INDEX IF NOT EXISTS idx_demographics_collected ON demographic_data(collected_at);
 
     -- Foot Traffic
     CREATE INDEX IF NOT EXISTS idx_foot_traffic_venue_time ON foot_traffic_data(venue_id, timestamp);
     CREATE INDEX IF NOT EXISTS idx_foot_traffic_hour ON foot_traffic_data(hour_of_day, day_of_week);
+    CREATE INDEX IF NOT EXISTS idx_foot_traffic_time ON foot_traffic_data(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_foot_traffic_rollup_month ON foot_traffic_rollup(month);
 
     -- Weather
     CREATE INDEX IF NOT EXISTS idx_weather_location_time ON weather_data(lat, lng, timestamp);
     CREATE INDEX IF NOT EXISTS idx_weather_forecast ON weather_data(is_forecast, forecast_timestamp);
+    CREATE INDEX IF NOT EXISTS idx_weather_collected ON weather_data(collected_at);
+    CREATE INDEX IF NOT EXISTS idx_weather_time ON weather_data(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_weather_rollup_month ON weather_rollup(month);
 
     -- Traffic
     CREATE INDEX IF NOT EXISTS idx_traffic_location_time ON traffic_data(lat, lng, timestamp);
@@ -657,6 +788,8 @@ def create_indexes():
     CREATE INDEX IF NOT EXISTS idx_predictions_type ON ml_predictions(prediction_type);
     CREATE INDEX IF NOT EXISTS idx_predictions_datetime ON ml_predictions(prediction_for_datetime);
     CREATE INDEX IF NOT EXISTS idx_predictions_value ON ml_predictions(prediction_value);
+    CREATE INDEX IF NOT EXISTS idx_predictions_generated ON ml_predictions(generated_at);
+    CREATE INDEX IF NOT EXISTS idx_predictions_change_seq ON ml_predictions(change_seq, prediction_id);
 
     -- ML Training Data
     CREATE INDEX IF NOT EXISTS idx_training_venue ON ml_training_data(venue_id);
@@ -678,6 +811,399 @@ def create_indexes():
     """
 
 
+def create_spatial_indexes():
+    """Create R*Tree spatial indexes and the triggers that keep them in sync"""
+    statements = []
+
+    # Point tables with their own coordinates
+    for table in ["venues", "demographic_data", "weather_data"]:
+        statements.extend(
+            [
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table}_rtree
+                USING rtree(id, min_lat, max_lat, min_lng, max_lng)
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_rtree_insert
+                AFTER INSERT ON {table}
+                FOR EACH ROW
+                WHEN NEW.lat IS NOT NULL AND NEW.lng IS NOT NULL
+                BEGIN
+                    INSERT OR REPLACE INTO {table}_rtree
+                    VALUES (NEW.rowid, NEW.lat, NEW.lat, NEW.lng, NEW.lng);
+                END;
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_rtree_update
+                AFTER UPDATE OF lat, lng ON {table}
+                FOR EACH ROW
+                WHEN OLD.lat IS NOT NEW.lat OR OLD.lng IS NOT NEW.lng
+                BEGIN
+                    DELETE FROM {table}_rtree WHERE id = OLD.rowid;
+                    INSERT INTO {table}_rtree
+                    SELECT NEW.rowid, NEW.lat, NEW.lat, NEW.lng, NEW.lng
+                    WHERE NEW.lat IS NOT NULL AND NEW.lng IS NOT NULL;
+                END;
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_rtree_delete
+                AFTER DELETE ON {table}
+                FOR EACH ROW
+                BEGIN
+                    DELETE FROM {table}_rtree WHERE id = OLD.rowid;
+                END;
+                """,
+            ]
+        )
+
+    # Events are located at their venue, falling back to their own coordinates
+    event_point = """
+        SELECT NEW.rowid, lat, lat, lng, lng FROM (
+            SELECT COALESCE(v.lat, NEW.lat) AS lat, COALESCE(v.lng, NEW.lng) AS lng
+            FROM (SELECT 1) LEFT JOIN venues v ON v.venue_id = NEW.venue_id
+        )
+        WHERE lat IS NOT NULL AND lng IS NOT NULL
+    """
+    statements.extend(
+        [
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS events_rtree
+            USING rtree(id, min_lat, max_lat, min_lng, max_lng)
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS events_rtree_insert
+            AFTER INSERT ON events
+            FOR EACH ROW
+            BEGIN
+                INSERT OR REPLACE INTO events_rtree {event_point};
+            END;
+            """,
+            # Replaced so databases created before the WHEN guard pick it up
+            "DROP TRIGGER IF EXISTS events_rtree_update",
+            f"""
+            CREATE TRIGGER events_rtree_update
+            AFTER UPDATE OF lat, lng, venue_id ON events
+            FOR EACH ROW
+            WHEN OLD.lat IS NOT NEW.lat OR OLD.lng IS NOT NEW.lng
+                OR OLD.venue_id IS NOT NEW.venue_id
+            BEGIN
+                DELETE FROM events_rtree WHERE id = OLD.rowid;
+                INSERT INTO events_rtree {event_point};
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS events_rtree_delete
+            AFTER DELETE ON events
+            FOR EACH ROW
+            BEGIN
+                DELETE FROM events_rtree WHERE id = OLD.rowid;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS events_rtree_venue_moved
+            AFTER UPDATE OF lat, lng ON venues
+            FOR EACH ROW
+            WHEN OLD.lat IS NOT NEW.lat OR OLD.lng IS NOT NEW.lng
+            BEGIN
+                DELETE FROM events_rtree
+                WHERE id IN (SELECT rowid FROM events WHERE venue_id = NEW.venue_id);
+                INSERT INTO events_rtree
+                SELECT rowid, lat, lat, lng, lng FROM (
+                    SELECT rowid, COALESCE(NEW.lat, lat) AS lat,
+                           COALESCE(NEW.lng, lng) AS lng
+                    FROM events WHERE venue_id = NEW.venue_id
+                )
+                WHERE lat IS NOT NULL AND lng IS NOT NULL;
+            END;
+            """,
+        ]
+    )
+
+    return statements
+
+
+def create_search_indexes():
+    """Create FTS5 indexes over names and descriptions and the triggers that sync them"""
+    statements = []
+
+    for table in Database.SEARCH_TABLES:
+        new_row = "NEW.rowid, NEW.name, NEW.description"
+        old_row = "OLD.rowid, OLD.name, OLD.description"
+        statements.extend(
+            [
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                    name, description,
+                    content='{table}', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_insert
+                AFTER INSERT ON {table}
+                FOR EACH ROW
+                BEGIN
+                    INSERT INTO {table}_fts (rowid, name, description)
+                    VALUES ({new_row});
+                END;
+                """,
+                # Upserts rewrite name and description with the same text, so
+                # only reindex when it actually changed
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_update
+                AFTER UPDATE OF name, description ON {table}
+                FOR EACH ROW
+                WHEN OLD.name IS NOT NEW.name
+                    OR OLD.description IS NOT NEW.description
+                BEGIN
+                    INSERT INTO {table}_fts ({table}_fts, rowid, name, description)
+                    VALUES ('delete', {old_row});
+                    INSERT INTO {table}_fts (rowid, name, description)
+                    VALUES ({new_row});
+                END;
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_delete
+                AFTER DELETE ON {table}
+                FOR EACH ROW
+                BEGIN
+                    INSERT INTO {table}_fts ({table}_fts, rowid, name, description)
+                    VALUES ('delete', {old_row});
+                END;
+                """,
+            ]
+        )
+
+    return statements
+
+
+def create_table_stats_triggers():
+    """Create triggers that keep table_stats row counts current"""
+    statements = []
+
+    for table in Database.STATS_TABLES:
+        located = (
+            "(NEW.lat IS NOT NULL AND NEW.lng IS NOT NULL)"
+            if table == "venues"
+            else "0"
+        )
+        old_located = located.replace("NEW.", "OLD.")
+        statements.extend(
+            [
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_stats_insert
+                AFTER INSERT ON {table}
+                FOR EACH ROW
+                BEGIN
+                    UPDATE table_stats
+                    SET row_count = row_count + 1,
+                        located_count = located_count + {located},
+                        version = version + 1
+                    WHERE table_name = '{table}';
+                END;
+                """,
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_stats_delete
+                AFTER DELETE ON {table}
+                FOR EACH ROW
+                BEGIN
+                    UPDATE table_stats
+                    SET row_count = row_count - 1,
+                        located_count = located_count - {old_located},
+                        version = version + 1
+                    WHERE table_name = '{table}';
+                END;
+                """,
+            ]
+        )
+
+    # Venues gaining or losing coordinates change the located count
+    statements.append(
+        """
+        CREATE TRIGGER IF NOT EXISTS venues_stats_located
+        AFTER UPDATE OF lat, lng ON venues
+        FOR EACH ROW
+        WHEN (NEW.lat IS NOT NULL AND NEW.lng IS NOT NULL)
+            != (OLD.lat IS NOT NULL AND OLD.lng IS NOT NULL)
+        BEGIN
+            UPDATE table_stats
+            SET located_count = located_count
+                    + (NEW.lat IS NOT NULL AND NEW.lng IS NOT NULL)
+                    - (OLD.lat IS NOT NULL AND OLD.lng IS NOT NULL),
+                version = version + 1
+            WHERE table_name = 'venues';
+        END;
+        """
+    )
+
+    return statements
+
+
+def create_change_feed_triggers():
+    """Create triggers that leave a tombstone for rows deleted from change feeds"""
+    # Every change feed table has a venue_id, which the master views refresh by
+    statements = []
+    for table, key in Database.CHANGE_FEEDS.items():
+        statements.append(f"DROP TRIGGER IF EXISTS {table}_tombstone")
+        statements.append(
+            f"""
+            CREATE TRIGGER {table}_tombstone
+            AFTER DELETE ON {table}
+            FOR EACH ROW
+            BEGIN
+                INSERT INTO change_tombstones
+                    (table_name, row_key, change_seq, venue_id)
+                VALUES ('{table}', OLD.{key}, {next_change_seq(table)}, OLD.venue_id);
+            END;
+            """
+        )
+    return statements
+
+
+def create_postgres_change_feed():
+    """Create change feed sequences, columns and triggers on PostgreSQL"""
+    statements = [
+        "ALTER TABLE change_tombstones ADD COLUMN IF NOT EXISTS venue_id TEXT",
+        "ALTER TABLE change_tombstones ADD COLUMN IF NOT EXISTS change_xid BIGINT",
+        """
+        CREATE INDEX IF NOT EXISTS idx_change_tombstones_xid
+        ON change_tombstones(table_name, change_xid, change_seq, row_key)
+        """,
+    ]
+    for table, key in Database.CHANGE_FEEDS.items():
+        statements.extend(
+            [
+                f"CREATE SEQUENCE IF NOT EXISTS {table}_change_seq",
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS change_seq BIGINT",
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS change_xid BIGINT",
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_change_xid
+                ON {table}(change_xid, change_seq, {key})
+                """,
+                # Continue after numbers already used by rows and tombstones
+                f"""
+                SELECT setval('{table}_change_seq', GREATEST(
+                    (SELECT MAX(change_seq) FROM {table}),
+                    (SELECT MAX(change_seq) FROM change_tombstones
+                     WHERE table_name = '{table}'),
+                    0
+                ) + 1, false)
+                """,
+                # get_changes_since orders PostgreSQL changes by writing transaction
+                f"""
+                CREATE OR REPLACE FUNCTION {table}_stamp_xid() RETURNS trigger AS $$
+                BEGIN
+                    NEW.change_xid := txid_current();
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+                """,
+                f"DROP TRIGGER IF EXISTS {table}_change_xid ON {table}",
+                f"""
+                CREATE TRIGGER {table}_change_xid
+                BEFORE INSERT OR UPDATE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION {table}_stamp_xid()
+                """,
+                f"""
+                CREATE OR REPLACE FUNCTION {table}_tombstone() RETURNS trigger AS $$
+                BEGIN
+                    INSERT INTO change_tombstones
+                        (table_name, row_key, change_seq, venue_id, change_xid)
+                    VALUES ('{table}', OLD.{key}, nextval('{table}_change_seq'),
+                        OLD.venue_id, txid_current());
+                    RETURN OLD;
+                END
+                $$ LANGUAGE plpgsql
+                """,
+                f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}",
+                f"""
+                CREATE TRIGGER {table}_tombstone
+                AFTER DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION {table}_tombstone()
+                """,
+            ]
+        )
+    return statements
+
+
+def create_postgres_partitions():
+    """Convert the time series tables to monthly range partitions on PostgreSQL"""
+    primary_keys = {"weather_data": "weather_id", "foot_traffic_data": "traffic_id"}
+    statements = []
+    for table, column in Database.PARTITIONED_TABLES.items():
+        legacy = f"{table}_unpartitioned"
+        unique = ", ".join(f'"{c}"' for c in Database.LOAD_TABLES[table][1])
+        statements.append(
+            f"""
+            DO $$
+            DECLARE
+                month_start DATE;
+                definition TEXT;
+                indexes TEXT[];
+                foreign_keys TEXT[];
+            BEGIN
+                -- Only a plain table is converted, so reruns do nothing
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_class
+                    WHERE relname = '{table}' AND relkind = 'r'
+                    AND pg_table_is_visible(oid)
+                ) THEN
+                    RETURN;
+                END IF;
+
+                -- Secondary indexes and foreign keys are recreated on the parent
+                indexes := ARRAY(
+                    SELECT indexdef FROM pg_indexes
+                    WHERE tablename = '{table}' AND indexdef NOT LIKE 'CREATE UNIQUE%'
+                );
+                foreign_keys := ARRAY(
+                    SELECT format(
+                        'ALTER TABLE {table} ADD CONSTRAINT %I %s',
+                        conname, pg_get_constraintdef(oid)
+                    )
+                    FROM pg_constraint
+                    WHERE conrelid = '{table}'::regclass AND contype = 'f'
+                );
+
+                ALTER TABLE {table} RENAME TO {legacy};
+                CREATE TABLE {table}
+                    (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+                    PARTITION BY RANGE ("{column}");
+                FOR month_start IN
+                    SELECT DISTINCT date_trunc('month', "{column}")::date
+                    FROM {legacy}
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_p' || to_char(month_start, 'YYYYMM'),
+                        month_start,
+                        (month_start + INTERVAL '1 month')::date
+                    );
+                END LOOP;
+                CREATE TABLE {table}_pdefault PARTITION OF {table} DEFAULT;
+                INSERT INTO {table} SELECT * FROM {legacy};
+                -- Views over the old table are recreated with the other views
+                DROP TABLE {legacy} CASCADE;
+
+                -- Unique keys of a partitioned table must include its range key
+                ALTER TABLE {table} ADD PRIMARY KEY ({primary_keys[table]}, "{column}");
+                ALTER TABLE {table} ADD UNIQUE ({unique});
+                FOREACH definition IN ARRAY indexes || foreign_keys LOOP
+                    EXECUTE definition;
+                END LOOP;
+            END
+            $$
+            """
+        )
+    # maintain_partitions finds the months to roll up by collection time
+    statements.append(
+        "CREATE INDEX IF NOT EXISTS idx_foot_traffic_collected "
+        "ON foot_traffic_data(collected_at)"
+    )
+    return statements
+
+
 def create_views():
     """Create useful views for common queries"""
 
@@ -685,6 +1211,8 @@ def create_views():
     -- ========== USEFUL VIEWS ==========
     
     -- Master Venue Data with All Enrichments
+    -- (nearest demographics found through the R*Tree, not an ABS() scan)
+    DROP VIEW IF EXISTS vw_master_venue_data;
     CREATE VIEW IF NOT EXISTS vw_master_venue_data AS
     SELECT 
         v.*,
@@ -699,15 +1227,27 @@ def create_views():
         p.fun_score,
         COUNT(DISTINCT e.event_id) as upcoming_events_count
     FROM venues v
-    LEFT JOIN demographic_data d ON 
-        ABS(v.lat - d.lat) < 0.01 AND ABS(v.lng - d.lng) < 0.01
+    LEFT JOIN demographic_data d ON d.rowid = (
+        SELECT id FROM (
+            SELECT r.id,
+                (r.min_lat - v.lat) * (r.min_lat - v.lat)
+                + (r.min_lng - v.lng) * (r.min_lng - v.lng) AS dist
+            FROM demographic_data_rtree r
+            WHERE r.max_lat >= v.lat - 0.01 AND r.min_lat <= v.lat + 0.01
+            AND r.max_lng >= v.lng - 0.01 AND r.min_lng <= v.lng + 0.01
+        )
+        ORDER BY dist
+        LIMIT 1
+    )
     LEFT JOIN ml_predictions p ON 
         v.venue_id = p.venue_id AND p.prediction_type = 'psychographic_match'
     LEFT JOIN events e ON 
-        v.venue_id = e.venue_id AND e.start_time > datetime('now')
+        v.venue_id = e.venue_id
+        AND e.start_ts > CAST(strftime('%s', 'now') AS INTEGER)
     GROUP BY v.venue_id;
 
     -- Master Event Data with Venue Information
+    DROP VIEW IF EXISTS vw_master_events_data;
     CREATE VIEW IF NOT EXISTS vw_master_events_data AS
     SELECT 
         e.*,
@@ -723,9 +1263,9 @@ def create_views():
     FROM events e
     LEFT JOIN venues v ON e.venue_id = v.venue_id
     LEFT JOIN weather_data w ON 
-        ABS(CAST(strftime('%s', e.start_time) AS INTEGER) - CAST(strftime('%s', w.timestamp) AS INTEGER)) < 3600
+        ABS(e.start_ts - CAST(strftime('%s', w.timestamp) AS INTEGER)) < 3600
         AND w.is_forecast = 1
-    WHERE e.start_time >= datetime('now');
+    WHERE e.start_ts >= CAST(strftime('%s', 'now') AS INTEGER);
 
     -- High Value Predictions (for recommendations)
     CREATE VIEW IF NOT EXISTS vw_high_value_predictions AS
@@ -770,6 +1310,36 @@ def create_views():
         0 as avg_quality_score
     FROM events;
 
+    -- Foot traffic per venue, day of week and hour, averaged over all rollups
+    DROP VIEW IF EXISTS vw_foot_traffic_profile;
+    CREATE VIEW vw_foot_traffic_profile AS
+    SELECT
+        venue_id,
+        day_of_week,
+        hour_of_day,
+        SUM(samples) as samples,
+        SUM(visit_count_sum) * 1.0 / SUM(samples) as avg_visit_count,
+        SUM(unique_visitors_sum) * 1.0 / SUM(samples) as avg_unique_visitors,
+        SUM(dwell_minutes_sum) * 1.0 / SUM(samples) as avg_dwell_minutes
+    FROM foot_traffic_rollup
+    GROUP BY venue_id, day_of_week, hour_of_day;
+
+    -- Observed weather per ~1 km cell, day of week and hour
+    DROP VIEW IF EXISTS vw_weather_profile;
+    CREATE VIEW vw_weather_profile AS
+    SELECT
+        lat_cell,
+        lng_cell,
+        day_of_week,
+        hour_of_day,
+        SUM(samples) as samples,
+        SUM(temperature_sum) * 1.0 / SUM(samples) as avg_temperature_f,
+        SUM(precipitation_probability_sum) * 1.0 / SUM(samples)
+            as avg_precipitation_probability,
+        SUM(severe_count) * 1.0 / SUM(samples) as severe_share
+    FROM weather_rollup
+    GROUP BY lat_cell, lng_cell, day_of_week, hour_of_day;
+
     -- Collection Health Monitor
     CREATE VIEW IF NOT EXISTS vw_collection_health AS
     SELECT 
@@ -907,79 +1477,27 @@ def insert_initial_collection_sources():
 
 
 def create_database_triggers():
-    """Create triggers for automatic timestamp updates"""
-    triggers = [
-        # Auto-update updated_at for venues
-        """
-        CREATE TRIGGER IF NOT EXISTS update_venues_timestamp 
-        AFTER UPDATE ON venues
-        FOR EACH ROW
-        BEGIN
-            UPDATE venues SET updated_at = CURRENT_TIMESTAMP 
-            WHERE venue_id = NEW.venue_id;
-        END;
-        """,
-        # Auto-update updated_at for events
-        """
-        CREATE TRIGGER IF NOT EXISTS update_events_timestamp 
-        AFTER UPDATE ON events
-        FOR EACH ROW
-        BEGIN
-            UPDATE events SET updated_at = CURRENT_TIMESTAMP 
-            WHERE event_id = NEW.event_id;
-        END;
-        """,
-        # Auto-update collection_status timestamp
-        """
-        CREATE TRIGGER IF NOT EXISTS update_collection_status_timestamp 
-        AFTER UPDATE ON collection_status
-        FOR EACH ROW
-        BEGIN
-            UPDATE collection_status SET updated_at = CURRENT_TIMESTAMP 
-            WHERE source_name = NEW.source_name;
-        END;
-        """,
-        # Increment access_count on api_cache read
-        """
-        CREATE TRIGGER IF NOT EXISTS increment_api_cache_access
-        AFTER UPDATE OF last_accessed ON api_cache
-        FOR EACH ROW
-        BEGIN
-            UPDATE api_cache 
-            SET access_count = access_count + 1
-            WHERE cache_key = NEW.cache_key;
-        END;
-        """,
-        # Increment access_count on geocoding_cache read
-        """
-        CREATE TRIGGER IF NOT EXISTS increment_geocoding_cache_access
-        AFTER UPDATE OF access_count ON geocoding_cache
-        FOR EACH ROW
-        BEGIN
-            UPDATE geocoding_cache 
-            SET access_count = access_count + 1
-            WHERE geocoding_id = NEW.geocoding_id;
-        END;
-        """,
-        # Auto-expire old API cache entries
-        """
-        CREATE TRIGGER IF NOT EXISTS auto_invalidate_expired_cache
-        AFTER INSERT ON api_cache
-        BEGIN
-            DELETE FROM api_cache 
-            WHERE expires_at < CURRENT_TIMESTAMP;
-        END;
-        """,
+    """Drop triggers that are now handled by explicit write paths"""
+    # Writes set updated_at in the same statement, cache hit counters are
+    # batched by the write-behind buffer and expired cache rows are removed by
+    # Database.sweep_expired_cache, so these triggers would only repeat the work
+    retired_triggers = [
+        "DROP TRIGGER IF EXISTS update_venues_timestamp",
+        "DROP TRIGGER IF EXISTS update_events_timestamp",
+        "DROP TRIGGER IF EXISTS update_collection_status_timestamp",
+        "DROP TRIGGER IF EXISTS auto_invalidate_expired_cache",
+        "DROP TRIGGER IF EXISTS increment_api_cache_access",
+        "DROP TRIGGER IF EXISTS increment_geocoding_cache_access",
     ]
 
     db = get_database()
-    for trigger in triggers:
+    for trigger in retired_triggers:
         try:
             db.execute_query(trigger)
         except Exception as e:
-            print(f"⚠️  Warning creating trigger: {e}")
+            print(f"⚠️  Warning dropping trigger: {e}")
 
-    print(f"✅ Created {len(triggers)} database triggers")
+    print(f"✅ Retired {len(retired_triggers)} row-level triggers")
 
 
 def analyze_database_statistics():
@@ -1005,6 +1523,11 @@ def analyze_database_statistics():
         "geocoding_cache",
         "data_quality_log",
         "system_config",
+        "table_stats",
+        "materialized_view_state",
+        "foot_traffic_rollup",
+        "weather_rollup",
+        "change_tombstones",
     ]
 
     print("\n📊 Database Statistics:")
@@ -1056,6 +1579,11 @@ def verify_schema_integrity():
         "geocoding_cache",
         "data_quality_log",
         "system_config",
+        "foot_traffic_rollup",
+        "weather_rollup",
+        "change_tombstones",
+        "venues_fts",
+        "events_fts",
     ]
 
     existing_tables = db.execute_query(
@@ -1080,6 +1608,10 @@ def verify_schema_integrity():
         "vw_high_value_predictions",
         "vw_data_quality_summary",
         "vw_collection_health",
+        "vw_foot_traffic_profile",
+        "vw_weather_profile",
+        "foot_traffic_data_all",
+        "weather_data_all",
     ]
 
     existing_views = db.execute_query(
@@ -1232,6 +1764,14 @@ def setup_database():
 
         print(f"  ✅ Executed {len(statements)} schema statements")
 
+        added = apply_column_migrations()
+        if added:
+            print(f"  ✅ Added columns: {', '.join(added)}")
+
+        # Let cleanup_old_data hand freed pages back without a full VACUUM
+        result = db.enable_incremental_vacuum()
+        print(f"  {'✅' if result.success else '⚠️ '} {result.message}")
+
         # 2. Create indexes
         print("\n🚀 Creating performance indexes...")
         indexes = create_indexes()
@@ -1245,6 +1785,39 @@ def setup_database():
 
         print(f"  ✅ Created {len(index_statements)} indexes")
 
+        # 2b. Create spatial indexes
+        print("\n🧭 Creating spatial indexes...")
+        spatial_statements = create_spatial_indexes()
+
+        for statement in spatial_statements:
+            try:
+                db.execute_query(statement)
+            except Exception as e:
+                print(f"  ⚠️  Spatial index warning: {e}")
+
+        result = db.rebuild_spatial_index()
+        print(f"  {'✅' if result.success else '⚠️ '} {result.message}")
+
+        # 2c. Create full-text search indexes
+        print("\n🔎 Creating search indexes...")
+        for statement in create_search_indexes():
+            try:
+                db.execute_query(statement)
+            except Exception as e:
+                print(f"  ⚠️  Search index warning: {e}")
+
+        result = db.rebuild_search_index()
+        print(f"  {'✅' if result.success else '⚠️ '} {result.message}")
+
+        # 2d. Partition the time series by month (SQLite seals months itself)
+        if db.db_type == "postgresql":
+            print("\n🗂️  Partitioning time series tables...")
+            for statement in create_postgres_partitions():
+                try:
+                    db.execute_query(statement)
+                except Exception as e:
+                    print(f"  ⚠️  Partition warning: {e}")
+
         # 3. Create views
         print("\n👁️  Creating database views...")
         views = create_views()
@@ -1258,6 +1831,10 @@ def setup_database():
 
         print(f"  ✅ Created {len(view_statements)} views")
 
+        # 3b. Fill the monthly partitions and build the rollups
+        result = db.maintain_partitions()
+        print(f"  {'✅' if result.success else '⚠️ '} {result.message}")
+
         # 4. Initialize system configuration
         print("\n⚙️  Initializing system configuration...")
         config = initialize_system_config()
@@ -1271,10 +1848,34 @@ def setup_database():
 
         print("  ✅ System configuration initialized")
 
-        # 5. Create triggers
-        print("\n⚡ Creating database triggers...")
+        # 5. Retire row-level triggers
+        print("\n⚡ Retiring row-level triggers...")
         create_database_triggers()
 
+        # 5b. Keep table statistics for data summaries
+        print("\n📊 Creating table statistics...")
+        for statement in create_table_stats_triggers():
+            try:
+                db.execute_query(statement)
+            except Exception as e:
+                print(f"  ⚠️  Table stats warning: {e}")
+
+        result = db.refresh_table_stats()
+        print(f"  {'✅' if result.success else '⚠️ '} {result.message}")
+
+        # 5c. Record deletes for the change feed
+        print("\n🪦 Creating change feed tombstones...")
+        if db.db_type == "postgresql":
+            change_feed = create_postgres_change_feed()
+        else:
+            change_feed = create_change_feed_triggers()
+        for statement in change_feed:
+            try:
+                db.execute_query(statement)
+            except Exception as e:
+                print(f"  ⚠️  Change feed warning: {e}")
+        print("  ✅ Change feed tombstones created")
+
         # 6. Initialize collection sources
         print("\n📡 Initializing collection sources...")
         insert_initial_collection_sources()
@@ -1288,6 +1889,20 @@ def setup_database():
         # 9. Create sample data
         create_sample_data()
 
+        # 9a. Derive normalized columns for rows written without them
+        print()
+        for result in (
+            db.normalize_venue_names(),
+            db.normalize_event_times(),
+            db.normalize_psychographic_scores(),
+            db.backfill_change_seq(),
+        ):
+            print(f"{'✅' if result.success else '⚠️ '} {result.message}")
+
+        # 9b. Materialize the master views
+        result = db.refresh_materialized(full=True)
+        print(f"\n{'✅' if result.success else '⚠️ '} {result.message}")
+
         # 10. Final summary
         print("\n" + "=" * 60)
         print("✅ DATABASE SETUP COMPLETED SUCCESSFULLY!")
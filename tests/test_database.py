@@ -7,11 +7,12 @@ Comprehensive tests for all database tables, views, and operations
 
 import sys
 import os
+import uuid
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from core.database import get_database
+from core.database import Database, PgCursor, SqlCompiler, get_database
 import json
 from datetime import datetime
 
@@ -325,6 +326,1509 @@ def test_data_summary():
     print("\n✅ Data summary test passed!")
 
 
+def test_connection_pool():
+    """Test that connections are pooled and reused"""
+    print("\n🧪 Testing Connection Pool...")
+    print("=" * 60)
+
+    db = get_database()
+
+    before = db.get_pool_stats()
+    for _ in range(10):
+        db.execute_query("SELECT COUNT(*) as count FROM venues")
+    after = db.get_pool_stats()
+
+    assert (
+        after["total_checkouts"] >= before["total_checkouts"] + 10
+    ), "Pool checkouts not recorded"
+    assert after["open_connections"] <= after["max_size"], "Pool exceeded max size"
+    assert after["in_use"] == 0, "Connections leaked from pool"
+    print(
+        f"  ✅ {after['total_checkouts']} checkouts over {after['open_connections']} connections"
+    )
+    print(f"  ✅ Average wait: {after['avg_wait_seconds'] * 1000:.3f} ms")
+
+    print("\n✅ Connection pool test passed!")
+
+
+def test_bulk_upserts():
+    """Test bulk venue, event and prediction upserts"""
+    print("\n🧪 Testing Bulk Upserts...")
+    print("=" * 60)
+
+    db = get_database()
+
+    venues = [
+        {
+            "external_id": f"bulk_venue_{i}",
+            "provider": "bulk_test",
+            "name": f"Bulk Venue {i}",
+            "category": "bar",
+            "lat": 39.05 + i * 0.001,
+            "lng": -94.58,
+            "psychographic_relevance": {"fun": 0.8},
+        }
+        for i in range(5)
+    ]
+    venues.append({"external_id": "bulk_venue_bad", "provider": "bulk_test"})
+
+    result = db.upsert_venues_bulk(venues, chunk_size=2)
+    assert result.success, f"Bulk venue upsert failed: {result.error}"
+    assert result.data.failed == 1, "Invalid venue row was not reported as failed"
+    assert result.data.outcomes[5] == "failed", "Failed row outcome missing"
+    print(f"  ✅ {result.message}")
+
+    result = db.upsert_venues_bulk(venues[:5])
+    assert result.data.updated == 5, "Re-upserted venues not reported as updated"
+    print(f"  ✅ {result.message}")
+
+    events = [
+        {
+            "external_id": f"bulk_event_{i}",
+            "provider": "bulk_test",
+            "name": f"Bulk Event {i}",
+            "category": "music",
+            "start_time": "2025-12-01 20:00:00",
+            "venue_name": "Bulk Venue 1" if i % 2 else "Brand New Bulk Venue",
+        }
+        for i in range(4)
+    ]
+    result = db.upsert_events_bulk(events)
+    assert result.success and result.data.failed == 0, f"Bulk event upsert failed"
+    print(f"  ✅ {result.message}")
+
+    venue_ids = [
+        row["venue_id"]
+        for row in db.execute_query(
+            "SELECT venue_id FROM venues WHERE provider = 'bulk_test'"
+        )
+    ]
+    predictions = [
+        {
+            "venue_id": venue_id,
+            "prediction_type": "attendance",
+            "prediction_value": 0.5,
+            "confidence_score": 0.8,
+            "model_version": "test",
+        }
+        for venue_id in venue_ids
+    ]
+    result = db.upsert_predictions_bulk(predictions)
+    assert result.success and result.data.failed == 0, "Bulk prediction upsert failed"
+    result = db.upsert_predictions_bulk(predictions)
+    assert result.data.updated == len(predictions), "Predictions not updated"
+    print(f"  ✅ {result.message}")
+
+    print("\n✅ Bulk upsert tests passed!")
+
+
+def test_filter_pushdown():
+    """Test filter compilation and point lookups"""
+    print("\n🧪 Testing Filter Pushdown...")
+    print("=" * 60)
+
+    db = get_database()
+
+    venue = db.get_venues({"provider": "bulk_test", "limit": 1})[0]
+    assert db.get_venue(venue["venue_id"])["venue_id"] == venue["venue_id"]
+    assert db.get_venue("does_not_exist") is None, "Unknown venue id returned a row"
+    matched = db.get_venues({"venue_id": venue["venue_id"]})
+    assert len(matched) == 1, "venue_id filter was not applied"
+    print(f"  ✅ Point lookup and venue_id filter return exactly one venue")
+
+    bounds = {"min_lat": 39.049, "max_lat": 39.0515, "min_lng": -94.6, "max_lng": -94.5}
+    in_bounds = db.get_venues({"provider": "bulk_test", "bounds": bounds})
+    assert len(in_bounds) == 2, f"Expected 2 venues in bounds, got {len(in_bounds)}"
+    assert db.get_venues({"provider": "bulk_test", "psychographic_min": 0.7})
+    assert not db.get_venues({"provider": "bulk_test", "psychographic_min": 0.9})
+    print(f"  ✅ Bounding box and psychographic filters pushed down")
+
+    page1 = db.get_venues({"provider": "bulk_test", "limit": 2})
+    page2 = db.get_venues(
+        {"provider": "bulk_test", "limit": 2, "after": page1[-1]["venue_id"]}
+    )
+    assert page2 and page2[0]["venue_id"] > page1[-1]["venue_id"], "Cursor ignored"
+    print(f"  ✅ Keyset cursor and limit applied")
+
+    try:
+        db.get_venues({"venu_id": "typo"})
+        assert False, "Unknown filter key was not rejected"
+    except ValueError as e:
+        print(f"  ✅ Unknown filter rejected: {str(e)[:50]}...")
+
+    print("\n✅ Filter pushdown tests passed!")
+
+
+def test_streaming_iterators():
+    """Test fetchmany-based row streaming"""
+    print("\n🧪 Testing Streaming Iterators...")
+    print("=" * 60)
+
+    db = get_database()
+
+    expected = db.get_venues({"provider": "bulk_test"})
+    streamed = list(db.iter_venues({"provider": "bulk_test"}, batch_size=2))
+    assert streamed == expected, "Streamed venues differ from get_venues()"
+    print(f"  ✅ iter_venues streamed {len(streamed)} venues in batches of 2")
+
+    batches = list(
+        db.iter_query_batches(
+            "SELECT venue_id, name FROM venues WHERE provider = ?",
+            ("bulk_test",),
+            batch_size=2,
+            row_format="tuple",
+        )
+    )
+    assert all(len(batch) <= 2 for batch in batches), "Batch size not respected"
+    assert isinstance(batches[0][0], tuple), "Tuple rows not returned"
+
+    event = next(db.iter_events({"provider": "bulk_test"}, row_format="namedtuple"))
+    assert event.provider == "bulk_test", "Namedtuple fields not populated"
+    list(db.iter_predictions(batch_size=10))
+    print(f"  ✅ Tuple batches, namedtuple events and predictions streamed")
+
+    stats_before = db.get_pool_stats()
+    abandoned = db.iter_venues({"provider": "bulk_test"}, batch_size=1)
+    next(abandoned)
+    abandoned.close()
+    assert db.get_pool_stats()["in_use"] == stats_before["in_use"], "Leaked connection"
+    print(f"  ✅ Closing an iterator early returns its connection to the pool")
+
+    print("\n✅ Streaming iterator tests passed!")
+
+
+def test_columnar_queries():
+    """Test Arrow/DataFrame query path"""
+    print("\n🧪 Testing Columnar Queries...")
+    print("=" * 60)
+
+    db = get_database()
+
+    frame = db.venues_frame({"provider": "bulk_test"})
+    assert len(frame) == len(db.get_venues({"provider": "bulk_test"}))
+    assert str(frame["lat"].dtype) == "float32", "Coordinates are not float32"
+    assert str(frame["created_at"].dtype).startswith("datetime64"), "Untyped dates"
+    print(f"  ✅ venues_frame returned {len(frame)} typed rows")
+
+    table = db.query_arrow(
+        "SELECT venue_id, lat, avg_rating FROM venues WHERE provider = ?",
+        ("bulk_test",),
+        batch_size=2,
+    )
+    assert table.num_rows == len(frame), "Batched Arrow build lost rows"
+    assert table.column("lat").num_chunks > 1, "Result was not built in batches"
+
+    empty = db.query_frame("SELECT venue_id, lat FROM venues WHERE 1 = 0")
+    assert empty.empty and list(empty.columns) == ["venue_id", "lat"]
+    print(f"  ✅ Batched Arrow tables and empty frames keep their columns")
+
+    print("\n✅ Columnar query tests passed!")
+
+
+def test_spatial_queries():
+    """Test R*Tree-backed nearby lookups"""
+    print("\n🧪 Testing Spatial Queries...")
+    print("=" * 60)
+
+    db = get_database()
+
+    # Venues of this run only, around a point no other test or run uses
+    run = uuid.uuid4().hex
+    lat = 45.0 + int(run[:6], 16) % 4000 * 0.01
+    lng = -100.0
+    result = db.upsert_venues_bulk(
+        [
+            {
+                "external_id": f"spatial_{run}_{i}",
+                "provider": "spatial_test",
+                "name": f"Spatial Venue {i}",
+                "category": "bar",
+                "lat": lat + offset,
+                "lng": lng,
+            }
+            for i, offset in enumerate((0.0001, 0.0003, 0.002))
+        ]
+    )
+    assert result.success, result.message
+    nearest = db.nearby("venues", lat, lng, radius_m=150)
+    names = [v["name"] for v in nearest]
+    assert names == ["Spatial Venue 0", "Spatial Venue 1"], f"Unexpected: {names}"
+    assert all(v["distance_m"] <= 150 for v in nearest), "Radius not enforced"
+    assert len(db.nearby("venues", lat, lng, radius_m=1000, k=2)) == 2
+    print(f"  ✅ Found {len(nearest)} venues within 150m, nearest first")
+
+    # A dense box: the nearest k must match an exhaustive haversine ranking
+    result = db.upsert_venues_bulk(
+        [
+            {
+                "external_id": f"dense_{i}",
+                "provider": "spatial_dense",
+                "name": f"Dense Venue {i}",
+                "category": "bar",
+                "lat": 39.2 + (i % 40) * 0.0001,
+                "lng": -94.3 + (i // 40) * 0.0001,
+            }
+            for i in range(1600)
+        ]
+    )
+    assert result.success, result.message
+    everything = db.nearby("venues", 39.202, -94.298, radius_m=400)
+    top = db.nearby("venues", 39.202, -94.298, radius_m=400, k=5)
+    assert len(everything) > 500, len(everything)
+    assert [v["venue_id"] for v in top] == [v["venue_id"] for v in everything[:5]]
+    assert all(v["distance_m"] <= 400 for v in everything), "Radius not enforced"
+    print(f"  ✅ k=5 of {len(everything)} dense candidates matches exhaustive order")
+
+    events = db.nearby("events", 39.051, -94.58, radius_m=50)
+    assert events and all(e["venue_id"] for e in events), "Events not located"
+    print(f"  ✅ Found {len(events)} events located at nearby venues")
+
+    # Re-ingesting an event at the same venue leaves its R*Tree entry alone
+    with db.get_connection() as conn:
+        before = conn.total_changes
+        conn.execute(
+            "UPDATE events SET venue_id = venue_id WHERE event_id = ?",
+            (events[0]["event_id"],),
+        )
+        writes = conn.total_changes - before
+        conn.commit()
+    assert writes == 1, f"Unchanged event rewrote {writes - 1} index rows"
+    print(f"  ✅ Unmoved events skip the spatial index")
+
+    # Moving a venue must move it in the spatial index as well
+    venue = nearest[0]
+    db.execute_update(
+        "UPDATE venues SET lat = ? WHERE venue_id = ?", (40.0, venue["venue_id"])
+    )
+    moved = [v["venue_id"] for v in db.nearby("venues", 40.0, lng, 10)]
+    db.execute_update(
+        "UPDATE venues SET lat = ? WHERE venue_id = ?",
+        (venue["lat"], venue["venue_id"]),
+    )
+    assert moved == [venue["venue_id"]], "Spatial index not updated by trigger"
+    print(f"  ✅ Spatial index follows coordinate updates")
+
+    try:
+        db.nearby("traffic_data", 39.05, -94.58, 100)
+        assert False, "Unsupported spatial table was not rejected"
+    except ValueError:
+        print(f"  ✅ Unsupported spatial table rejected")
+
+    print("\n✅ Spatial query tests passed!")
+
+
+def test_data_summary_cache():
+    """Test trigger-maintained table stats and the cached summary"""
+    print("\n🧪 Testing Data Summary Cache...")
+    print("=" * 60)
+
+    db = get_database()
+
+    summary = db.get_data_summary(max_age_seconds=0)
+    venue_count = db.execute_query("SELECT COUNT(*) AS n FROM venues")[0]["n"]
+    assert summary["total_venues"] == venue_count, "table_stats out of sync"
+    assert db.get_data_summary() == summary, "Cached summary was not reused"
+    print(f"  ✅ Summary matches COUNT(*) and is served from cache")
+
+    result = db.upsert_venue(
+        {
+            # A new venue on every run, so the write is always an insert
+            "external_id": f"summary_cache_{uuid.uuid4().hex}",
+            "provider": "summary_cache_test",
+            "name": "Summary Cache Venue",
+            "category": "bar",
+        }
+    )
+    assert result.success, f"Failed to insert venue: {result.error}"
+    refreshed = db.get_data_summary()
+    assert refreshed["total_venues"] == venue_count + 1, "Write did not bust cache"
+    assert refreshed["located_venues"] == summary["located_venues"]
+    print(f"  ✅ Local writes invalidate the cache; counts follow inserts")
+
+    print("\n✅ Data summary cache tests passed!")
+
+
+def test_materialized_views():
+    """Test incremental refresh of the materialized master views"""
+    print("\n🧪 Testing Materialized Views...")
+    print("=" * 60)
+
+    db = get_database()
+
+    def matches_view():
+        view_rows = db.execute_query(
+            "SELECT venue_id, upcoming_events_count, median_income "
+            "FROM vw_master_venue_data ORDER BY venue_id"
+        )
+        table_rows = db.execute_query(
+            "SELECT venue_id, upcoming_events_count, median_income "
+            "FROM mv_master_venue_data ORDER BY venue_id"
+        )
+        return view_rows == table_rows
+
+    result = db.refresh_materialized(full=True)
+    assert result.success, f"Full refresh failed: {result.error}"
+    assert matches_view(), "Full refresh does not match the view"
+    print(f"  ✅ {result.message}")
+
+    venue = db.get_venues({"provider": "bulk_test", "limit": 1})[0]
+    db.upsert_events_bulk(
+        [
+            {
+                "external_id": "materialized_event",
+                "provider": "bulk_test",
+                "name": "Materialized Event",
+                "category": "music",
+                "start_time": "2099-01-01T20:00:00",
+                "venue_name": venue["name"],
+            }
+        ]
+    )
+    db.upsert_demographic_data(
+        {
+            "lat": venue["lat"],
+            "lng": venue["lng"],
+            "census_tract": "materialized_tract",
+            "median_income": 123456,
+        }
+    )
+
+    result = db.refresh_materialized()
+    assert result.success, f"Incremental refresh failed: {result.error}"
+    assert result.data["vw_master_venue_data"] < len(db.get_venues()), "Not incremental"
+    assert matches_view(), "Incremental refresh missed changed rows"
+    events = db.get_master_events_data()
+    assert any(e["name"] == "Materialized Event" for e in events), "Event not added"
+    print(f"  ✅ Incremental refresh picked up new events and demographics")
+
+    print("\n✅ Materialized view tests passed!")
+
+
+def test_write_behind_buffer():
+    """Test write-behind buffering of cache hits and logs"""
+    print("\n🧪 Testing Write-Behind Buffer...")
+    print("=" * 60)
+
+    from core.database import WriteBehindBuffer
+
+    # Coalescing and size-threshold flush
+    print("Testing hit coalescing...")
+    batches = []
+    buffer = WriteBehindBuffer(batches.append, interval=60, max_pending=2)
+    for _ in range(5):
+        buffer.record_api_cache_hit("key_a", "2024-01-01 00:00:00")
+    assert not batches, "Repeated hits on one key should not trigger a flush"
+    buffer.record_geocode_hit("some address")
+    assert len(batches) == 1, "Size threshold did not trigger a flush"
+    assert batches[0].api_cache_hits["key_a"][0] == 5, "Hits not coalesced"
+    print(f"  ✅ 6 hits coalesced into 1 flush of {len(batches[0])} entries")
+
+    # Hit accounting through the database
+    print("Testing buffered cache hit accounting...")
+    db = get_database()
+    cache_key = "write_behind_test_key"
+    db.set_api_cache(cache_key, "google_places", '{"ok": true}', 1)
+    db.flush_writes()
+    before = db.execute_query(
+        "SELECT access_count FROM api_cache WHERE cache_key = ?", (cache_key,)
+    )[0]["access_count"]
+    for _ in range(3):
+        assert db.get_api_cache(cache_key) is not None, "Cache miss"
+    db.flush_writes()
+    after = db.execute_query(
+        "SELECT access_count, last_accessed FROM api_cache WHERE cache_key = ?",
+        (cache_key,),
+    )[0]
+    assert after["access_count"] == before + 3, "Cache hits miscounted"
+    assert after["last_accessed"], "last_accessed not recorded"
+    print(f"  ✅ access_count {before} -> {after['access_count']} after 3 hits")
+
+    # Quality log rows land on read
+    print("Testing buffered quality logging...")
+    result = db.log_data_quality_issue(
+        "venues", "write_behind_venue", "accuracy", "fail", severity="low"
+    )
+    assert result.success, f"Failed to queue quality issue: {result.error}"
+    db.get_data_quality_summary()
+    rows = db.execute_query(
+        "SELECT * FROM data_quality_log WHERE record_id = ?", ("write_behind_venue",)
+    )
+    assert rows, "Queued quality issue was not flushed"
+    result = db.log_data_quality_issue("venues", "x", "accuracy", "fail", severity="?")
+    assert not result.success, "Invalid severity should be rejected up front"
+    print(f"  ✅ Quality issue flushed; invalid rows rejected before queuing")
+
+    stats = db.get_write_buffer_stats()
+    assert stats["pending"] == 0, "Entries left pending after flush"
+    print(f"  ✅ Buffer stats: {stats}")
+
+    print("\n✅ Write-behind buffer tests passed!")
+
+
+def test_event_time_ranges():
+    """Test epoch normalization and overlapping-event queries"""
+    print("\n🧪 Testing Event Time Ranges...")
+    print("=" * 60)
+
+    from datetime import datetime, timezone
+    from core.database import to_epoch_seconds
+
+    db = get_database()
+
+    print("Testing timestamp normalization...")
+    t0 = int(datetime(2031, 3, 1, 18, 0, tzinfo=timezone.utc).timestamp())
+    formats = [
+        "2031-03-01 18:00:00+00:00",
+        "2031-03-01T18:00:00Z",
+        "2031-03-01T12:00:00-06:00",
+        datetime(2031, 3, 1, 18, 0, tzinfo=timezone.utc),
+        t0 * 1000,
+        str(t0),
+    ]
+    for value in formats:
+        assert to_epoch_seconds(value) == t0, f"{value!r} normalized incorrectly"
+    assert to_epoch_seconds("not a date") is None, "Garbage should not parse"
+    print(f"  ✅ {len(formats)} formats normalized to the same epoch")
+
+    print("Testing overlapping-event queries...")
+    hour = 3600
+    events = [
+        # (name, start, end): window below is [t0, t0 + 2h)
+        ("festival", t0 - 48 * hour, t0 + 24 * hour),
+        ("ends_at_window_start", t0 - 2 * hour, t0),
+        ("instant_at_window_start", t0, None),
+        ("inside", t0 + hour, t0 + hour + 1800),
+        ("starts_at_window_end", t0 + 2 * hour, t0 + 3 * hour),
+    ]
+    result = db.upsert_events_bulk(
+        [
+            {
+                "external_id": f"range_{name}",
+                "provider": "range_test",
+                "name": name,
+                "category": "music",
+                "start_time": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+                "end_time": (
+                    datetime.fromtimestamp(end, timezone.utc).isoformat()
+                    if end
+                    else None
+                ),
+                "venue_name": "Range Test Venue",
+            }
+            for name, start, end in events
+        ]
+    )
+    assert result.success, f"Failed to upsert range events: {result.error}"
+
+    found = db.get_events_overlapping(
+        t0, t0 + 2 * hour, filters={"provider": "range_test"}
+    )
+    names = {event["name"] for event in found}
+    assert names == {"festival", "instant_at_window_start", "inside"}, names
+    print(f"  ✅ Overlap window matched {sorted(names)}")
+
+    query, params = db._events_query({"during": (t0, t0 + 2 * hour)})
+    plan = " ".join(
+        str(row) for row in db.execute_query("EXPLAIN QUERY PLAN " + query, params)
+    )
+    assert "(start_ts>? AND start_ts<?)" in plan, f"Overlap query not bounded: {plan}"
+    print(f"  ✅ Overlap query served by a bounded start_ts range scan")
+
+    print("\n✅ Event time range tests passed!")
+
+
+def test_keyset_pagination():
+    """Test keyset pagination with continuation tokens"""
+    print("\n🧪 Testing Keyset Pagination...")
+    print("=" * 60)
+
+    db = get_database()
+
+    print("Testing event pages...")
+    result = db.upsert_events_bulk(
+        [
+            {
+                "external_id": f"page_event_{i}",
+                "provider": "page_test",
+                "name": f"Page Event {i}",
+                "category": "music",
+                # Pairs share a start time so the event_id tiebreak is exercised
+                "start_time": f"2032-01-{i // 2 + 1:02d} 20:00:00",
+                "venue_name": "Page Test Venue",
+            }
+            for i in range(7)
+        ]
+    )
+    assert result.success, f"Failed to upsert page events: {result.error}"
+
+    expected = db.get_events({"provider": "page_test"})
+    walked, token, pages = [], None, 0
+    while True:
+        page = db.get_events_page(
+            after=token, size=3, filters={"provider": "page_test"}
+        )
+        walked.extend(page.items)
+        pages += 1
+        token = page.next_token
+        if token is None:
+            break
+    assert [e["event_id"] for e in walked] == [e["event_id"] for e in expected]
+    assert pages == 3, f"Expected 3 pages, got {pages}"
+    print(f"  ✅ Walked {len(walked)} events in {pages} pages")
+
+    raw = db.get_events_page(
+        after=(walked[2]["start_ts"], walked[2]["event_id"]),
+        size=3,
+        filters={"provider": "page_test"},
+    )
+    assert raw.items[0]["event_id"] == walked[3]["event_id"], "Raw cursor ignored"
+    print(f"  ✅ Raw (start_ts, event_id) cursor accepted")
+
+    query, params = db._events_query({"has_time": True, "after": (0, ""), "limit": 10})
+    plan = " ".join(
+        str(row) for row in db.execute_query("EXPLAIN QUERY PLAN " + query, params)
+    )
+    assert "idx_events_page" in plan and "TEMP B-TREE" not in plan, plan
+    print(f"  ✅ Pages served by an index range seek")
+
+    print("Testing venue pages and token validation...")
+    first = db.get_venues_page(size=1)
+    second = db.get_venues_page(after=first.next_token, size=1)
+    assert second.items[0]["venue_id"] > first.items[0]["venue_id"], "Token ignored"
+    for bad in ("garbage", first.next_token):
+        try:
+            db.get_events_page(after=bad)
+            assert False, f"Bad token {bad!r} was accepted"
+        except ValueError:
+            pass
+    print(f"  ✅ Venue tokens work and foreign/malformed tokens are rejected")
+
+    print("\n✅ Keyset pagination tests passed!")
+
+
+def test_venue_name_resolver():
+    """Test normalized venue name resolution for event ingestion"""
+    print("\n🧪 Testing Venue Name Resolver...")
+    print("=" * 60)
+
+    db = get_database()
+
+    print("Testing single event ingestion...")
+
+    def event(n: int, venue_name: str) -> dict:
+        return {
+            "external_id": f"resolver_{n}",
+            "provider": "resolver_test",
+            "name": f"Resolver Event {n}",
+            "category": "music",
+            "venue_name": venue_name,
+        }
+
+    for n, venue_name in enumerate(["  Resolver  HALL", "resolver hall"]):
+        result = db.upsert_event(event(n, venue_name))
+        assert result.success, f"Failed to upsert event: {result.error}"
+
+    venues = db.execute_query(
+        "SELECT venue_id FROM venues WHERE name_norm = ?", ("resolver hall",)
+    )
+    assert len(venues) == 1, f"Expected one shared venue, got {len(venues)}"
+    venue_id = venues[0]["venue_id"]
+    events = db.get_events({"provider": "resolver_test"})
+    assert {e["venue_id"] for e in events} == {venue_id}, "Events split across venues"
+    print(f"  ✅ Name variants resolved to one venue")
+
+    print("Testing bulk ingestion...")
+    result = db.upsert_events_bulk([event(2, "RESOLVER HALL")])
+    assert result.success, f"Bulk upsert failed: {result.error}"
+    bulk_event = db.get_events({"external_id": "resolver_2"})[0]
+    assert bulk_event["venue_id"] == venue_id, "Bulk path did not reuse the venue"
+    print(f"  ✅ Bulk path shares the resolver")
+
+    plan = " ".join(
+        str(row)
+        for row in db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT venue_id FROM venues WHERE name_norm = ?",
+            ("resolver hall",),
+        )
+    )
+    assert "idx_venues_name_norm" in plan, f"Name lookup not indexed: {plan}"
+    print(f"  ✅ Fallback lookups use idx_venues_name_norm")
+
+    print("\n✅ Venue name resolver tests passed!")
+
+
+def test_bulk_load():
+    """Test the bulk loader used for large backfills"""
+    print("\n🧪 Testing Bulk Load...")
+    print("=" * 60)
+
+    db = get_database()
+
+    print("Testing weather backfill...")
+    index_sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?"
+    indexes_before = db.execute_query(index_sql, ("weather_data",))
+    records = [
+        {
+            "lat": 39.0 + (i % 50) * 0.001,
+            "lng": -94.5,
+            "timestamp": f"2030-01-{i // 50 % 28 + 1:02d} 00:00:00",
+            "temperature_f": float(i),
+            "conditions": "clear",
+        }
+        for i in range(2000)
+    ]
+    # Repeat one key: the later record must win
+    records.append({**records[0], "temperature_f": -1.0})
+    result = db.bulk_load("weather_data", records, chunk_size=500)
+    assert result.success, f"Bulk load failed: {result.error}"
+    assert result.data.rows == 2001, f"Expected 2001 rows, got {result.data.rows}"
+    print(f"  ✅ {result.message}")
+
+    stored = db.execute_query(
+        "SELECT temperature_f, provider FROM weather_data "
+        "WHERE lat = ? AND lng = ? AND timestamp = ? AND is_forecast = 0",
+        (records[0]["lat"], records[0]["lng"], records[0]["timestamp"]),
+    )
+    assert len(stored) == 1 and stored[0]["temperature_f"] == -1.0, stored
+    assert stored[0]["provider"] == "openweather", "Default provider not applied"
+    indexes_after = db.execute_query(index_sql, ("weather_data",))
+    assert indexes_after == indexes_before, "Indexes not rebuilt after load"
+    print(f"  ✅ Last record wins and deferred indexes were rebuilt")
+
+    print("Testing event backfill...")
+    result = db.bulk_load(
+        "events",
+        [
+            {
+                "external_id": f"load_event_{i}",
+                "provider": "load_test",
+                "name": f"Load Event {i}",
+                "category": "music",
+                "start_time": "2030-02-01 20:00:00",
+                "venue_name": "Load Test Venue" if i else None,
+            }
+            for i in range(10)
+        ],
+    )
+    assert result.success, f"Event load failed: {result.error}"
+    assert (result.data.rows, result.data.skipped) == (9, 1), result.data
+    assert len(db.get_events({"provider": "load_test"})) == 9
+    print(f"  ✅ {result.message}")
+
+    line = Database._copy_line((None, True, "a\tb\\c\n", {"k": 1}))
+    assert line == '\\N\tt\ta\\tb\\\\c\\n\t{"k": 1}\n', repr(line)
+    print(f"  ✅ COPY text encoding escapes NULLs, tabs, backslashes and newlines")
+
+    print("\n✅ Bulk load tests passed!")
+
+
+def test_sql_compiler():
+    """Test SQLite-to-PostgreSQL statement compilation and prepared statements"""
+    print("\n🧪 Testing SQL Compiler...")
+    print("=" * 60)
+
+    compiler = SqlCompiler()
+
+    print("Testing dialect translation...")
+    compiled = compiler.compile(
+        "SELECT * FROM api_cache WHERE cache_key = ? "
+        "AND expires_at > datetime('now') AND note LIKE '%?%'"
+    )
+    assert compiled.sql == (
+        "SELECT * FROM api_cache WHERE cache_key = %s "
+        "AND expires_at > CURRENT_TIMESTAMP AND note LIKE '%%?%%'"
+    ), compiled.sql
+    assert compiled.prepare_sql.endswith(
+        "cache_key = $1 AND expires_at > CURRENT_TIMESTAMP AND note LIKE '%?%'"
+    ), compiled.prepare_sql
+    assert compiled.param_count == 1
+    print(f"  ✅ Placeholders, datetime('now') and quoted literals handled")
+
+    upsert = compiler.compile(
+        "INSERT OR REPLACE INTO system_config (config_key, config_value) VALUES (?, ?)"
+    ).sql
+    assert upsert.endswith(
+        "ON CONFLICT (config_key) DO UPDATE SET config_value = EXCLUDED.config_value"
+    ), upsert
+    scalar = compiler.compile("SELECT MAX(a, MIN(b, 1)), MAX(c) FROM t").sql
+    assert scalar == "SELECT GREATEST(a, LEAST(b, 1)), MAX(c) FROM t", scalar
+    epoch = compiler.compile("SELECT CAST(strftime('%s', 'now') AS INTEGER)").sql
+    assert "EXTRACT(EPOCH FROM CURRENT_TIMESTAMP)" in epoch, epoch
+    print(f"  ✅ INSERT OR REPLACE, scalar MIN/MAX and epoch rewrites")
+
+    print("Testing compile cache...")
+    misses = compiler.misses
+    for _ in range(100):
+        compiler.compile("SELECT MAX(a, MIN(b, 1)), MAX(c) FROM t")
+    assert compiler.hits == 100 and compiler.misses == misses, compiler.misses
+    print(f"  ✅ {compiler.hits} hits / {compiler.misses} misses")
+
+    print("Testing prepared statements...")
+
+    class RecordingCursor:
+        def __init__(self):
+            self.connection = type("Conn", (), {"prepared": set()})()
+            self.statements = []
+
+        def execute(self, sql, params=None):
+            self.statements.append((sql, params))
+
+    raw = RecordingCursor()
+    cursor = PgCursor(raw, compiler)
+    for venue_id in ("a", "b", "c"):
+        cursor.execute("SELECT * FROM venues WHERE venue_id = ?", (venue_id,), True)
+    name = compiler.compile("SELECT * FROM venues WHERE venue_id = ?").name
+    assert raw.statements[0] == (
+        f"PREPARE {name} AS SELECT * FROM venues WHERE venue_id = $1",
+        None,
+    ), raw.statements[0]
+    assert raw.statements[1:] == [
+        (f"EXECUTE {name} (%s)", (venue_id,)) for venue_id in ("a", "b", "c")
+    ], raw.statements
+    print(f"  ✅ Statement prepared once per connection, then executed by name")
+
+    # The SQLite backend runs the original statement text untouched
+    db = get_database()
+    assert db.get_system_config("nonexistent_compiler_key", "fallback") == "fallback"
+    print(f"  ✅ SQLite path unaffected: {db.get_sql_cache_stats()}")
+
+    print("\n✅ SQL compiler tests passed!")
+
+
+def test_write_amplification():
+    """Benchmark row and page writes per venue upsert with and without triggers"""
+    print("\n🧪 Testing Write Amplification...")
+    print("=" * 60)
+
+    import sqlite3
+    import tempfile
+
+    db = get_database()
+    schema = db.execute_query(
+        "SELECT sql FROM sqlite_master "
+        "WHERE tbl_name IN ('venues', 'change_tombstones') "
+        "AND type IN ('table', 'index') AND sql IS NOT NULL"
+    )
+    legacy_trigger = """
+        CREATE TRIGGER update_venues_timestamp AFTER UPDATE ON venues
+        FOR EACH ROW BEGIN
+            UPDATE venues SET updated_at = CURRENT_TIMESTAMP
+            WHERE venue_id = NEW.venue_id;
+        END
+    """
+
+    def venue(i, name):
+        return Database._venue_params(
+            {
+                "external_id": f"wa_{i}",
+                "provider": "bench",
+                "name": name,
+                "category": "bar",
+            }
+        )
+
+    def measure(conn, label, upserts=200):
+        """(row writes, WAL page writes) per logical upsert"""
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        changes = conn.total_changes
+        for i in range(upserts):
+            conn.execute(Database.VENUE_UPSERT_SQL, venue(i, f"{label} {i}"))
+        frames = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()[1]
+        return (conn.total_changes - changes) / upserts, frames / upserts
+
+    with tempfile.TemporaryDirectory() as scratch:
+        conn = sqlite3.connect(os.path.join(scratch, "bench.db"), isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Keep every frame in the WAL so it can be counted
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        for row in schema:
+            conn.execute(row["sql"])
+        conn.executemany(
+            Database.VENUE_UPSERT_SQL, [venue(i, f"Venue {i}") for i in range(500)]
+        )
+
+        conn.execute(legacy_trigger)
+        before = measure(conn, "Before")
+        conn.execute("DROP TRIGGER update_venues_timestamp")
+        after = measure(conn, "After")
+        conn.close()
+
+    print(f"  Before: {before[0]:.1f} row writes, {before[1]:.1f} pages per upsert")
+    print(f"  After:  {after[0]:.1f} row writes, {after[1]:.1f} pages per upsert")
+    assert before[0] == 2 and after[0] == 1, "Trigger rewrite not removed"
+    assert after[1] <= before[1], "Page writes per upsert increased"
+    print(f"  ✅ One row write per upsert without the timestamp trigger")
+
+    print("Testing retired triggers and expiry sweep...")
+    triggers = {
+        row["name"]
+        for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+    }
+    retired = {
+        "update_venues_timestamp",
+        "update_events_timestamp",
+        "update_collection_status_timestamp",
+        "auto_invalidate_expired_cache",
+    }
+    assert (
+        not triggers & retired
+    ), f"Retired triggers still installed: {triggers & retired}"
+
+    db.execute_update(
+        "INSERT OR REPLACE INTO api_cache "
+        "(cache_key, api_source, response_data, expires_at) "
+        "VALUES ('wa_expired', 'bench', '{}', datetime('now', '-1 hours'))"
+    )
+    db.set_api_cache("wa_fresh", "bench", "{}", ttl_hours=1)
+    expired = "SELECT COUNT(*) AS n FROM api_cache WHERE cache_key = 'wa_expired'"
+    assert db.execute_query(expired)[0]["n"] == 1, "Insert should not sweep the table"
+    swept = db.sweep_expired_cache(batch_size=1)
+    assert swept.success and swept.data >= 1, swept.message
+    assert db.execute_query(expired)[0]["n"] == 0, "Expired entry not swept"
+    assert db.get_api_cache("wa_fresh"), "Fresh entry was swept"
+    print(f"  ✅ {swept.message}")
+
+    print("Testing updated_at without the trigger...")
+    venue = {"external_id": "wa_stamp", "provider": "bench", "name": "Stamp"}
+    db.upsert_venue({**venue, "category": "bar"})
+    db.upsert_venue({**venue, "category": "pub"})
+    stamped = db.execute_query(
+        "SELECT updated_at >= datetime('now', '-1 minutes') "
+        "AND updated_at <= datetime('now') AS utc "
+        "FROM venues WHERE external_id = 'wa_stamp' AND provider = 'bench'"
+    )
+    assert stamped == [{"utc": 1}], "Single-row update did not stamp UTC"
+    print(f"  ✅ Single-row updates stamp updated_at in UTC")
+
+    print("\n✅ Write amplification tests passed!")
+
+
+def test_time_partitions():
+    """Test monthly partitions, rollups and partition-drop retention"""
+    print("\n🧪 Testing Time Partitions...")
+    print("=" * 60)
+
+    db = get_database()
+    # A fresh venue per run, as the 2020 partitions outlive earlier runs
+    venue_id = f"partition_test_{uuid.uuid4().hex[:8]}"
+    before = db.get_data_summary(max_age_seconds=0)["traffic_records"]
+
+    print("Testing month sealing...")
+    records = [
+        {
+            "venue_id": venue_id,
+            "timestamp": f"2020-{month:02d}-{day:02d} 18:00:00",
+            "visit_count": month * 10 + day,
+        }
+        for month in (1, 2, 3)
+        for day in (6, 7)
+    ]
+    now = datetime.now().strftime("%Y-%m-%d %H:00:00")
+    records.append({"venue_id": venue_id, "timestamp": now, "visit_count": 5})
+    assert db.bulk_load("foot_traffic_data", records).success
+
+    result = db.maintain_partitions()
+    assert result.success, result.message
+    sealed = result.data["sealed"]["foot_traffic_data"]
+    assert {"2020-01", "2020-02", "2020-03"} <= set(sealed), sealed
+
+    def rows(relation):
+        query = f"SELECT COUNT(*) AS n FROM {relation} WHERE venue_id = ?"
+        return db.execute_query(query, (venue_id,))[0]["n"]
+
+    assert rows("foot_traffic_data") == 1
+    assert rows("foot_traffic_data_p202001") == 2
+    assert rows("foot_traffic_data_all") == 7
+    summary = db.get_data_summary(max_age_seconds=0)
+    assert summary["traffic_records"] == before + 7, "Sealing changed the row count"
+    assert len(db.get_foot_traffic(venue_id, hours=2)) == 1
+    print(f"  ✅ {result.message}, current month left in the base table")
+
+    print("Testing rollups...")
+    expected = {}
+    for record in records:
+        moment = datetime.strptime(record["timestamp"], "%Y-%m-%d %H:%M:%S")
+        key = ((moment.weekday() + 1) % 7, moment.hour)
+        expected.setdefault(key, []).append(record["visit_count"])
+    profile = {
+        (row["day_of_week"], row["hour_of_day"]): row
+        for row in db.get_traffic_profile(venue_id)
+    }
+    assert set(profile) == set(expected), (sorted(profile), sorted(expected))
+    for key, visits in expected.items():
+        assert profile[key]["samples"] == len(visits)
+        assert abs(profile[key]["avg_visit_count"] - sum(visits) / len(visits)) < 1e-9
+    print(f"  ✅ Profile covers {len(profile)} day/hour slots")
+
+    # A late row for a sealed month replaces its copy in the partition
+    db.upsert_foot_traffic(
+        {"venue_id": venue_id, "timestamp": "2020-01-06 18:00:00", "visit_count": 99}
+    )
+    assert rows("foot_traffic_data_all") == 7, "Late row counted twice before seal"
+    late = db.execute_query(
+        "SELECT visit_count FROM foot_traffic_data_all "
+        "WHERE venue_id = ? AND timestamp = '2020-01-06 18:00:00'",
+        (venue_id,),
+    )
+    assert late == [{"visit_count": 99}], late
+    db.maintain_partitions()
+    rollup = db.execute_query(
+        "SELECT samples, visit_count_sum FROM foot_traffic_rollup "
+        "WHERE venue_id = ? AND month = '2020-01' AND day_of_week = 1",
+        (venue_id,),
+    )
+    assert rollup == [{"samples": 1, "visit_count_sum": 99}], rollup
+    print(f"  ✅ Late rows are resealed and their month rolled up again")
+
+    print("Testing retention...")
+    result = db.drop_partitions_before(datetime(2020, 3, 1))
+    assert result.success, result.message
+    assert {"foot_traffic_data_p202001", "foot_traffic_data_p202002"} <= set(
+        result.data["dropped"]["foot_traffic_data"]
+    ), result.data
+    assert rows("foot_traffic_data_all") == 3
+    summary = db.get_data_summary(max_age_seconds=0)
+    assert summary["traffic_records"] == before + 3, "Stats not adjusted on drop"
+    assert sum(row["samples"] for row in db.get_traffic_profile(venue_id)) == 7
+    print(f"  ✅ {result.message}, rollups kept")
+
+    print("\n✅ Time partition tests passed!")
+
+
+def test_postgres_partitions():
+    """Test PostgreSQL range partitioning, partition retention and rollups"""
+    print("\n🧪 Testing PostgreSQL Partitions...")
+    print("=" * 60)
+
+    from contextlib import contextmanager
+    from setup_database import create_postgres_partitions
+
+    print("Testing setup DDL...")
+    compiler = SqlCompiler()
+    statements = create_postgres_partitions()
+    ddl = "\n".join(statements)
+    for expected in (
+        'PARTITION BY RANGE ("timestamp")',
+        "CREATE TABLE %I PARTITION OF weather_data",
+        "CREATE TABLE foot_traffic_data_pdefault PARTITION OF foot_traffic_data "
+        "DEFAULT",
+        'ALTER TABLE weather_data ADD PRIMARY KEY (weather_id, "timestamp")',
+        'ALTER TABLE foot_traffic_data ADD UNIQUE ("venue_id", "timestamp")',
+    ):
+        assert expected in ddl, expected
+    for statement in statements:
+        assert compiler.compile(statement).prepare_sql == statement, statement
+    print(f"  ✅ {len(statements)} statements pass the compiler untouched")
+
+    current = datetime.now().strftime("%Y-%m")
+    statements = []
+
+    class RecordingCursor:
+        rowcount = 4
+
+        def execute(self, sql, params=None):
+            statements.append((" ".join(sql.split()), params))
+
+        def fetchone(self):
+            sql = statements[-1][0]
+            if "LOCALTIMESTAMP" in sql:
+                return ("2026-10-16 11:00:00",)
+            if "relkind" in sql:
+                return ("p",)
+            return (3,)
+
+        def fetchall(self):
+            sql, params = statements[-1]
+            if "pg_inherits" in sql:
+                table = params[0]
+                return [
+                    (f"{table}_p202001",),
+                    (f"{table}_p{current[:4]}{current[5:]}",),
+                ]
+            if "_pdefault" in sql:
+                return [("2020-05",)]
+            if "collected_at" in sql:
+                return [("2020-01",)]
+            return []
+
+    class RecordingConnection:
+        def cursor(self):
+            return RecordingCursor()
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+    db = Database()
+    db._db_type = "postgresql"
+    config = {}
+    db.get_system_config = lambda key, default=None: config.get(key, default)
+    db.set_system_config = lambda key, value: config.__setitem__(key, value)
+
+    @contextmanager
+    def connection():
+        yield RecordingConnection()
+
+    db.get_connection = connection
+
+    print("Testing partition maintenance...")
+    result = db.maintain_partitions()
+    assert result.success, result.message
+    upcoming = Database._shift_month(current, 1)
+    assert result.data["sealed"]["foot_traffic_data"] == ["2020-05", upcoming]
+    sql = [sql for sql, _ in statements]
+    partition = "foot_traffic_data_p202005"
+    assert sql.index(
+        f"CREATE TABLE {partition} (LIKE foot_traffic_data "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ) < sql.index(
+        f"ALTER TABLE foot_traffic_data ATTACH PARTITION {partition} "
+        "FOR VALUES FROM ('2020-05-01') TO ('2020-06-01')"
+    )
+    assert (
+        f"INSERT INTO {partition} SELECT * FROM foot_traffic_data_pdefault "
+        'WHERE "timestamp" >= %s AND "timestamp" < %s'
+    ) in sql
+    print(f"  ✅ {result.message}, default partition rows moved before attach")
+
+    rollups = [s for s in sql if s.startswith("INSERT INTO foot_traffic_rollup")]
+    assert len(rollups) == 1 and "EXTRACT(DOW FROM" in rollups[0], rollups
+    assert "FROM foot_traffic_data WHERE" in rollups[0], rollups
+    assert result.data["rollups_refreshed"] == 2
+    assert config == {Database.ROLLUP_WATERMARK_KEY: "2026-10-16 11:00:00"}
+    print("  ✅ Rollups refreshed for months collected since the watermark")
+
+    print("Testing retention...")
+    statements.clear()
+    result = db.drop_partitions_before(datetime(2020, 3, 15))
+    assert result.success, result.message
+    assert result.data["dropped"]["weather_data"] == ["weather_data_p202001"]
+    assert result.data["rows_removed"]["weather_data"] == 3 + 4
+    sql = [sql for sql, _ in statements]
+    assert sql.index(
+        "ALTER TABLE weather_data DETACH PARTITION weather_data_p202001"
+    ) < sql.index("DROP TABLE weather_data_p202001")
+    assert (
+        'DELETE FROM weather_data_pdefault WHERE "timestamp" < %s',
+        ("2020-03-01",),
+    ) in statements
+    print(f"  ✅ {result.message}")
+
+    print("\n✅ PostgreSQL partition tests passed!")
+
+
+def test_chunked_cleanup():
+    """Test the resumable, chunked cleanup job"""
+    print("\n🧪 Testing Chunked Cleanup...")
+    print("=" * 60)
+
+    db = get_database()
+    db.execute_update(
+        "INSERT OR IGNORE INTO venues (venue_id, external_id, provider, name, category) "
+        "VALUES ('cleanup_venue', 'cleanup_venue', 'cleanup_test', 'Unlocated', 'bar')"
+    )
+    for i in range(25):
+        db.execute_update(
+            """
+            INSERT INTO ml_predictions (venue_id, prediction_type, prediction_value,
+                model_version, prediction_for_datetime, generated_at)
+            VALUES ('cleanup_venue', 'attendance', 0.5, 'test', ?,
+                datetime('now', '-400 days'))
+            """,
+            (f"2020-01-01 {i:02d}:00:00",),
+        )
+    for i in range(5):
+        db.execute_update(
+            "INSERT INTO events (external_id, provider, name, category, start_ts, "
+            "venue_id) VALUES (?, 'cleanup_test', 'Old Event', 'music', ?, "
+            "'cleanup_venue')",
+            (f"cleanup_event_{i}", 1_000_000 + i),
+        )
+    # A located venue whose only psychographic prediction expires
+    db.execute_update(
+        "INSERT OR IGNORE INTO venues (venue_id, external_id, provider, name, "
+        "category, lat, lng) VALUES ('cleanup_located', 'cleanup_located', "
+        "'cleanup_test', 'Located', 'bar', 39.05, -94.55)"
+    )
+    db.execute_update(
+        "INSERT INTO ml_predictions (venue_id, prediction_type, prediction_value, "
+        "model_version, generated_at) VALUES ('cleanup_located', "
+        "'psychographic_match', 0.9, 'test', datetime('now', '-400 days'))"
+    )
+    db.refresh_materialized(full=True)
+    located = (
+        "SELECT prediction_value FROM mv_master_venue_data "
+        "WHERE venue_id = 'cleanup_located'"
+    )
+    assert db.execute_query(located)[0]["prediction_value"] == 0.9
+
+    print("Testing interrupted run...")
+    updates = []
+
+    def interrupt(status):
+        updates.append(status)
+        if len(updates) == 2:
+            raise KeyboardInterrupt("simulated interruption")
+
+    try:
+        db.cleanup_old_data(days=30, chunk_size=10, pause_seconds=0, progress=interrupt)
+        assert False, "Interrupted cleanup did not stop"
+    except KeyboardInterrupt:
+        pass
+    remaining = (
+        "SELECT COUNT(*) AS n FROM ml_predictions "
+        "WHERE venue_id IN ('cleanup_venue', 'cleanup_located')"
+    )
+    assert db.execute_query(remaining)[0]["n"] == 6, "Chunks were not committed"
+    saved = db.get_system_config("cleanup_progress")
+    assert saved["table"] == "ml_predictions" and saved["deleted"] == {
+        "ml_predictions": 20
+    }, saved
+    print(
+        f"  ✅ Stopped after {saved['deleted']['ml_predictions']} rows, progress saved"
+    )
+
+    print("Testing resumed run...")
+    result = db.cleanup_old_data(days=30, chunk_size=10, pause_seconds=0)
+    assert result.success, result.message
+    assert result.data["resumed"], "Saved progress was not resumed"
+    assert result.data["predictions_removed"] == 26, result.data
+    assert result.data["events_removed"] >= 5, result.data
+    assert db.execute_query(remaining)[0]["n"] == 0
+    assert db.get_system_config("cleanup_progress") is None, "Progress not cleared"
+    assert not db.get_events({"provider": "cleanup_test"})
+    print(f"  ✅ {result.message}")
+
+    refreshed = result.data["views_refreshed"]["vw_master_venue_data"]
+    assert refreshed < len(db.get_venues()), "Cleanup rebuilt the whole view"
+    expired = db.execute_query(located)[0]["prediction_value"]
+    assert expired is None, "Expired prediction still in the materialized view"
+    print(f"  ✅ Tombstones refreshed {refreshed} venue rows incrementally")
+
+    free_pages = db.execute_query("SELECT * FROM pragma_freelist_count()")
+    assert list(free_pages[0].values()) == [0], "Free pages were not reclaimed"
+    assert result.data["freed_bytes"] >= 0
+    print(f"  ✅ Incremental vacuum returned free pages to the OS")
+
+    print("\n✅ Chunked cleanup tests passed!")
+
+
+def test_change_feed():
+    """Test the sequence-numbered change feed"""
+    print("\n🧪 Testing Change Feed...")
+    print("=" * 60)
+
+    db = get_database()
+
+    def drain(table, watermark=None):
+        changes = []
+        while True:
+            batch = db.get_changes_since(table, watermark, batch=500)
+            changes.extend(batch.changes)
+            watermark = batch.watermark
+            if not batch.has_more:
+                return changes, watermark
+
+    _, watermark = drain("venues")
+    assert not db.get_changes_since("venues", watermark).changes
+    print("  ✅ Caught up with the existing venues")
+
+    print("Testing upserts...")
+    venue = {
+        "external_id": "change_feed_venue",
+        "provider": "change_feed_test",
+        "name": "Change Feed Venue",
+        "category": "bar",
+    }
+    assert db.upsert_venue(venue).success
+    changes, _ = drain("venues", watermark)
+    assert [c["op"] for c in changes] == ["upsert"], changes
+    venue_id, first_seq = changes[0]["key"], changes[0]["change_seq"]
+    assert changes[0]["row"]["name"] == "Change Feed Venue"
+
+    assert db.upsert_venue({**venue, "name": "Change Feed Venue II"}).success
+    db.upsert_venues_bulk([{**venue, "external_id": "change_feed_bulk"}])
+    changes, watermark = drain("venues", watermark)
+    assert len(changes) == 2, changes
+    assert changes[0]["key"] == venue_id and changes[0]["change_seq"] > first_seq
+    assert changes[0]["row"]["name"] == "Change Feed Venue II"
+    assert changes[1]["change_seq"] > changes[0]["change_seq"]
+    print(f"  ✅ Updates move a row to the end of the feed, once")
+
+    print("Testing tombstones...")
+    db.execute_update(
+        "DELETE FROM venues WHERE provider = 'change_feed_test' AND venue_id = ?",
+        (venue_id,),
+    )
+    changes, watermark = drain("venues", watermark)
+    assert [(c["op"], c["key"]) for c in changes] == [("delete", venue_id)], changes
+    assert not db.get_changes_since("venues", watermark).changes
+    print(f"  ✅ Deletes arrive as tombstones")
+
+    print("Testing paging and validation...")
+    first = db.get_changes_since("venues", batch=1)
+    second = db.get_changes_since("venues", first.watermark, batch=1)
+    assert first.has_more and len(first.changes) == len(second.changes) == 1
+    assert (second.changes[0]["change_seq"], second.changes[0]["key"]) > (
+        first.changes[0]["change_seq"],
+        first.changes[0]["key"],
+    )
+    for table, token in (("sessions", None), ("events", watermark), ("venues", "x")):
+        try:
+            db.get_changes_since(table, token)
+            assert False, f"Accepted {table} / {token}"
+        except ValueError:
+            pass
+    print(f"  ✅ Batches resume strictly after the watermark")
+
+    plan = db.execute_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM venues "
+        "WHERE (change_seq, venue_id) > (?, ?) ORDER BY change_seq, venue_id",
+        (0, ""),
+    )
+    assert "idx_venues_change_seq" in " ".join(row["detail"] for row in plan), plan
+    print(f"  ✅ Feed reads use idx_venues_change_seq")
+
+    print("\n✅ Change feed tests passed!")
+
+
+def test_postgres_change_feed():
+    """Test the PostgreSQL change feed DDL and its in-flight transaction cap"""
+    print("\n🧪 Testing PostgreSQL Change Feed...")
+    print("=" * 60)
+
+    from contextlib import contextmanager
+    from core.database import next_change_seq
+    from setup_database import create_postgres_change_feed
+
+    print("Testing setup DDL...")
+    compiler = SqlCompiler()
+    statements = create_postgres_change_feed()
+    ddl = "\n".join(statements)
+    for table in Database.CHANGE_FEEDS:
+        for expected in (
+            f"CREATE SEQUENCE IF NOT EXISTS {table}_change_seq",
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS change_seq BIGINT",
+            f"CREATE TRIGGER {table}_change_xid",
+            f"CREATE TRIGGER {table}_tombstone",
+            f"nextval('{table}_change_seq')",
+        ):
+            assert expected in ddl, expected
+    for statement in statements:
+        assert compiler.compile(statement).prepare_sql == statement, statement
+    print(f"  ✅ {len(statements)} statements pass the compiler untouched")
+
+    write = compiler.compile(
+        f"UPDATE venues SET change_seq = {next_change_seq('venues')} "
+        "WHERE venue_id = ?"
+    ).sql
+    assert write == (
+        "UPDATE venues SET change_seq = nextval('venues_change_seq') "
+        "WHERE venue_id = %s"
+    ), write
+    print("  ✅ Writes draw change_seq from the sequence")
+
+    print("Testing transaction-ordered reads...")
+    # Transaction 9 committed seq 6 and 7 after transaction 10 took seq 5
+    results = [
+        [(10, 5, "venue_a"), (9, 7, "venue_b")],
+        [("venue_c", 9, 6)],
+    ]
+    statements = []
+
+    class RecordingCursor:
+        description = [("change_xid",), ("change_seq",), ("venue_id",)]
+
+        def execute(self, sql, params=None):
+            statements.append((sql, params))
+
+        def fetchall(self):
+            return results.pop(0)
+
+    class RecordingConnection:
+        def cursor(self):
+            return RecordingCursor()
+
+        def rollback(self):
+            pass
+
+    db = Database()
+    db._db_type = "postgresql"
+
+    @contextmanager
+    def connection():
+        yield RecordingConnection()
+
+    db.get_connection = connection
+    batch = db.get_changes_since("venues")
+    reads = [sql for sql, _ in statements if "SELECT" in sql]
+    assert len(reads) == 2 and all(
+        "change_xid < txid_snapshot_xmin(txid_current_snapshot())" in sql
+        and "ORDER BY change_xid, change_seq" in sql
+        for sql in reads
+    ), reads
+    assert [(c["change_xid"], c["change_seq"]) for c in batch.changes] == [
+        (9, 6),
+        (9, 7),
+        (10, 5),
+    ], batch.changes
+    assert [c["op"] for c in batch.changes] == ["delete", "upsert", "upsert"]
+    assert db._decode_page_token("venues changes", batch.watermark, 3) == [
+        10,
+        5,
+        "venue_a",
+    ]
+    print("  ✅ Only settled transactions are read, in transaction order")
+
+    print("\n✅ PostgreSQL change feed tests passed!")
+
+
+def test_full_text_search():
+    """Test FTS5 search over venue and event names and descriptions"""
+    print("\n🧪 Testing Full-Text Search...")
+    print("=" * 60)
+
+    import time
+
+    db = get_database()
+    base = {"provider": "search_test", "category": "bar", "lat": 39.1, "lng": -94.58}
+    db.upsert_venues_bulk(
+        [
+            {**base, "external_id": "search_1", "name": "Blue Room Jazz Club"},
+            {
+                **base,
+                "external_id": "search_2",
+                "name": "Café Quetzal",
+                "description": "Jazz brunch on weekends",
+                "lat": 38.9,
+            },
+            {**base, "external_id": "search_3", "name": "Riverside Brewery"},
+        ]
+        + [
+            {**base, "external_id": f"search_bulk_{i}", "name": f"Filler Venue {i}"}
+            for i in range(2000)
+        ]
+    )
+
+    print("Testing ranking and matching...")
+    results = db.search("jazz", "venues")
+    names = [row["name"] for row in results]
+    assert names[:2] == ["Blue Room Jazz Club", "Café Quetzal"], names
+    assert results[0]["score"] > results[1]["score"], "Names should outrank text"
+    assert [r["name"] for r in db.search("cafe quetz")] == ["Café Quetzal"]
+    assert not db.search("jazz brewery")
+    assert len(db.search("jazz brewery", match_all=False)) == 3
+    assert db.search("  ?!  ") == []
+    print(f"  ✅ BM25 ranking, prefixes, accents and any-word matching work")
+
+    bounds = {"min_lat": 39.0, "max_lat": 39.2, "min_lng": -95, "max_lng": -94}
+    assert [r["name"] for r in db.search("jazz", bounds=bounds)] == [
+        "Blue Room Jazz Club"
+    ]
+    print(f"  ✅ Results can be limited to a bounding box")
+
+    print("Testing index maintenance...")
+    db.upsert_venue({**base, "external_id": "search_3", "name": "Riverside Taproom"})
+    assert not db.search("brewery") and db.search("taproom")
+    db.execute_update("DELETE FROM venues WHERE external_id = 'search_1'")
+    assert [r["name"] for r in db.search("jazz")] == ["Café Quetzal"]
+    db.upsert_events_bulk(
+        [
+            {
+                "external_id": "search_event",
+                "provider": "search_test",
+                "name": "Late Night Jam Session",
+                "category": "music",
+                "start_time": "2099-01-01T22:00:00",
+                "venue_name": "Café Quetzal",
+            }
+        ]
+    )
+    events = db.search("jam", "events")
+    assert [e["venue_name"] for e in events] == ["Café Quetzal"], events
+    print(f"  ✅ Inserts, renames and deletes keep the index in sync")
+
+    start = time.perf_counter()
+    for _ in range(20):
+        db.search("filler venue 1999")
+    elapsed_ms = (time.perf_counter() - start) / 20 * 1000
+    assert elapsed_ms < 50, f"Search took {elapsed_ms:.1f} ms"
+    print(
+        f"  ✅ Search over {db.get_data_summary()['total_venues']} venues: "
+        f"{elapsed_ms:.2f} ms"
+    )
+
+    try:
+        db.search("jazz", "users")
+        assert False, "Unknown search kind accepted"
+    except ValueError:
+        pass
+
+    print("\n✅ Full-text search tests passed!")
+
+
+def test_psychographic_columns():
+    """Test psychographic scores stored as indexed float columns"""
+    print("\n🧪 Testing Psychographic Columns...")
+    print("=" * 60)
+
+    db = get_database()
+    # A provider of its own per run, so the raw row below always needs backfill
+    provider = f"psych_{uuid.uuid4().hex[:8]}"
+    scores = {"career_driven": 0.2, "competent": 0.4, "fun": 0.95, "social": 0.7}
+    venue = {
+        "external_id": "psych_column_venue",
+        "provider": provider,
+        "name": "Psych Column Venue",
+        "category": "nightclub",
+        "psychographic_relevance": scores,
+    }
+
+    print("Testing write paths...")
+    assert db.upsert_venue(venue).success
+    row = db.get_venues({"provider": provider})[0]
+    assert row["psychographic_fun"] == 0.95 and row["psychographic_social"] == 0.7
+    assert row["psychographic_adventurous"] is None, "Missing score should be NULL"
+
+    db.upsert_venues_bulk([{**venue, "psychographic_relevance": {"fun": 0.1}}])
+    row = db.get_venues({"provider": provider})[0]
+    assert row["psychographic_fun"] == 0.1 and row["psychographic_social"] is None
+    print(f"  ✅ Single and bulk upserts keep the columns in step with the JSON")
+
+    db.execute_update(
+        "INSERT INTO venues (external_id, provider, name, category, "
+        "psychographic_relevance) VALUES ('psych_raw', ?, 'Raw', 'bar', ?)",
+        (provider, json.dumps({"competent": 0.85})),
+    )
+    result = db.normalize_psychographic_scores()
+    assert result.success and result.data == 1, result.message
+    raw = db.get_venues({"provider": provider, "external_id": "psych_raw"})[0]
+    assert raw["psychographic_competent"] == 0.85
+    assert db.normalize_psychographic_scores().data == 0, "Backfill not idempotent"
+    print(f"  ✅ {result.message}")
+
+    print("Testing reads...")
+    found = db.get_venues({"provider": provider, "psychographic_min": 0.8})
+    assert [v["external_id"] for v in found] == ["psych_raw"], found
+    found = db.get_venues({"provider": provider, "psychographic_min": {"fun": 0.05}})
+    assert [v["external_id"] for v in found] == ["psych_column_venue"], found
+    query, params = db._venues_query({"psychographic_min": {"fun": 0.9}})
+    assert "json" not in query.lower(), query
+    plan = db.execute_query(f"EXPLAIN QUERY PLAN {query}", params)
+    assert "idx_venues_fun" in " ".join(r["detail"] for r in plan), plan
+    print(f"  ✅ Score filters compare plain columns through idx_venues_fun")
+
+    frame = db.venues_frame({"provider": provider})
+    assert str(frame["psychographic_competent"].dtype) == "float64"
+    print(f"  ✅ Columnar reads return float64 score columns")
+
+    print("\n✅ Psychographic column tests passed!")
+
+
 def run_all_tests():
     """Run all database tests"""
     print("🚀 Running Comprehensive Database Tests")
@@ -339,6 +1843,28 @@ def run_all_tests():
         test_master_views()
         test_venue_and_event_operations()
         test_data_summary()
+        test_connection_pool()
+        test_bulk_upserts()
+        test_filter_pushdown()
+        test_streaming_iterators()
+        test_columnar_queries()
+        test_spatial_queries()
+        test_data_summary_cache()
+        test_materialized_views()
+        test_write_behind_buffer()
+        test_event_time_ranges()
+        test_keyset_pagination()
+        test_venue_name_resolver()
+        test_bulk_load()
+        test_sql_compiler()
+        test_write_amplification()
+        test_time_partitions()
+        test_postgres_partitions()
+        test_chunked_cleanup()
+        test_change_feed()
+        test_postgres_change_feed()
+        test_full_text_search()
+        test_psychographic_columns()
 
         print("\n" + "=" * 80)
         print("🎉 ALL DATABASE TESTS PASSED SUCCESSFULLY!")
@@ -353,6 +1879,28 @@ def run_all_tests():
         print("  - Master views: ✅")
         print("  - Psychographic data handling: ✅")
         print("  - Data summary reporting: ✅")
+        print("  - Connection pooling: ✅")
+        print("  - Bulk upserts: ✅")
+        print("  - Filter pushdown: ✅")
+        print("  - Streaming iterators: ✅")
+        print("  - Columnar queries: ✅")
+        print("  - Spatial queries: ✅")
+        print("  - Data summary cache: ✅")
+        print("  - Materialized views: ✅")
+        print("  - Write-behind buffer: ✅")
+        print("  - Event time ranges: ✅")
+        print("  - Keyset pagination: ✅")
+        print("  - Venue name resolver: ✅")
+        print("  - Bulk load: ✅")
+        print("  - SQL compiler: ✅")
+        print("  - Write amplification: ✅")
+        print("  - Time partitions: ✅")
+        print("  - PostgreSQL partitions: ✅")
+        print("  - Chunked cleanup: ✅")
+        print("  - Change feed: ✅")
+        print("  - PostgreSQL change feed: ✅")
+        print("  - Full-text search: ✅")
+        print("  - Psychographic columns: ✅")
 
         return True
 
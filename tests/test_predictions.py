@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Test the prediction service for PPM application
+
+Batch inference, model handling and feature building against the database
+"""
+
+import gc
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from core.database import get_database, to_epoch_seconds, utc_offset_spans
+from features.predictions import (
+    FeaturePipeline,
+    PredictionService,
+    get_model_watcher,
+)
+
+# Saved database path and instance while the tests run on a scratch database
+_scratch = {}
+
+
+def setup_module():
+    """Point the tests at a scratch database so trained models never reach
+    the model registry of the real one"""
+    import core.database as database
+    import setup_database
+
+    _scratch["dir"] = tempfile.mkdtemp(prefix="ppm_predictions_")
+    _scratch["path"] = os.environ.get("SQLITE_DB_PATH")
+    _scratch["instance"] = database._db_instance
+    os.environ["SQLITE_DB_PATH"] = os.path.join(_scratch["dir"], "ppm.db")
+    database._db_instance = None
+    assert setup_database.setup_database(), "Scratch database setup failed"
+
+
+def teardown_module():
+    """Restore the real database and remove the scratch one"""
+    import core.database as database
+
+    database.get_database().close()
+    database._db_instance = _scratch["instance"]
+    if _scratch["path"] is None:
+        os.environ.pop("SQLITE_DB_PATH", None)
+    else:
+        os.environ["SQLITE_DB_PATH"] = _scratch["path"]
+    shutil.rmtree(_scratch["dir"], ignore_errors=True)
+
+
+def make_service() -> PredictionService:
+    """Prediction service with a freshly trained model in a scratch directory"""
+    service = PredictionService()
+    service.model_dir = tempfile.mkdtemp(prefix="ppm_models_", dir=_scratch["dir"])
+    service.model_path = os.path.join(
+        service.model_dir, f"ppm_model_{service.current_model_version}.pkl"
+    )
+    result = service.train_model(retrain=True)
+    assert result.success, f"Training failed: {result.error_message}"
+    return service
+
+
+def seed_venues(count: int, provider: str = "batch_test"):
+    """Insert located venues with ratings and psychographic scores"""
+    db = get_database()
+    categories = ["bar", "restaurant", "museum", "nightclub"]
+    result = db.upsert_venues_bulk(
+        [
+            {
+                "external_id": f"{provider}_{i}",
+                "provider": provider,
+                "name": f"Batch Venue {i}",
+                "category": categories[i % len(categories)],
+                "lat": 39.0 + (i % 100) / 1000,
+                "lng": -94.6 + (i % 37) / 1000,
+                "avg_rating": (i % 50) / 10,
+                "psychographic_relevance": {"fun": (i % 10) / 10, "social": 0.5},
+            }
+            for i in range(count)
+        ]
+    )
+    assert result.success, result.message
+    return [venue["venue_id"] for venue in db.get_venues({"provider": provider})]
+
+
+def test_batch_predictions():
+    """Test vectorized batch inference"""
+    print("\n🧪 Testing Batch Predictions...")
+    print("=" * 60)
+
+    db = get_database()
+    venue_ids = seed_venues(200)
+    service = make_service()
+
+    print("Testing parity with single predictions...")
+    batch = service.predict_venues_batch(venue_ids[:50], store=False)
+    assert [p.venue_id for p in batch] == sorted(venue_ids[:50])
+    for prediction in batch[:10]:
+        single = service.predict_venue_attendance(prediction.venue_id, store=False)
+        assert abs(single.prediction_value - prediction.prediction_value) < 1e-6, (
+            single,
+            prediction,
+        )
+    print(f"  ✅ Batch scores match predict_venue_attendance")
+
+    matrix = service._feature_matrix(db.venues_frame({"venue_id": venue_ids[:5]}))
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (5, len(service.feature_columns))
+    print(f"  ✅ Features form one {matrix.dtype} matrix")
+
+    print("Testing storage...")
+    predictions = service.predict_venues_batch(venue_ids + ["missing_venue"])
+    assert len(predictions) == len(venue_ids), "Unknown ids should be skipped"
+    stored = db.execute_query(
+        "SELECT COUNT(*) AS n FROM ml_predictions p JOIN venues v "
+        "ON v.venue_id = p.venue_id WHERE v.provider = 'batch_test' "
+        "AND p.prediction_type = 'attendance'"
+    )[0]["n"]
+    assert stored == len(venue_ids), f"Stored {stored} of {len(venue_ids)}"
+    print(f"  ✅ Stored {stored} predictions in one bulk write")
+
+    print("Testing throughput...")
+    seed_venues(5000, provider="batch_bench")
+    start = time.perf_counter()
+    scored = service.predict_venues_batch(store=False)
+    elapsed = time.perf_counter() - start
+    assert len(scored) >= 5200
+    assert elapsed < 5, f"Scoring {len(scored)} venues took {elapsed:.2f}s"
+    print(f"  ✅ Scored {len(scored)} venues in {elapsed:.2f}s")
+
+    print("\n✅ Batch prediction tests passed!")
+
+
+def test_model_cache():
+    """Test the resident model cache and hot reload"""
+    print("\n🧪 Testing Model Cache...")
+    print("=" * 60)
+
+    venue_id = seed_venues(5, provider="model_cache_test")[0]
+    trainer = make_service()
+
+    print("Testing residency...")
+    stats = trainer.get_model_cache_stats()
+    assert stats["path"] == trainer.model_path and stats["sha256"]
+    assert trainer._load_model() is trainer._load_model()
+    assert trainer.get_model_cache_stats()["misses"] == 0
+    print(f"  ✅ Trained model installed without a reload from disk")
+
+    reader = PredictionService()
+    reader.model_dir, reader.model_path = trainer.model_dir, trainer.model_path
+    reader._model_reload_interval = 0
+    first = reader.predict_venue_attendance(venue_id, store=False)
+    reader._deserialize_model = None  # any further parse would fail
+    for _ in range(20):
+        again = reader.predict_venue_attendance(venue_id, store=False)
+        assert again.prediction_value == first.prediction_value
+    stats = reader.get_model_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] >= 20, stats
+    assert stats["load_seconds"] > 0 and stats["loaded_at"] is not None
+    print(f"  ✅ 1 load ({stats['load_seconds']:.4f}s), {stats['hits']} cache hits")
+
+    print("Testing reload...")
+    del reader._deserialize_model
+    resident = reader._load_model()
+    with open(reader.model_path, "rb") as f:
+        other_model = f.read()
+    assert reader.reload_model() is False, "Unchanged file should not reload"
+    os.utime(reader.model_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert reader.reload_model() is True
+    assert reader._load_model() is resident, "Same content should keep the model"
+
+    with open(reader.model_path, "ab") as f:
+        f.write(b"\0not a model")
+    assert reader.reload_model() is False, "Corrupt file should not swap in"
+    assert reader._load_model() is resident
+    print(f"  ✅ Touched and corrupt files keep the resident model")
+
+    trainer.train_model(retrain=True)
+    assert reader.reload_model() is True
+    assert reader._load_model() is not resident
+    stats = reader.get_model_cache_stats()
+    assert stats["sha256"] == trainer.get_model_cache_stats()["sha256"]
+    assert stats["reloads"] == 2, stats
+    print(f"  ✅ New model file swapped in ({stats['reloads']} reloads)")
+
+    # Other bytes under a registered version are refused, even a valid model
+    with open(reader.model_path, "wb") as f:
+        f.write(other_model + b"\n")
+    assert reader.reload_model() is False, "Registry sha256 was not enforced"
+    assert reader.get_model_cache_stats()["sha256"] == stats["sha256"]
+    assert reader.reload_model() is False
+    print(f"  ✅ Files that differ from the registry are not served")
+
+    print("Testing shared watcher...")
+    watcher = get_model_watcher()
+    services = [PredictionService() for _ in range(3)]
+    for service in services:
+        assert service._load_model() is not None
+    assert watcher.watching() >= 3
+    threads = [t for t in threading.enumerate() if t.name == "ppm-model-reload"]
+    assert len(threads) == 1, threads
+    watcher.poll()
+
+    watching = watcher.watching()
+    probe = weakref.ref(services[0])
+    del services, service
+    gc.collect()
+    assert probe() is None, "Watcher kept a service alive"
+    assert watcher.watching() == watching - 3
+    print(f"  ✅ One watcher thread, services freed when dropped")
+
+    print("\n✅ Model cache tests passed!")
+
+
+def test_model_registry():
+    """Test model version registration, promotion and shadow scoring"""
+    print("\n🧪 Testing Model Registry...")
+    print("=" * 60)
+
+    db = get_database()
+    venue_ids = seed_venues(50, provider="registry_test")
+    service = make_service()
+    production = service.current_model_version
+
+    print("Testing registration...")
+    row = db.get_model_versions(version=production)[0]
+    assert row["is_production"] and row["model_file_path"] == service.model_path
+    assert row["feature_list"] == service.feature_columns
+    assert isinstance(row["hyperparameters"], dict), row["hyperparameters"]
+    assert row["model_size_mb"] > 0 and row["training_duration"] > 0
+    assert row["model_sha256"] == service.get_model_cache_stats()["sha256"]
+    print(f"  ✅ Registered {production} ({row['model_size_mb'] * 1024:.0f} KB)")
+
+    candidate = service.train_model(retrain=True, promote=False)
+    assert candidate.success and candidate.model_version != production
+    assert service.current_model_version == production
+    assert db.get_production_model()["version"] == production
+    print(f"  ✅ Candidate {candidate.model_version} registered, not promoted")
+
+    print("Testing shadow scoring...")
+    scored = service.predict_venues_batch(
+        venue_ids, shadow_version=candidate.model_version
+    )
+    assert all(p.model_version == production for p in scored)
+    assert all(p.shadow.model_version == candidate.model_version for p in scored)
+    plain = service.predict_venues_batch(venue_ids, store=False)
+    assert [p.prediction_value for p in plain] == [p.prediction_value for p in scored]
+    shadow_rows = db.get_predictions(
+        venue_ids, {"prediction_type": "attendance_shadow"}
+    )
+    assert len(shadow_rows) == len(venue_ids)
+    assert {r["model_version"] for r in shadow_rows} == {candidate.model_version}
+    print(f"  ✅ {len(scored)} venues scored by both versions in one pass")
+
+    print("Testing promotion and rollback...")
+    assert service.promote(candidate.model_version).success
+    promoted = service.predict_venues_batch(venue_ids, store=False)
+    assert [p.prediction_value for p in promoted] == [
+        p.shadow.prediction_value for p in scored
+    ]
+    assert PredictionService().current_model_version == candidate.model_version
+
+    start = time.perf_counter()
+    assert service.promote(production).success
+    elapsed = time.perf_counter() - start
+    assert service.current_model_version == production
+    assert elapsed < 0.5, f"Rollback took {elapsed:.3f}s"
+    print(f"  ✅ Rolled back to {production} in {elapsed * 1000:.1f}ms")
+
+    assert not service.promote("v_missing").success
+    assert db.get_production_model()["version"] == production
+    production_rows = db.get_model_versions(production_only=True)
+    assert len(production_rows) == 1, production_rows
+    print(f"  ✅ Unknown versions are refused, one production model remains")
+
+    print("\n✅ Model registry tests passed!")
+
+
+def test_feature_pipeline():
+    """Test the persisted feature pipeline shared by training and serving"""
+    print("\n🧪 Testing Feature Pipeline...")
+    print("=" * 60)
+
+    db = get_database()
+    venue_ids = seed_venues(40, provider="pipeline_test")
+    service = make_service()
+
+    print("Testing fit and transform...")
+    frame = pd.DataFrame(
+        {
+            "category": ["bar", "museum", "bar", None, "zoo"],
+            "avg_rating": [4.0, 0.0, None, 2.0, 5.0],
+            "lat": [39.1, None, 39.2, 39.0, 39.3],
+            "lng": [-94.5, None, -94.6, -94.4, -94.7],
+        }
+    )
+    pipeline = FeaturePipeline.fit(frame.iloc[:4], service.feature_columns)
+    assert pipeline.categories == ["bar", "museum"]
+    matrix = pipeline.transform(frame)
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (5, len(service.feature_columns))
+    column = {name: i for i, name in enumerate(pipeline.columns)}
+    codes = matrix[:, column["venue_category_encoded"]].tolist()
+    assert codes == [1, 2, 1, 0, 0], f"Unknown categories should be 0: {codes}"
+    ratings = matrix[:, column["avg_rating"]].tolist()
+    assert ratings == [4.0, 3.0, 3.0, 2.0, 5.0], ratings
+    assert matrix[:, column["has_location"]].tolist() == [1, 0, 1, 1, 1]
+    print(f"  ✅ Vocabulary {pipeline.categories}, median rating fill 3.0")
+
+    print("Testing training/serving parity...")
+    training = db.venues_frame()
+    training["label"] = 0
+    X, _, fitted = service._preprocess_training_data(training)
+    served = service._feature_matrix(training, fitted)
+    assert np.array_equal(X.to_numpy(dtype=np.float32), served)
+    print(f"  ✅ Training and serving matrices match ({served.shape[0]} rows)")
+
+    print("Testing persistence...")
+    resident = service._load_resident_model().pipeline
+    sidecar = service._pipeline_path(service.model_path)
+    assert os.path.exists(sidecar)
+    assert FeaturePipeline.load(sidecar) == resident
+    reader = PredictionService()
+    reader._model_reload_interval = 0
+    assert reader._load_resident_model().pipeline == resident
+    frame = db.venues_frame({"venue_id": venue_ids})
+    assert np.array_equal(reader._feature_matrix(frame), service._feature_matrix(frame))
+    print(f"  ✅ Pipeline saved with {service.current_model_version} and reloaded")
+
+    print("\n✅ Feature pipeline tests passed!")
+
+
+def test_event_features():
+    """Test event-derived venue features from the grouped aggregation"""
+    print("\n🧪 Testing Event Features...")
+    print("=" * 60)
+
+    db = get_database()
+    # Fresh venues and event ids per run, so reruns against one database work
+    provider = f"event_feature_{uuid.uuid4().hex[:8]}"
+    busy, quiet = seed_venues(2, provider=provider)
+    now = datetime.now().replace(microsecond=0)
+
+    print("Testing aggregation...")
+    # (days from now, local start hour, attendance)
+    for i, (days, hour, attendance) in enumerate(
+        [(-2, 19, 100), (-20, 10, 200), (-60, 21, None), (-200, 20, 50), (5, 19, None)]
+    ):
+        start = (now + timedelta(days=days)).replace(hour=hour, minute=0, second=0)
+        start_ts = to_epoch_seconds(start)
+        # Hours come from start_ts; start_time text may be UTC or free-form
+        start_time = {
+            0: datetime.fromtimestamp(start_ts, timezone.utc).isoformat(),
+            2: "late evening",
+        }.get(i, start.isoformat())
+        result = db.execute_update(
+            "INSERT INTO events (external_id, provider, name, category, start_time, "
+            "start_ts, venue_id, actual_attendance) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                f"{provider}_event_{i}",
+                provider,
+                f"Feature Event {i}",
+                "music",
+                start_time,
+                start_ts,
+                busy,
+                attendance,
+            ),
+        )
+        assert result.success, result.message
+
+    frame = db.venue_event_features([busy, quiet], now=now)
+    assert frame["venue_id"].tolist() == [busy], "Venues without events get no row"
+    row = frame.iloc[0]
+    counts = [row[f"event_count_last_{d}d"] for d in db.EVENT_FEATURE_WINDOWS]
+    assert counts == [1, 2, 3], counts
+    assert row["upcoming_event_count"] == 1
+    assert row["avg_event_attendance"] == 150.0, row["avg_event_attendance"]
+    assert row["prime_time_share"] == 0.75, row["prime_time_share"]
+    print(f"  ✅ Windows {counts}, 1 upcoming, 75% prime time")
+
+    empty = db.venue_event_features([])
+    assert empty.empty and list(empty.columns) == list(frame.columns)
+    spans = utc_offset_spans(
+        to_epoch_seconds("2026-01-01"),
+        to_epoch_seconds("2027-01-01"),
+        "America/Chicago",
+    )
+    assert [offset for _, offset in spans] == [-21600, -18000, -21600], spans
+    assert datetime.fromtimestamp(spans[1][0], timezone.utc).hour == 8
+    print(f"  ✅ DST spans found to the second, empty id lists short-circuit")
+
+    print("Testing training and serving inputs...")
+    service = make_service()
+    training = service._load_training_data().set_index("venue_id")
+    assert training.loc[busy, "event_count_last_90d"] == 3
+    assert training.loc[quiet, "event_count_last_90d"] == 0
+    assert np.isnan(training.loc[quiet, "avg_event_attendance"])
+
+    column = service.feature_columns.index("upcoming_event_count")
+    venues = db.venues_frame({"venue_id": [busy, quiet]})
+    served = service._feature_matrix(service._with_event_features(venues))
+    upcoming = dict(zip(venues["venue_id"], served[:, column]))
+    assert upcoming == {busy: 1, quiet: 0}, upcoming
+    single = service._prepare_prediction_features(db.get_venue(busy))
+    assert single[0, column] == 1
+    print(f"  ✅ Training, batch and single scoring read the same aggregates")
+
+    print("\n✅ Event feature tests passed!")
+
+
+def run_all_tests():
+    """Run all prediction tests"""
+    print("🚀 Running Prediction Service Tests")
+    print("=" * 80)
+
+    setup_module()
+    try:
+        test_batch_predictions()
+        test_model_cache()
+        test_model_registry()
+        test_feature_pipeline()
+        test_event_features()
+
+        print("\n" + "=" * 80)
+        print("🎉 ALL PREDICTION TESTS PASSED SUCCESSFULLY!")
+        print("=" * 80)
+        print("\n📊 Test Summary:")
+        print("  - Batch predictions: ✅")
+        print("  - Model cache: ✅")
+        print("  - Model registry: ✅")
+        print("  - Feature pipeline: ✅")
+        print("  - Event features: ✅")
+
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+    finally:
+        teardown_module()
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    exit(0 if success else 1)